@@ -3,7 +3,7 @@ import platform
 import time
 from typing import Union
 
-from PyQt6.QtCore import QObject, QThread, pyqtSignal, Qt
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, Qt
 from PyQt6.QtGui import QShortcut, QKeySequence
 
 from src.gui.widgets.new_main_window_view import NewMainWindowView
@@ -11,8 +11,14 @@ from src.services import (
     DeviceManager,
     CaptureOrchestrator,
     StorageService,
+    StorageQueue,
+    StorageJob,
     SequenceCounter,
+    ConfigService,
+    SyncResult,
 )
+from src.services.exceptions import StorageError, SynchronizationError
+from src.services.storage_health import StorageHealthState
 from src.models import CaptureMetadata, Settings, LightingLevel
 
 
@@ -34,6 +40,63 @@ class CameraSettingsWorker(QObject):
         self.finished.emit(f"Lighting level set to {level.value}.")
 
 
+class CaptureWorker(QObject):
+    """
+    Runs captures off the GUI thread: waiting for frames after the trigger
+    and for space in the storage queue both block.
+    """
+
+    accepted = pyqtSignal(object)  # SyncResult of a capture handed to the storage queue
+    rejected = pyqtSignal(str, str)  # message, log level
+
+    def __init__(self, capture_orchestrator: CaptureOrchestrator, storage_queue: StorageQueue):
+        super().__init__()
+        self.capture_orchestrator = capture_orchestrator
+        self.storage_queue = storage_queue
+        self._stopped = False
+
+    def stop(self):
+        """Skip captures that are still queued to this worker; a running one completes."""
+        self._stopped = True
+
+    def capture(self, trigger_ns: int, metadata: CaptureMetadata, settings: Settings):
+        """Synchronize one frame per camera to the trigger and queue them for saving."""
+        if self._stopped:
+            return
+        try:
+            sync_result = self.capture_orchestrator.capture_synchronized(trigger_ns)
+        except SynchronizationError as e:
+            self.rejected.emit(f"Capture rejected: {e}", "error")
+            return
+        if not sync_result.frames:
+            self.rejected.emit("Capture failed. No frames received.", "info")
+            return
+
+        metadata.sync = sync_result.to_dict()
+        try:
+            # The storage queue takes over the frame references
+            self.storage_queue.submit(sync_result.frames, metadata, settings)
+        except StorageError as e:
+            sync_result.release()
+            self.rejected.emit(f"Capture not saved: {e}", "error")
+            return
+        self.accepted.emit(sync_result)
+
+
+class StorageNotifier(QObject):
+    """Relays storage queue callbacks from its worker threads to the GUI thread."""
+
+    job_finished = pyqtSignal(int, str, int, str)  # job_id, session_dir, frame_count, report summary
+    job_failed = pyqtSignal(int, str)  # job_id, error message
+
+    def notify_finished(self, job: StorageJob):
+        summary = job.report.summary() if job.report is not None else ""
+        self.job_finished.emit(job.job_id, job.session_dir, len(job.frames), summary)
+
+    def notify_failed(self, job: StorageJob, error: Exception):
+        self.job_failed.emit(job.job_id, str(error))
+
+
 class MainWindowController(QObject):
     """
     The main window controller of the application.
@@ -42,6 +105,9 @@ class MainWindowController(QObject):
     and slots, and managing the interaction between the view and the models.
     """
 
+    # trigger_ns is passed as a Python int; a C++ int would truncate it
+    capture_requested = pyqtSignal(object, object, object)  # trigger_ns, CaptureMetadata, Settings
+
     def __init__(self, project_root: str) -> None:
         super().__init__()
         self.project_root = project_root
@@ -54,13 +120,30 @@ class MainWindowController(QObject):
         self.device_manager.discover_cameras()
 
         self.storage_service = StorageService(root_dir=storage_root)
+        # Finish or quarantine sessions left half-written by a crash, before anything is saved
+        self.storage_service.recover()
         self.sequence_counter = SequenceCounter(storage_dir=storage_root)
 
+        storage_settings = ConfigService().storage_settings
+        self.storage_notifier = StorageNotifier()
+        self.storage_queue = StorageQueue(
+            self.storage_service,
+            max_pending=int(storage_settings.get("queue_size", 8)),
+            workers=int(storage_settings.get("workers", 2)),
+            submit_timeout=int(storage_settings.get("submit_timeout_ms", 500)) / 1000.0,
+            on_finished=self.storage_notifier.notify_finished,
+            on_failed=self.storage_notifier.notify_failed,
+        )
+
         # -----------------------------
         # View Initialization
         # -----------------------------
         self.view = NewMainWindowView(
-            project_root, self.device_manager, self.storage_service, default_storage_path=storage_root
+            project_root,
+            self.device_manager,
+            self.storage_service,
+            default_storage_path=storage_root,
+            storage_queue=self.storage_queue,
         )
         self.capture_orchestrator = CaptureOrchestrator(self.view.preview_grid)
 
@@ -72,6 +155,15 @@ class MainWindowController(QObject):
         self.camera_settings_worker.moveToThread(self.camera_settings_thread)
         self.camera_settings_thread.start()
 
+        # -----------------------------
+        # Worker Thread for Captures
+        # -----------------------------
+        self._capture_in_flight = False
+        self.capture_thread = QThread()
+        self.capture_worker = CaptureWorker(self.capture_orchestrator, self.storage_queue)
+        self.capture_worker.moveToThread(self.capture_thread)
+        self.capture_thread.start()
+
         # -----------------------------
         # Initial State Setup
         # -----------------------------
@@ -83,6 +175,15 @@ class MainWindowController(QObject):
         # -----------------------------
         self._connect_signals()
 
+        # -----------------------------
+        # Storage Health
+        # -----------------------------
+        self._storage_state = StorageHealthState.OK
+        self.storage_health_timer = QTimer(self)
+        self.storage_health_timer.timeout.connect(self.on_storage_health_timer)
+        self.storage_health_timer.start(int(ConfigService().get('storage.health.ui_refresh_ms', 1000)))
+        self.on_storage_health_timer()
+
     def _set_initial_metadata(self):
         """Set the initial metadata in the view."""
         initial_metadata: CaptureMetadata = self.view.controls_panel.get_metadata()
@@ -97,7 +198,7 @@ class MainWindowController(QObject):
     def _connect_signals(self):
         """Connect signals from the view to the controller's slots."""
         self.view.controls_panel.capture_button.clicked.connect(self.on_capture)
-        self.view.controls_panel.path_edit.textChanged.connect(
+        self.view.controls_panel.storage_path_changed.connect(
             self.on_storage_path_changed
         )
         self.view.controls_panel.lighting_level_changed.connect(
@@ -106,6 +207,12 @@ class MainWindowController(QObject):
         self.camera_settings_worker.finished.connect(
             self.view.log_panel.add_log_message
         )
+        self.capture_requested.connect(self.capture_worker.capture)
+        self.capture_worker.accepted.connect(self.on_capture_accepted)
+        self.capture_worker.rejected.connect(self.on_capture_rejected)
+        self.view.closing.connect(self.stop_capture_thread)
+        self.storage_notifier.job_finished.connect(self.on_capture_saved)
+        self.storage_notifier.job_failed.connect(self.on_capture_save_failed)
 
         QShortcut(QKeySequence(Qt.Key.Key_Space), self.view, self.on_capture)
 
@@ -113,29 +220,95 @@ class MainWindowController(QObject):
         """Show the main window."""
         self.view.show()
 
+    def stop_capture_thread(self):
+        """Let a capture in flight reach the storage queue, then stop the capture thread."""
+        self.capture_worker.stop()
+        self.capture_thread.quit()
+        if not self.capture_thread.wait(ConfigService().thread_stop_timeout_ms):
+            print("Warning: Capture thread did not stop in time.")
+
     def on_capture(self):
         """Handle the capture button click."""
+        if self._capture_in_flight:
+            self.view.log_panel.add_log_message("Still waiting for the previous capture.", "warning")
+            return
+        # The trigger is taken at the click; the capture worker waits for frames after it
+        trigger_ns = time.time_ns()
         metadata = self.view.controls_panel.get_metadata()
         settings = self.view.controls_panel.get_settings()
         self.view.log_panel.add_log_message(
             f"Capturing with metadata: {metadata.to_dict()}"
         )
+        self._set_capture_in_flight(True)
+        self.capture_requested.emit(trigger_ns, metadata, settings)
 
-        frames = self.capture_orchestrator.capture_all_frames()
-        if frames:
-            session_dir = self.storage_service.save(frames, metadata, settings)
+    def on_capture_accepted(self, sync_result: SyncResult):
+        """Handle a capture the worker handed to the storage queue."""
+        self._set_capture_in_flight(False)
+        if sync_result.degraded:
+            stale = ", ".join(
+                f"{cid} ({-sync_result.skews_ns[cid] / 1e6:.0f} ms old)" for cid in sync_result.stale
+            )
             self.view.log_panel.add_log_message(
-                f"Saved {len(frames)} frames to: {session_dir}"
+                f"Degraded capture: max jitter {sync_result.max_jitter_ms:.1f} ms, "
+                f"missing cameras: {sync_result.missing or 'none'}, "
+                f"stale cameras: {stale or 'none'}",
+                "warning",
             )
 
-            # Always increment sequence number after successful capture
-            # lock_metadata only affects saving options, not sequence numbering
-            self.sequence_counter.increment()
-            metadata.sequence_number = self.sequence_counter.get_current()
-            self.view.controls_panel.set_metadata(metadata)
+        # Always increment sequence number after a capture is accepted
+        # lock_metadata only affects saving options, not sequence numbering
+        self.sequence_counter.increment()
+        next_metadata = self.view.controls_panel.get_metadata()
+        next_metadata.sequence_number = self.sequence_counter.get_current()
+        self.view.controls_panel.set_metadata(next_metadata)
+
+    def on_capture_rejected(self, message: str, level: str):
+        """Handle a capture the worker could not take or queue."""
+        self._set_capture_in_flight(False)
+        self.view.log_panel.add_log_message(message, level)
+
+    def _set_capture_in_flight(self, in_flight: bool):
+        self._capture_in_flight = in_flight
+        self.view.controls_panel.capture_button.setEnabled(not in_flight)
+
+    def on_capture_saved(self, job_id: int, session_dir: str, frame_count: int, summary: str):
+        """Handle a capture written by the storage queue."""
+        message = f"Saved {frame_count} frames to: {session_dir}"
+        if summary:
+            message += f" ({summary})"
+        self.view.log_panel.add_log_message(message, "success")
+
+    def on_capture_save_failed(self, job_id: int, message: str):
+        """Handle a capture the storage queue failed to write."""
+        self.view.log_panel.add_log_message(f"Failed to save capture {job_id}: {message}", "error")
+
+    def on_storage_health_timer(self):
+        """Show the storage health and log changes of its state."""
+        health = self.storage_service.health.check()
+        self.view.storage_health_indicator.update_health(health)
+        if health.state == self._storage_state:
+            return
+        self._storage_state = health.state
+        if health.state == StorageHealthState.OK:
+            self.view.log_panel.add_log_message(f"Storage OK again: {health.summary()}", "success")
+        elif health.state == StorageHealthState.WARNING:
+            self.view.log_panel.add_log_message(f"Storage warning: {health.reason}", "warning")
+        elif health.state == StorageHealthState.DEGRADED:
+            self.view.log_panel.add_log_message(
+                f"Storage degraded ({health.reason}): not saving {', '.join(health.skipped_streams)}", "warning")
         else:
-            self.view.log_panel.add_log_message("Capture failed. No frames received.")
+            self.view.log_panel.add_log_message(f"Storage full ({health.reason}): captures are refused", "error")
 
     def on_storage_path_changed(self, path: str):
-        """Handle the storage path change."""
-        self.storage_service.set_root_dir(path)
+        """Switch storage to the entered path once saves in flight have finished, and recover it."""
+        if not path or os.path.abspath(path) == os.path.abspath(self.storage_service.get_root_dir()):
+            return
+        try:
+            result = self.storage_service.set_root_dir(path, recover=True)
+        except OSError as e:
+            self.view.log_panel.add_log_message(f"Could not use storage path {path}: {e}", "error")
+            return
+        self.view.log_panel.add_log_message(f"Storage path set to {path}", "info")
+        if result.finished or result.quarantined:
+            self.view.log_panel.add_log_message(f"Storage recovery: {result.summary()}", "warning")
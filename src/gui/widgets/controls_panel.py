@@ -14,6 +14,8 @@ class ControlsPanel(QWidget):
     """
 
     lighting_level_changed = pyqtSignal(LightingLevel)
+    # Emitted once the user has finished entering a storage path, not on every keystroke
+    storage_path_changed = pyqtSignal(str)
 
     def __init__(self, parent=None, project_root=None):
         super().__init__(parent)
@@ -38,6 +40,9 @@ class ControlsPanel(QWidget):
 
         # Connect signals to slots
         self.browse_button.clicked.connect(self.on_browse)
+        self.path_edit.editingFinished.connect(
+            lambda: self.storage_path_changed.emit(self.path_edit.text())
+        )
         self.lighting_combo.currentTextChanged.connect(
             lambda text: self.lighting_level_changed.emit(LightingLevel(text))
         )
@@ -48,6 +53,7 @@ class ControlsPanel(QWidget):
         directory = QFileDialog.getExistingDirectory(self, "Select Storage Directory")
         if directory:
             self.path_edit.setText(directory)
+            self.storage_path_changed.emit(directory)
 
     def on_lock_metadata_changed(self, state):
         """Handle lock metadata checkbox state changes."""
@@ -0,0 +1,74 @@
+from typing import Optional
+
+import numpy as np
+from PyQt6.QtCore import QRect, QSize, Qt
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+
+def image_format(image: np.ndarray) -> QImage.Format:
+    """The QImage format of a rendered preview array: RGB888, RGBX8888 or Grayscale8."""
+    if image.ndim == 2:
+        return QImage.Format.Format_Grayscale8
+    return QImage.Format.Format_RGBX8888 if image.shape[2] == 4 else QImage.Format.Format_RGB888
+
+
+class FrameCanvas(QWidget):
+    """
+    Paints preview frames directly, replacing a QLabel with a QPixmap.
+
+    `set_image` wraps the rendered array in a QImage header without copying
+    it and only schedules a repaint; `paintEvent` draws it aspect-fit and
+    centered. There is no QPixmap conversion and no size hint change, so a
+    new frame never triggers a layout pass. The array must not be written
+    to afterwards; RenderedFrame arrays are fresh per frame, so it is not.
+    """
+
+    def __init__(self, text: str = "", parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._image: Optional[QImage] = None
+        self._array: Optional[np.ndarray] = None  # keeps the QImage's memory alive
+        self._text = text
+        self.setMinimumSize(160, 120)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self) -> QSize:
+        return QSize(320, 240)
+
+    def set_image(self, image: np.ndarray):
+        """Show a contiguous uint8 image."""
+        if not image.flags.c_contiguous:
+            image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        # The QImage uses the array's memory as its backing store; creating it only fills in a header
+        self._image = QImage(image.data, width, height, image.strides[0], image_format(image))
+        self._array = image
+        self._text = ""
+        self.update()
+
+    def set_text(self, text: str):
+        """Show a message instead of an image, e.g. "Display Error"."""
+        self._image = None
+        self._array = None
+        self._text = text
+        self.update()
+
+    def image_rect(self) -> QRect:
+        """Where the image is drawn: the largest aspect-fit rectangle, centered."""
+        if self._image is None:
+            return QRect()
+        image_w, image_h = self._image.width(), self._image.height()
+        scale = min(self.width() / image_w, self.height() / image_h)
+        w, h = max(1, int(image_w * scale)), max(1, int(image_h * scale))
+        return QRect((self.width() - w) // 2, (self.height() - h) // 2, w, h)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        try:
+            if self._image is not None:
+                # The renderer targets this widget's size, so this is normally a 1:1 blit
+                painter.drawImage(self.image_rect(), self._image)
+            elif self._text:
+                painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self._text)
+        finally:
+            painter.end()
@@ -1,15 +1,22 @@
 import os
 from PyQt6 import uic
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QMainWindow
 
-from src.services import StorageService
+from src.services import StorageService, StorageQueue
 from src.gui.widgets.preview_widget import PreviewGrid
 from src.gui.widgets.controls_panel import ControlsPanel
 from src.gui.widgets.log_panel import LogPanel
+from src.gui.widgets.storage_health_indicator import StorageHealthIndicator
 
 class NewMainWindowView(QMainWindow):
-    def __init__(self, project_root: str, device_manager, storage_service: StorageService, default_storage_path):
+    closing = pyqtSignal()  # emitted before the storage queue shuts down, so captures in flight can finish
+
+    def __init__(self, project_root: str, device_manager, storage_service: StorageService, default_storage_path,
+                 storage_queue: StorageQueue = None):
         super().__init__()
+        self.storage_service = storage_service
+        self.storage_queue = storage_queue
         
         ui_file = os.path.join(project_root, "src", "gui", "ui", "new_main_window.ui")
         uic.loadUi(ui_file, self)
@@ -41,6 +48,9 @@ class NewMainWindowView(QMainWindow):
         self.controls_panel = ControlsPanel(parent=self, project_root=project_root)
         self.controls_layout.addWidget(self.controls_panel)
 
+        self.storage_health_indicator = StorageHealthIndicator(self)
+        self.controls_layout.addWidget(self.storage_health_indicator)
+
         self.log_panel = LogPanel(project_root)
         self.log_layout.addWidget(self.log_panel)
 
@@ -54,5 +64,10 @@ class NewMainWindowView(QMainWindow):
         return self.log_panel
 
     def closeEvent(self, event):
+        self.closing.emit()
+        # Write out queued captures while their frames are still backed by live cameras
+        if self.storage_queue:
+            self.storage_queue.shutdown()
+        self.storage_service.close()
         self.preview_grid.stop_threads()
         super().closeEvent(event)
@@ -1,22 +1,31 @@
 import os
 from PyQt6 import uic
-from PyQt6.QtWidgets import QWidget, QLabel, QGridLayout, QFrame, QHBoxLayout, QSizePolicy
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QWidget, QGridLayout, QFrame, QHBoxLayout, QSizePolicy
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QObject, QEvent
 import cv2
-import numpy as np
 import time
-import threading
 from src.services.abstract_camera import AbstractCamera
 from src.services.config_service import ConfigService
 from src.services.storage_service import StorageService
+from src.services.frame_buffer import FrameRingBuffer
+from src.services.frame_pacing import FrameMailbox, FramePacer, FrameRateMeter
+from src.services.depth_colorizer import DepthColorizer
+from src.services.preview_renderer import PreviewRenderer, RenderedFrame
+from src.services.preview_scheduler import PreviewScheduler, PreviewTile
+from src.services.camera_process import CameraProcessHandle
 
 from src.services.camera_factory import CameraFactory
+from src.gui.widgets.frame_canvas import FrameCanvas
 
 
 class FrameWorker(QObject):
-    """Worker to connect to a camera and fetch frames in a background thread."""
-    frame_ready = pyqtSignal(object)
+    """
+    Worker to connect to a camera and fetch frames in a background thread.
+
+    At the display rate it also renders the preview images and leaves the
+    RenderedFrame in its mailbox, replacing one the GUI has not shown yet;
+    the GUI takes it from there on its display timer.
+    """
     connection_status = pyqtSignal(str, bool, str)  # camera_id, is_connected, message
 
     def __init__(self, camera_config: dict, factory: CameraFactory, storage_service: StorageService):
@@ -26,15 +35,19 @@ class FrameWorker(QObject):
         self.storage_service = storage_service
         self.camera = None  # Will be created in the run method
         self.running = True
-        self._lock = threading.Lock()
-        self._last_frame = None
         self._last_emit_time = 0
         
         # Load UI performance settings from config
         from src.services.config_service import ConfigService
         config = ConfigService()
+        self.frame_buffer = FrameRingBuffer(config.frame_buffer_capacity)
         self._ui_fps_limit = config.display_fps
         self._ui_frame_interval = 1.0 / self._ui_fps_limit
+        self._target_fps = config.target_fps
+        self._idle_interval = 0.1  # Poll interval while the camera is disconnected
+        self.fps_meter = FrameRateMeter()
+        self.renderer = PreviewRenderer(DepthColorizer.from_config(config))
+        self.mailbox = FrameMailbox()
 
     def run(self):
         """Create and connect to the camera, then continuously fetch frames."""
@@ -53,28 +66,24 @@ class FrameWorker(QObject):
             self.connection_status.emit(self.camera.camera_id, True, "Connected")
             print(f"{self.camera.camera_id} connected successfully in worker thread.")
 
+            # Blocking sources are driven by frame arrival; only sources that return
+            # immediately are paced, so no sleep is added on top of the sensor rate.
+            pacer = None
+            if not self.camera.blocks_for_frames:
+                target_fps = self._target_fps or self.camera.fps
+                pacer = FramePacer(target_fps if target_fps > 0 else 30)
+
             while self.running:
                 try:
-                    if self.camera.is_connected:
-                        frame = self.camera.capture_frame()
-                        if frame:
-                            with self._lock:
-                                self._last_frame = frame
-                            
-                            # Limit UI updates based on config
-                            current_time = time.time()
-                            if current_time - self._last_emit_time >= self._ui_frame_interval:
-                                self.frame_ready.emit(frame)
-                                self._last_emit_time = current_time
-                    
-                    # Frame-rate limiting sleep
-                    try:
-                        # Use more efficient sleep timing for Linux
-                        sleep_time = max(0.001, 1 / self.camera.fps if self.camera.fps > 0 else 0.03)
-                        time.sleep(sleep_time)
-                    except Exception as sleep_error:
-                        print(f"Sleep error in FrameWorker for {self.camera.camera_id}: {sleep_error}")
-                        break
+                    if not self.camera.is_connected:
+                        time.sleep(self._idle_interval)
+                        continue
+
+                    if pacer:
+                        pacer.wait()
+                    frame = self.camera.capture_frame()
+                    if frame:
+                        self._handle_frame(frame)
                 except Exception as e:
                     print(f"Error in FrameWorker for {self.camera.camera_id}: {e}")
                     try:
@@ -93,18 +102,107 @@ class FrameWorker(QObject):
                     self.camera.disconnect()
             except Exception as e:
                 print(f"Error disconnecting {self.camera.camera_id}: {e}")
-
-    def get_last_frame(self):
-        """Get the last captured frame in a thread-safe way."""
-        with self._lock:
-            return self._last_frame
+            self.frame_buffer.clear()
+            self.mailbox.clear()
+            stats = self.buffer_pool_stats()
+            if stats:
+                print(f"Buffer pool for {self.camera.camera_id}: {stats.to_dict()}")
+
+    def _handle_frame(self, frame):
+        """Store a newly acquired frame and forward a rendered preview to the UI at the display rate."""
+        # The ring buffer takes over the camera's reference to the frame
+        dropped = self.frame_buffer.push(frame)
+        if dropped is not None:
+            dropped.release()
+        self.fps_meter.tick()
+
+        # Limit UI updates based on config
+        current_time = time.time()
+        interval = self._ui_frame_interval
+        if interval is not None and current_time - self._last_emit_time >= interval:
+            # The rendered images are new arrays, so the frame's pooled buffers are not held by the GUI
+            try:
+                self.mailbox.put(self.renderer.render(frame))
+            except cv2.error as e:
+                print(f"Preview rendering failed for {frame.camera_id}: {e}")
+            self._last_emit_time = current_time
+
+    def buffer_pool_stats(self):
+        """Get the buffer pool counters of the camera, if it uses a pool."""
+        pool = self.camera.buffer_pool if self.camera else None
+        return pool.stats() if pool else None
+
+    @property
+    def delivered_fps(self) -> float:
+        """Get the frame rate actually delivered by the camera."""
+        return self.fps_meter.fps
+
+    def set_preview_fps(self, fps: float):
+        """Set how often the preview is rendered; 0 stops rendering. Frames are still buffered for capture."""
+        # A single attribute store, so the GUI thread can call this while the worker loop runs
+        self._ui_frame_interval = 1.0 / fps if fps > 0 else None
+
+    @property
+    def preview_fps(self) -> float:
+        interval = self._ui_frame_interval
+        return 1.0 / interval if interval else 0.0
 
     def stop(self):
         """Stop the worker thread."""
         self.running = False
 
+class ProcessFrameWorker(FrameWorker):
+    """
+    Worker that runs its camera in a separate process.
+
+    The camera process publishes frames through shared memory; this worker
+    only receives frame-ready events in its background thread and wraps the
+    shared slots in zero-copy views, so acquisition and depth conversion do
+    not compete with the GUI for the interpreter lock.
+    """
+
+    def __init__(self, camera_config: dict, factory: CameraFactory, storage_service: StorageService):
+        super().__init__(camera_config, factory, storage_service)
+        config = ConfigService()
+        self._stop_timeout = config.thread_stop_timeout_ms / 2000.0  # Leave time for the thread itself to finish
+        self._process_handle = CameraProcessHandle(
+            camera_config,
+            storage_root=storage_service.get_root_dir(),
+            buffer_capacity=self.frame_buffer.capacity,
+            headroom=int(config.get('capture.process_slot_headroom', 4)),
+            target_fps=self._target_fps,
+        )
+
+    def run(self):
+        """Start the camera process, then receive its frames until stopped."""
+        camera_id = self.camera_config['camera_id']
+        try:
+            print(f"Starting camera process for {camera_id}...")
+            self._process_handle.start()
+            while self.running:
+                event = self._process_handle.poll(timeout=self._idle_interval)
+                if event is None:
+                    continue
+                if event[0] == "frame":
+                    self._handle_frame(event[1])
+                elif event[0] == "status":
+                    self.connection_status.emit(camera_id, event[1], event[2])
+                elif event[0] == "stopped":
+                    break
+        except Exception as e:
+            print(f"Error in ProcessFrameWorker for {camera_id}: {e}")
+            self.connection_status.emit(camera_id, False, str(e))
+        finally:
+            self.frame_buffer.clear()
+            self.mailbox.clear()
+            self._process_handle.stop(self._stop_timeout)
+            if self._process_handle.dropped_frames:
+                print(f"{camera_id} process dropped {self._process_handle.dropped_frames} frames while the consumer lagged.")
+
+
 class PreviewWidget(QWidget):
-    """A widget to display a single camera's preview with RGB and Depth."""
+    """A widget to display a single camera's preview with RGB and Depth. Clicking it toggles focus."""
+    focus_requested = pyqtSignal(str)  # camera_id
 
     def __init__(self, project_root: str, camera_id: str):
         super().__init__()
@@ -131,6 +229,7 @@ class PreviewWidget(QWidget):
             self.displays_layout.addWidget(display_widget)
         
         self.frame_number = 0
+        self._renderer = None
     
     def create_display_widget(self, display_type: str):
         ui_file = os.path.join(self.project_root, "src", "gui", "ui", "display_widget.ui")
@@ -140,8 +239,11 @@ class PreviewWidget(QWidget):
         display_widget.display_label.setProperty("class", "display-label")
         display_widget.image_container.setProperty("class", "display-frame")
         
-        # Store the image label for later access
-        self.__setattr__(f"{display_type.lower().replace(' ', '_')}_label", display_widget.image_label)
+        # The image is painted by a FrameCanvas in place of the .ui file's QLabel
+        canvas = FrameCanvas(display_widget.image_label.text())
+        display_widget.image_layout.replaceWidget(display_widget.image_label, canvas)
+        display_widget.image_label.deleteLater()
+        self.__setattr__(f"{display_type.lower().replace(' ', '_')}_canvas", canvas)
         
         return display_widget
 
@@ -155,114 +257,63 @@ class PreviewWidget(QWidget):
         self.status_indicator.style().unpolish(self.status_indicator)
         self.status_indicator.style().polish(self.status_indicator)
 
-    def update_frame(self, frame):
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.focus_requested.emit(self.camera_id)
+        super().mousePressEvent(event)
+
+    def set_focused(self, focused: bool):
+        self.setProperty("focused", focused)
+        # Re-polish to apply style changes
+        self.style().unpolish(self)
+        self.style().polish(self)
+
+    def visible_area(self) -> int:
+        """On-screen pixels of the image canvases, excluding parts that are clipped or covered by siblings."""
+        area = 0
+        for canvas in (self.rgb_canvas, self.depth_canvas):
+            rect = canvas.visibleRegion().boundingRect()
+            area += rect.width() * rect.height()
+        return area
+
+    def set_renderer(self, renderer: PreviewRenderer):
+        """Report the size of the image canvases to the renderer of this camera's frame worker."""
+        self._renderer = renderer
+        for stream, canvas in (("rgb", self.rgb_canvas), ("depth", self.depth_canvas)):
+            canvas.installEventFilter(self)
+            renderer.set_target_size(stream, canvas.width(), canvas.height())
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Resize and self._renderer is not None:
+            if watched is self.rgb_canvas:
+                self._renderer.set_target_size("rgb", event.size().width(), event.size().height())
+            elif watched is self.depth_canvas:
+                self._renderer.set_target_size("depth", event.size().width(), event.size().height())
+        return super().eventFilter(watched, event)
+
+    def update_frame(self, frame: RenderedFrame):
         if frame is None: return
         self.frame_number = frame.frame_number
 
         try:
-            if hasattr(self, 'rgb_label') and hasattr(frame, 'rgb_image') and frame.rgb_image is not None:
-                self._update_image(self.rgb_label, frame.rgb_image)
-            if hasattr(self, 'depth_label') and hasattr(frame, 'depth_image') and frame.depth_image is not None:
-                self._update_image(self.depth_label, frame.depth_image, is_depth=True)
+            if frame.rgb is not None:
+                self.rgb_canvas.set_image(frame.rgb)
+            if frame.depth is not None:
+                self.depth_canvas.set_image(frame.depth)
         except Exception as e:
             print(f"Error updating frame for {self.camera_id}: {e}")
-            # Set error text on available labels
-            if hasattr(self, 'rgb_label'):
-                self.rgb_label.setText("Display Error")
-            if hasattr(self, 'depth_label'):
-                self.depth_label.setText("Display Error")
-
-    def _update_image(self, label: QLabel, image: np.ndarray, is_depth: bool = False):
-        if not isinstance(image, np.ndarray) or image.size == 0:
-            label.setText("Invalid Frame")
-            return
-        
-        try:
-            # Use view instead of copy when possible for better performance
-            image_copy = image if image.flags.c_contiguous else image.copy()
-
-            if is_depth:
-                # --- Correct Depth Visualization ---
-                # 1. Define a reasonable depth range for visualization (e.g., 0.1m to 5m)
-                min_depth, max_depth = 0.1, 5.0
-                
-                # 2. Clip the depth image to this range to avoid extreme values
-                clipped_depth = np.clip(image_copy, min_depth, max_depth)
-                
-                # 3. Normalize the clipped depth image to the 0-255 range
-                normalized_depth = cv2.normalize(clipped_depth, None, 0, 255, cv2.NORM_MINMAX)
-                
-                # 4. Convert to an 8-bit unsigned integer array
-                depth_uint8 = normalized_depth.astype(np.uint8)
-                
-                # 5. Apply a colormap for better visualization
-                image_copy = cv2.applyColorMap(depth_uint8, cv2.COLORMAP_JET)
-                
-                # 6. Convert BGR (from colormap) to RGB for Qt display
-                image_copy = cv2.cvtColor(image_copy, cv2.COLOR_BGR2RGB)
-            else:
-                # Ensure RGB image is also in the correct format if it's not already
-                if len(image_copy.shape) == 3 and image_copy.shape[2] == 3:
-                    # Convert BGR to RGB for correct display in Qt
-                    image_copy = cv2.cvtColor(image_copy, cv2.COLOR_BGR2RGB)
-
-            label_w, label_h = label.width(), label.height()
-            # --- Key Fix: Prevent 0-size dimensions from being passed to cv2.resize() ---
-            if label_w > 10 and label_h > 10:  # Skip if the UI is not laid out yet
-                img_h, img_w = image_copy.shape[:2]
-                aspect_ratio = img_w / img_h
-
-                if label_w / label_h > aspect_ratio:
-                    new_w = max(1, int(label_h * aspect_ratio))
-                    new_h = label_h
-                else:
-                    new_w = label_w
-                    new_h = max(1, int(label_w / aspect_ratio))
-                
-                # Only resize if necessary to save CPU
-                if (new_w != img_w or new_h != img_h) and new_w > 0 and new_h > 0:
-                    try:
-                        resized_image = cv2.resize(
-                            image_copy,
-                            (new_w, new_h),
-                            interpolation=cv2.INTER_LINEAR,  # Faster than INTER_AREA for downscaling
-                        )
-                    except cv2.error as e:
-                        print(f'cv2.resize failed: {e}')
-                        return  # Abandon this frame to prevent abort
-                else:
-                    resized_image = image_copy
-            else:
-                resized_image = image_copy
-
-            # Optimize QImage creation
-            if len(resized_image.shape) == 3:
-                h, w, ch = resized_image.shape
-                if ch == 3:
-                    # Ensure RGB format and contiguous memory
-                    if not resized_image.flags.c_contiguous:
-                        resized_image = np.ascontiguousarray(resized_image)
-                    fmt = QImage.Format.Format_RGB888
-                    bytes_per_line = ch * w
-                else:
-                    fmt = QImage.Format.Format_RGBA8888
-                    bytes_per_line = ch * w
-                q_img = QImage(resized_image.data, w, h, bytes_per_line, fmt)
-            else:
-                h, w = resized_image.shape
-                if not resized_image.flags.c_contiguous:
-                    resized_image = np.ascontiguousarray(resized_image)
-                q_img = QImage(resized_image.data, w, h, w, QImage.Format.Format_Grayscale8)
-
-            pixmap = QPixmap.fromImage(q_img)
-            label.setPixmap(pixmap)
-
-        except Exception as e:
-            print(f"Error updating frame for {self.camera_title.text()}: {e}")
-            label.setText("Display Error")
+            self.rgb_canvas.set_text("Display Error")
+            self.depth_canvas.set_text("Display Error")
 
 class PreviewGrid(QWidget):
-    """A grid of preview widgets that uses background threads for updates."""
+    """
+    A grid of preview widgets that uses background threads for updates.
+
+    One display timer shows the newest frame of every camera's mailbox; a
+    queued signal per frame would let frames pile up in the event queue
+    whenever the GUI thread falls behind. A slower schedule timer sets each
+    worker's preview rate from the PreviewScheduler.
+    """
 
     def __init__(self, project_root: str, device_manager, storage_service: StorageService):
         super().__init__()
@@ -272,6 +323,8 @@ class PreviewGrid(QWidget):
         self.previews = {}
         self.workers = {}
         self.threads = []
+        config = ConfigService()
+        self._acquisition_mode = config.acquisition_mode
 
         grid_layout = QGridLayout(self)
         grid_layout.setContentsMargins(10, 10, 10, 10)
@@ -295,37 +348,90 @@ class PreviewGrid(QWidget):
         for i in range((len(camera_configs) + num_columns - 1) // num_columns):
             grid_layout.setRowStretch(i, 1)
 
+        # Polled at twice the display rate, so a frame waits at most half a display interval
+        self.display_timer = QTimer(self)
+        self.display_timer.timeout.connect(self.on_display_timer)
+        self.display_timer.start(max(1, int(500 / max(1, config.display_fps))))
+
+        self.scheduler = PreviewScheduler.from_config(config)
+        self._focused_camera = None
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.timeout.connect(self.reschedule_previews)
+        self.schedule_timer.start(int(config.get('ui.preview.reschedule_ms', 500)))
+
     def _setup_camera_preview(self, cam_config, layout, row, col, rowspan=1, colspan=1):
         camera_id = cam_config['camera_id']
         preview = PreviewWidget(self.project_root, camera_id)
+        preview.focus_requested.connect(self.on_focus_requested)
         self.previews[camera_id] = preview
         layout.addWidget(preview, row, col, rowspan, colspan)
         
         thread = QThread()
-        worker = FrameWorker(cam_config, self.device_manager.factory, self.storage_service)
+        worker_class = ProcessFrameWorker if self._acquisition_mode == "process" else FrameWorker
+        worker = worker_class(cam_config, self.device_manager.factory, self.storage_service)
         self.workers[camera_id] = worker
+        preview.set_renderer(worker.renderer)
         worker.moveToThread(thread)
         
-        worker.frame_ready.connect(self.on_frame_ready)
         worker.connection_status.connect(self.on_connection_status)
         thread.started.connect(worker.run)
         
         self.threads.append((thread, worker))
         thread.start()
 
-    def on_frame_ready(self, frame):
-        if frame and frame.camera_id in self.previews:
-            self.previews[frame.camera_id].update_frame(frame)
+    def on_focus_requested(self, camera_id: str):
+        """Give a camera the full preview rate, or take it back if it already has focus."""
+        self._focused_camera = None if self._focused_camera == camera_id else camera_id
+        for preview_id, preview in self.previews.items():
+            preview.set_focused(preview_id == self._focused_camera)
+        self.reschedule_previews()
+
+    def reschedule_previews(self):
+        window = self.window()
+        window_visible = self.isVisible() and not window.isMinimized()
+        tiles = [
+            PreviewTile(camera_id, preview.visible_area() if window_visible else 0, camera_id == self._focused_camera)
+            for camera_id, preview in self.previews.items()
+        ]
+        for camera_id, fps in self.scheduler.schedule(tiles, window_visible).items():
+            self.workers[camera_id].set_preview_fps(fps)
+
+    def get_preview_fps(self):
+        """Get the scheduled preview rate of each camera, keyed by camera ID."""
+        return {camera_id: w.preview_fps for camera_id, w in self.workers.items()}
+
+    def on_display_timer(self):
+        for camera_id, worker in self.workers.items():
+            frame = worker.mailbox.take()
+            if frame is not None:
+                self.previews[camera_id].update_frame(frame)
 
     def on_connection_status(self, camera_id: str, is_connected: bool, message: str):
         if camera_id in self.previews:
             self.previews[camera_id].update_connection_status(is_connected, message)
 
-    def get_last_frames(self):
-        return [w.get_last_frame() for w in self.workers.values() if w.get_last_frame()]
+    def get_delivered_fps(self):
+        """Get the measured frame rate of each camera, keyed by camera ID."""
+        return {camera_id: w.delivered_fps for camera_id, w in self.workers.items()}
+
+    def get_display_stats(self):
+        """Get the preview delivery counters (shown, dropped, waiting time) of each camera, keyed by camera ID."""
+        return {camera_id: w.mailbox.stats() for camera_id, w in self.workers.items()}
+
+    def get_buffer_pool_stats(self):
+        """Get the buffer pool counters of each camera, keyed by camera ID."""
+        return {camera_id: w.buffer_pool_stats() for camera_id, w in self.workers.items()}
+
+    def get_frame_buffers(self):
+        """Get the timestamped frame buffer of each camera, keyed by camera ID."""
+        return {camera_id: w.frame_buffer for camera_id, w in self.workers.items()}
 
     def stop_threads(self):
         print("Stopping all frame workers...")
+        self.display_timer.stop()
+        self.schedule_timer.stop()
+        for camera_id, stats in self.get_display_stats().items():
+            print(f"Preview of {camera_id}: {stats.to_dict()}")
         # Signal all workers to stop
         for _, worker in self.threads:
             worker.stop()
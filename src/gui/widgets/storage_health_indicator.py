@@ -0,0 +1,34 @@
+from PyQt6.QtWidgets import QLabel
+
+from src.services.storage_health import StorageHealth, StorageHealthState
+
+
+class StorageHealthIndicator(QLabel):
+    """A one-line display of the storage path's state, free space and time to full."""
+
+    # Same palette as the log panel
+    COLORS = {
+        StorageHealthState.OK: "#388e3c",
+        StorageHealthState.WARNING: "#f57c00",
+        StorageHealthState.DEGRADED: "#f57c00",
+        StorageHealthState.REFUSING: "#d32f2f",
+    }
+    LABELS = {
+        StorageHealthState.OK: "Storage OK",
+        StorageHealthState.WARNING: "Storage warning",
+        StorageHealthState.DEGRADED: "Storage degraded",
+        StorageHealthState.REFUSING: "Storage full",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWordWrap(True)
+        self.setText("Storage: checking...")
+
+    def update_health(self, health: StorageHealth) -> None:
+        text = f"{self.LABELS[health.state]}: {health.summary()}"
+        if health.skipped_streams:
+            text += f". Not saving {', '.join(health.skipped_streams)}"
+        self.setText(text)
+        self.setToolTip(health.reason or "")
+        self.setStyleSheet(f"color: {self.COLORS[health.state]}; font-weight: bold;")
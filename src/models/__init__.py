@@ -3,12 +3,13 @@ This file makes the 'models' directory a Python package and exposes key data cla
 for easier importing.
 """
 
-from .camera import Frame
+from .camera import Frame, DepthMap
 from .metadata import CaptureMetadata, LightingLevel
 from .settings import Settings
 
 __all__ = [
     "Frame",
+    "DepthMap",
     "CaptureMetadata",
     "LightingLevel",
     "Settings",
@@ -1,6 +1,49 @@
 from dataclasses import dataclass, field
 import numpy as np
-from typing import Optional
+from typing import Any, List, Optional
+
+# Depth scale at which native depth units are already millimeters
+MILLIMETER_SCALE = 0.001
+
+@dataclass
+class DepthMap:
+    """
+    Depth in the sensor's native uint16 units together with its scale
+    (meters per unit). Metric views are computed on first access and cached.
+    """
+    data: np.ndarray
+    scale: float = MILLIMETER_SCALE
+    _meters: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _millimeters: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_meters(cls, meters: np.ndarray) -> "DepthMap":
+        """Create a millimeter-scaled depth map from float depth in meters."""
+        safe_depth = np.nan_to_num(meters, nan=0.0, posinf=0.0, neginf=0.0)
+        data = np.clip(np.rint(safe_depth * 1000), 0, 65535).astype(np.uint16)
+        return cls(data, MILLIMETER_SCALE)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def meters(self) -> np.ndarray:
+        """Depth in meters as float32."""
+        if self._meters is None:
+            self._meters = np.multiply(self.data, np.float32(self.scale), dtype=np.float32)
+        return self._meters
+
+    @property
+    def millimeters(self) -> np.ndarray:
+        """Depth in millimeters as uint16; the native buffer itself when the scale is 1 mm."""
+        if np.isclose(self.scale, MILLIMETER_SCALE, rtol=1e-6, atol=0.0):
+            return self.data
+        if self._millimeters is None:
+            scaled = np.multiply(self.data, np.float32(self.scale * 1000), dtype=np.float32)
+            self._millimeters = np.clip(np.rint(scaled), 0, 65535).astype(np.uint16)
+        return self._millimeters
+
 
 @dataclass
 class Frame:
@@ -9,7 +52,30 @@ class Frame:
     frame_number: int
     timestamp_ns: int
     rgb_image: np.ndarray
-    depth_image: np.ndarray
-    raw_depth_image: Optional[np.ndarray] = field(default=None)
+    depth: Optional[DepthMap] = field(default=None)
+    raw_depth: Optional[DepthMap] = field(default=None)
     rgb_image_left: Optional[np.ndarray] = field(default=None)
     sequence_id: int = 0 # Add default for backward compatibility if needed
+    # Pooled buffers backing the arrays above; empty for frames that own their arrays
+    buffers: List[Any] = field(default_factory=list, repr=False, compare=False)
+
+    @property
+    def depth_image(self) -> Optional[np.ndarray]:
+        """Depth in meters (float32), kept for readers of the original field."""
+        return self.depth.meters if self.depth is not None else None
+
+    @property
+    def raw_depth_image(self) -> Optional[np.ndarray]:
+        """Raw (unfiltered) depth in meters (float32), kept for readers of the original field."""
+        return self.raw_depth.meters if self.raw_depth is not None else None
+
+    def retain(self) -> "Frame":
+        """Add a reference to the frame's pooled buffers for another consumer."""
+        for buffer in self.buffers:
+            buffer.retain()
+        return self
+
+    def release(self) -> None:
+        """Drop one reference; the buffers return to their pool after the last one."""
+        for buffer in self.buffers:
+            buffer.release()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Any, Dict, Optional
 import time
 
 class LightingLevel(Enum):
@@ -15,11 +16,15 @@ class CaptureMetadata:
     background_id: str = "default_bg"
     sequence_number: int = 1
     timestamp: float = field(default_factory=time.time)
+    sync: Optional[Dict[str, Any]] = None  # Per-camera skew report of a synchronized capture
 
     def to_dict(self):
-        return {
+        data = {
             "lighting": self.lighting.value,
             "background_id": self.background_id,
             "sequence_number": self.sequence_number,
             "timestamp": self.timestamp,
         }
+        if self.sync is not None:
+            data["sync"] = self.sync
+        return data
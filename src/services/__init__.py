@@ -5,9 +5,19 @@ for easier importing.
 
 from .device_manager import DeviceManager
 from .capture_orchestrator import CaptureOrchestrator
-from .storage_service import StorageService
+from .storage_service import StorageService, StorageReport, FileReport
+from .storage_queue import StorageQueue, StorageJob
+from .storage_health import StorageHealthMonitor, StorageHealth, StorageHealthState
+from .codecs import Codec, create_codec, register_codec
+from .capture_catalog import CaptureCatalog
+from .dataset_reader import DatasetReader, CaptureRecord, CameraFrame
+from .shard_export import ShardExporter, ExportSummary
 from .sequence_counter import SequenceCounter
 from .config_service import ConfigService
+from .frame_buffer import FrameRingBuffer
+from .frame_pacing import FramePacer, FrameRateMeter, FrameMailbox
+from .frame_synchronizer import FrameSynchronizer, SyncResult
+from .preview_renderer import PreviewRenderer, RenderedFrame
 from .abstract_camera import AbstractCamera
 from .mock_camera import MockCamera
 from .realsense_camera import RealsenseCamera
@@ -16,8 +26,32 @@ __all__ = [
     "DeviceManager",
     "CaptureOrchestrator",
     "StorageService",
+    "StorageReport",
+    "FileReport",
+    "StorageQueue",
+    "StorageJob",
+    "StorageHealthMonitor",
+    "StorageHealth",
+    "StorageHealthState",
+    "Codec",
+    "create_codec",
+    "register_codec",
+    "CaptureCatalog",
+    "DatasetReader",
+    "CaptureRecord",
+    "CameraFrame",
+    "ShardExporter",
+    "ExportSummary",
     "SequenceCounter",
     "ConfigService",
+    "FrameRingBuffer",
+    "FramePacer",
+    "FrameRateMeter",
+    "FrameMailbox",
+    "FrameSynchronizer",
+    "SyncResult",
+    "PreviewRenderer",
+    "RenderedFrame",
     "AbstractCamera",
     "MockCamera",
     "RealsenseCamera",
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Iterator
+from typing import Iterator, Optional
 
 from src.models.camera import Frame
+from src.services.buffer_pool import BufferPool
 
 class AbstractCamera(ABC):
     """Abstract base class for all cameras."""
@@ -26,6 +27,16 @@ class AbstractCamera(ABC):
         """Stream frames from the camera."""
         pass
 
+    @property
+    def buffer_pool(self) -> Optional[BufferPool]:
+        """The pool backing this camera's frame arrays, if it uses one."""
+        return None
+
+    @property
+    def blocks_for_frames(self) -> bool:
+        """Whether capture_frame() blocks until the device delivers a new frame."""
+        return False
+
     @property
     @abstractmethod
     def is_connected(self) -> bool:
@@ -0,0 +1,118 @@
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class BufferPoolStats:
+    """Usage counters of a BufferPool."""
+    hits: int = 0
+    misses: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+    free: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "free": self.free,
+        }
+
+
+class PooledBuffer:
+    """
+    A reference-counted array handed out by a BufferPool.
+
+    The buffer starts with one reference owned by whoever acquired it. Every
+    additional consumer calls `retain()` and each owner calls `release()`
+    once done; the array goes back to the pool when the last reference is
+    released. The array must not be used after its owner has released it.
+    """
+
+    __slots__ = ("array", "_pool", "_key", "_refcount")
+
+    def __init__(self, array: np.ndarray, pool: "BufferPool", key: Tuple):
+        self.array = array
+        self._pool = pool
+        self._key = key
+        self._refcount = 1
+
+    @property
+    def refcount(self) -> int:
+        return self._refcount
+
+    def retain(self) -> "PooledBuffer":
+        with self._pool._lock:
+            if self._refcount <= 0:
+                raise RuntimeError("Cannot retain a buffer that was already returned to its pool")
+            self._refcount += 1
+        return self
+
+    def release(self) -> None:
+        with self._pool._lock:
+            if self._refcount <= 0:
+                return
+            self._refcount -= 1
+            if self._refcount == 0:
+                self._pool._recycle(self)
+
+
+class BufferPool:
+    """
+    A thread-safe pool of preallocated numpy arrays keyed by shape and dtype.
+
+    Cameras acquire their per-frame arrays from a pool instead of allocating
+    new ones, and the arrays are recycled once the ring buffer, preview and
+    storage have released the frame. At most `max_free` idle arrays are kept
+    per shape/dtype; any beyond that are left to the garbage collector.
+    """
+
+    def __init__(self, max_free: int = 8):
+        self._max_free = max_free
+        self._free: Dict[Tuple, List[np.ndarray]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._stats = BufferPoolStats()
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> PooledBuffer:
+        """Get a buffer of the given shape and dtype. Its contents are undefined."""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free_list = self._free.get(key)
+            if free_list:
+                array = free_list.pop()
+                self._stats.hits += 1
+                self._stats.free -= 1
+            else:
+                array = None
+                self._stats.misses += 1
+            self._stats.in_use += 1
+            self._stats.peak_in_use = max(self._stats.peak_in_use, self._stats.in_use)
+
+        if array is None:
+            array = np.empty(key[0], dtype=np.dtype(key[1]))
+        return PooledBuffer(array, self, key)
+
+    def stats(self) -> BufferPoolStats:
+        """Get a snapshot of the pool counters."""
+        with self._lock:
+            return BufferPoolStats(**self._stats.to_dict())
+
+    def clear(self) -> None:
+        """Drop all idle buffers."""
+        with self._lock:
+            self._free.clear()
+            self._stats.free = 0
+
+    def _recycle(self, buffer: PooledBuffer) -> None:
+        # Called with the lock held
+        self._stats.in_use -= 1
+        free_list = self._free[buffer._key]
+        if len(free_list) < self._max_free:
+            free_list.append(buffer.array)
+            self._stats.free += 1
@@ -0,0 +1,274 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.models.camera import Frame, DepthMap
+from src.services.frame_pacing import FramePacer
+from src.services.shared_frame_transport import SharedFrameRing, SlotLayout
+
+
+def run_camera_process(
+    camera_config: Dict[str, Any],
+    storage_root: str,
+    num_slots: int,
+    events,
+    stop_event,
+    slots_in_use,
+    target_fps: float,
+) -> None:
+    """
+    Entry point of a camera worker process.
+
+    Connects to the camera, then copies every frame into a free shared
+    memory slot and announces it on the `events` queue. `slots_in_use` has
+    one flag per slot: the producer sets it when it fills the slot and the
+    consumer clears it once the last lease on the frame is released. When
+    no slot is free, new frames are dropped rather than overwriting data
+    the consumer may still be reading.
+
+    Events put on the queue:
+        ("status", is_connected, message)
+        ("layout", shm_name, SlotLayout)
+        ("frame", slot, sequence, frame_number, timestamp_ns, sequence_id, depth_scale, array_names)
+        ("stopped", dropped_frames)
+    """
+    # Imported here so the spawned interpreter only loads what it needs
+    from src.services.camera_factory import CameraFactory
+    from src.services.storage_service import StorageService
+
+    camera_id = camera_config['camera_id']
+    camera = None
+    ring = None
+    dropped = 0
+    try:
+        camera = CameraFactory.create_camera(
+            camera_id=camera_id,
+            camera_type=camera_config['type'],
+            device_info=camera_config['device_info'],
+            camera_config=camera_config['config'],
+            storage_service=StorageService(storage_root),
+        )
+        camera.connect()
+        events.put(("status", True, "Connected"))
+
+        pacer = None
+        if not camera.blocks_for_frames:
+            rate = target_fps or camera.fps
+            pacer = FramePacer(rate if rate > 0 else 30)
+
+        sequence = 0
+        next_slot = 0
+        was_connected = True
+        while not stop_event.is_set():
+            if not camera.is_connected:
+                if was_connected:
+                    events.put(("status", False, "Disconnected"))
+                    was_connected = False
+                time.sleep(0.1)
+                continue
+
+            if pacer:
+                pacer.wait()
+            frame = camera.capture_frame()
+            if frame is None:
+                continue
+
+            if ring is None:
+                ring = SharedFrameRing(SlotLayout.for_frame(frame, num_slots))
+                events.put(("layout", ring.name, ring.layout))
+
+            event = publish_frame(ring, slots_in_use, next_slot, sequence, frame)
+            frame.release()
+            if event is None:
+                dropped += 1
+                continue
+            events.put(event)
+            next_slot = event[1] + 1
+            sequence += 1
+    except Exception as e:
+        print(f"Error in camera process for {camera_id}: {e}")
+        events.put(("status", False, str(e)))
+    finally:
+        try:
+            if camera and camera.is_connected:
+                camera.disconnect()
+        except Exception as e:
+            print(f"Error disconnecting {camera_id}: {e}")
+        if ring is not None:
+            ring.close()
+        events.put(("stopped", dropped))
+
+
+def publish_frame(ring: SharedFrameRing, slots_in_use, start: int, sequence: int, frame: Frame) -> Optional[Tuple]:
+    """
+    Copy a frame into the first free slot at or after `start`, wrapping around.
+
+    Returns:
+        The "frame" event announcing it, or None if every slot is in use.
+    """
+    num_slots = len(slots_in_use)
+    for i in range(num_slots):
+        slot = (start + i) % num_slots
+        if not slots_in_use[slot]:
+            break
+    else:
+        return None
+    slots_in_use[slot] = 1
+    names = ring.write(slot, sequence, frame)
+    depth_scale = frame.depth.scale if frame.depth is not None else None
+    return ("frame", slot, sequence, frame.frame_number, frame.timestamp_ns, frame.sequence_id, depth_scale, names)
+
+
+class _SlotLease:
+    """Reference count on a shared memory slot, held in `Frame.buffers`."""
+
+    __slots__ = ("_handle", "_slot", "_sequence")
+
+    def __init__(self, handle: "CameraProcessHandle", slot: int, sequence: int):
+        self._handle = handle
+        self._slot = slot
+        self._sequence = sequence
+
+    def retain(self) -> "_SlotLease":
+        self._handle._retain_slot(self._sequence)
+        return self
+
+    def release(self) -> None:
+        self._handle._release_slot(self._slot, self._sequence)
+
+
+class CameraProcessHandle:
+    """
+    Runs one camera in its own process and exposes its frames to this process.
+
+    Frames are delivered as `Frame` objects whose arrays are zero-copy views
+    into shared memory. Each frame holds a lease on its slot through the
+    usual `Frame.retain()`/`release()` calls, and the slot goes back to the
+    producer's free slots when its last lease is released, so a slot is never
+    overwritten while the ring buffer, preview or storage still use it. A
+    long-lived lease, such as a frame waiting in the storage queue, only
+    keeps its own slot. `headroom` extra slots absorb frames that are in
+    flight on the event queue or held outside the ring buffer.
+    """
+
+    def __init__(self, camera_config: Dict[str, Any], storage_root: str, buffer_capacity: int,
+                 headroom: int = 4, target_fps: float = 0):
+        self.camera_id = camera_config['camera_id']
+        self.num_slots = buffer_capacity + max(1, headroom)
+
+        ctx = mp.get_context("spawn")
+        self._events = ctx.Queue()
+        self._stop_event = ctx.Event()
+        self._slots_in_use = ctx.Array('b', self.num_slots, lock=False)
+        self._process = ctx.Process(
+            target=run_camera_process,
+            args=(camera_config, storage_root, self.num_slots, self._events,
+                  self._stop_event, self._slots_in_use, target_fps),
+            name=f"camera-{self.camera_id}",
+            daemon=True,
+        )
+        self._ring: Optional[SharedFrameRing] = None
+        self._leases: Dict[int, int] = {}  # sequence -> reference count
+        self._lease_lock = threading.Lock()
+        self.dropped_frames = 0
+
+    def start(self) -> None:
+        self._process.start()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def poll(self, timeout: float) -> Optional[Tuple]:
+        """
+        Wait for the next event from the camera process.
+
+        Returns:
+            ("frame", Frame), ("status", is_connected, message), ("stopped",)
+            or None if nothing arrived within `timeout` seconds.
+        """
+        try:
+            event = self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        kind = event[0]
+        if kind == "layout":
+            _, shm_name, layout = event
+            self._close_ring()
+            self._ring = SharedFrameRing(layout, name=shm_name)
+            return None
+        if kind == "frame":
+            return self._frame_event(*event[1:])
+        if kind == "stopped":
+            self.dropped_frames = event[1]
+            return ("stopped",)
+        return event
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Ask the camera process to exit, terminating it if it does not."""
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        while self._process.is_alive() and time.monotonic() < deadline:
+            # Keep draining so the child's queue feeder can flush and exit
+            try:
+                self._events.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        if self._process.is_alive():
+            print(f"Camera process for {self.camera_id} timed out. Terminating.")
+            self._process.terminate()
+            self._process.join(1.0)
+        self._close_ring()
+
+    def _frame_event(self, slot, sequence, frame_number, timestamp_ns, sequence_id, depth_scale,
+                     names) -> Optional[Tuple]:
+        views = self._ring.read(slot, sequence, names) if self._ring is not None else None
+        if views is None:
+            self._slots_in_use[slot] = 0
+            return None
+
+        with self._lease_lock:
+            self._leases[sequence] = 1
+        frame = Frame(
+            camera_id=self.camera_id,
+            frame_number=frame_number,
+            timestamp_ns=timestamp_ns,
+            rgb_image=views.get("rgb_image"),
+            depth=self._depth_map(views.get("depth"), depth_scale),
+            raw_depth=self._depth_map(views.get("raw_depth"), depth_scale),
+            rgb_image_left=views.get("rgb_image_left"),
+            sequence_id=sequence_id,
+            buffers=[_SlotLease(self, slot, sequence)],
+        )
+        return ("frame", frame)
+
+    @staticmethod
+    def _depth_map(data, scale) -> Optional[DepthMap]:
+        if data is None:
+            return None
+        return DepthMap(data, scale) if scale is not None else DepthMap(data)
+
+    def _retain_slot(self, sequence: int) -> None:
+        with self._lease_lock:
+            if sequence not in self._leases:
+                raise RuntimeError(f"Cannot retain released frame slot {sequence}")
+            self._leases[sequence] += 1
+
+    def _release_slot(self, slot: int, sequence: int) -> None:
+        with self._lease_lock:
+            count = self._leases.get(sequence)
+            if count is None:
+                return
+            if count > 1:
+                self._leases[sequence] = count - 1
+                return
+            del self._leases[sequence]
+            self._slots_in_use[slot] = 0
+
+    def _close_ring(self) -> None:
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
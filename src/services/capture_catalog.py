@@ -0,0 +1,357 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.services.dataset_layout import (
+    METADATA_FILENAME, SessionPath, iter_session_dirs, parse_frame_filename, parse_session_dir
+)
+from src.services.exceptions import StorageError
+
+CATALOG_FILENAME = "catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    session_dir TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    lighting TEXT NOT NULL,
+    background_id TEXT NOT NULL,
+    sequence_number INTEGER NOT NULL,
+    capture_timestamp REAL,
+    num_files INTEGER NOT NULL DEFAULT 0,
+    total_bytes INTEGER NOT NULL DEFAULT 0,
+    sync_degraded INTEGER,
+    max_jitter_ms REAL,
+    metadata TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    camera_id TEXT NOT NULL,
+    frame_number INTEGER NOT NULL,
+    file_timestamp TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_lighting_background ON sessions(lighting, background_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_files_session ON files(session_id);
+CREATE INDEX IF NOT EXISTS idx_files_camera ON files(camera_id);
+"""
+
+
+@dataclass
+class SessionRecord:
+    """One capture session in the catalog."""
+    session_id: int
+    session_dir: str  # relative to the dataset root
+    date: str
+    lighting: str
+    background_id: str
+    sequence_number: int
+    capture_timestamp: Optional[float]
+    num_files: int
+    total_bytes: int
+    sync_degraded: Optional[bool]
+    max_jitter_ms: Optional[float]
+
+
+@dataclass
+class FileRecord:
+    """One frame file in the catalog."""
+    session_dir: str
+    path: str  # relative to the dataset root
+    camera_id: str
+    frame_number: int
+    file_timestamp: str
+    stream: str
+    size_bytes: int
+
+
+@dataclass
+class _ScannedSession:
+    session: SessionPath
+    metadata: Dict[str, Any]
+    files: List[Tuple[str, int]]  # (file name, size)
+
+
+class CaptureCatalog:
+    """
+    SQLite index of the capture sessions and frame files under a dataset root.
+
+    StorageService adds each session as it is saved, so questions such as
+    "how many captures of background X under Dark lighting" are answered
+    from the index instead of walking the tree. `rebuild` recreates the
+    index from an existing tree.
+
+    The catalog may be shared by several storage threads; a lock serializes
+    access to the single connection.
+    """
+
+    def __init__(self, root_dir: str, db_path: Optional[str] = None):
+        """
+        Args:
+            root_dir: Dataset root that session and file paths are relative to
+            db_path: SQLite file; defaults to <root_dir>/catalog.sqlite
+        """
+        self.root_dir = root_dir
+        self.db_path = db_path or os.path.join(root_dir, CATALOG_FILENAME)
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            raise StorageError(f"Could not open capture catalog: {e}", path=self.db_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add_session(self, session_dir: str, metadata: Dict[str, Any], files: Iterable[Tuple[str, int]]) -> int:
+        """
+        Add or replace a session and its frame files.
+
+        Args:
+            session_dir: Absolute session directory
+            metadata: The session's metadata.json contents
+            files: (file path or name, size in bytes) of the files written
+
+        Returns:
+            The session's row ID
+
+        Raises:
+            StorageError: If the directory is not a session directory or the write fails
+        """
+        session = parse_session_dir(self.root_dir, session_dir)
+        if session is None:
+            raise StorageError("Not a session directory of the dataset", path=session_dir)
+        files = [(os.path.basename(path), size) for path, size in files]
+        with self._lock:
+            try:
+                with self._conn:
+                    return self._insert_session(session, metadata, files)
+            except sqlite3.Error as e:
+                raise StorageError(f"Could not update capture catalog: {e}", path=self.db_path)
+
+    def index_session(self, session_dir: str) -> int:
+        """
+        Add or replace a session from the files on disk.
+
+        Returns:
+            The session's row ID
+
+        Raises:
+            StorageError: If the directory is not a session directory or the write fails
+        """
+        scanned = self._scan_session(session_dir)
+        if scanned is None:
+            raise StorageError("Not a session directory of the dataset", path=session_dir)
+        with self._lock:
+            try:
+                with self._conn:
+                    return self._insert_session(scanned.session, scanned.metadata, scanned.files)
+            except sqlite3.Error as e:
+                raise StorageError(f"Could not update capture catalog: {e}", path=self.db_path)
+
+    def rebuild(self, workers: int = 8) -> int:
+        """
+        Recreate the catalog from the files on disk.
+
+        Session directories are scanned in parallel; the rows are then written
+        in a single transaction.
+
+        Returns:
+            The number of sessions indexed
+        """
+        start = time.perf_counter()
+        session_dirs = list(iter_session_dirs(self.root_dir))
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="catalog-scan") as pool:
+            scanned = [s for s in pool.map(self._scan_session, session_dirs) if s is not None]
+
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute("DELETE FROM files")
+                    self._conn.execute("DELETE FROM sessions")
+                    for item in scanned:
+                        self._insert_session(item.session, item.metadata, item.files)
+            except sqlite3.Error as e:
+                raise StorageError(f"Could not rebuild capture catalog: {e}", path=self.db_path)
+        print(f"Indexed {len(scanned)} sessions in {time.perf_counter() - start:.1f} s")
+        return len(scanned)
+
+    def sessions(self, lighting: Optional[str] = None, background_id: Optional[str] = None,
+                 date_from: Optional[str] = None, date_to: Optional[str] = None,
+                 camera_id: Optional[str] = None, limit: Optional[int] = None) -> List[SessionRecord]:
+        """
+        Find sessions; all filters are optional and combined with AND.
+
+        Args:
+            lighting: Lighting level value, e.g. "Dark"
+            background_id: Background ID
+            date_from: First YYYYMMDD date, inclusive
+            date_to: Last YYYYMMDD date, inclusive
+            camera_id: Only sessions with files from this camera
+            limit: Maximum number of sessions to return
+        """
+        where, params = self._session_filter(lighting, background_id, date_from, date_to, camera_id)
+        sql = f"SELECT * FROM sessions {where} ORDER BY date, lighting, background_id, sequence_number"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._query(sql, params)
+        return [self._session_record(row) for row in rows]
+
+    def count_sessions(self, lighting: Optional[str] = None, background_id: Optional[str] = None,
+                       date_from: Optional[str] = None, date_to: Optional[str] = None,
+                       camera_id: Optional[str] = None) -> int:
+        """Count sessions matching the same filters as `sessions`."""
+        where, params = self._session_filter(lighting, background_id, date_from, date_to, camera_id)
+        return self._query(f"SELECT COUNT(*) FROM sessions {where}", params)[0][0]
+
+    def files(self, session_dir: Optional[str] = None, camera_id: Optional[str] = None,
+              stream: Optional[str] = None) -> List[FileRecord]:
+        """
+        Find frame files.
+
+        Args:
+            session_dir: Session directory, absolute or relative to the root
+            camera_id: Camera ID
+            stream: Stream name: "rgb", "depth", "raw_depth" or "point_cloud"
+        """
+        clauses, params = [], []
+        if session_dir is not None:
+            clauses.append("s.session_dir = ?")
+            params.append(self._relative(session_dir))
+        if camera_id is not None:
+            clauses.append("f.camera_id = ?")
+            params.append(camera_id)
+        if stream is not None:
+            clauses.append("f.stream = ?")
+            params.append(stream)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(
+            "SELECT s.session_dir, f.path, f.camera_id, f.frame_number, f.file_timestamp, f.stream, f.size_bytes "
+            f"FROM files f JOIN sessions s ON s.id = f.session_id {where} ORDER BY f.path",
+            params,
+        )
+        return [FileRecord(*row) for row in rows]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Session counts and sizes per lighting level and background."""
+        rows = self._query(
+            "SELECT lighting, background_id, COUNT(*) AS sessions, SUM(num_files) AS files, "
+            "SUM(total_bytes) AS bytes FROM sessions GROUP BY lighting, background_id "
+            "ORDER BY lighting, background_id",
+            [],
+        )
+        return [dict(row) for row in rows]
+
+    def _insert_session(self, session: SessionPath, metadata: Dict[str, Any], files: List[Tuple[str, int]]) -> int:
+        # Called with the lock held inside a transaction
+        relative_dir = session.relative_dir
+        sync = metadata.get("sync") or {}
+        # Only frame files are cataloged and counted, as when the session is scanned from disk
+        frame_files = [(name, size, parse_frame_filename(name)) for name, size in files]
+        frame_files = [(name, size, parsed) for name, size, parsed in frame_files if parsed is not None]
+        self._conn.execute("DELETE FROM sessions WHERE session_dir = ?", (relative_dir,))
+        cursor = self._conn.execute(
+            "INSERT INTO sessions (session_dir, date, lighting, background_id, sequence_number, "
+            "capture_timestamp, num_files, total_bytes, sync_degraded, max_jitter_ms, metadata, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                relative_dir, session.date, session.lighting, session.background_id, session.sequence_number,
+                metadata.get("timestamp"), len(frame_files), sum(size for _, size, _ in frame_files),
+                int(sync["degraded"]) if "degraded" in sync else None, sync.get("max_jitter_ms"),
+                json.dumps(metadata, ensure_ascii=False), time.time(),
+            ),
+        )
+        session_id = cursor.lastrowid
+        rows = []
+        for name, size, parsed in frame_files:
+            rows.append((
+                session_id, os.path.join(relative_dir, name), parsed.camera_id, parsed.frame_number,
+                parsed.timestamp, parsed.stream, size,
+            ))
+        self._conn.executemany(
+            "INSERT INTO files (session_id, path, camera_id, frame_number, file_timestamp, stream, size_bytes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return session_id
+
+    def _scan_session(self, session_dir: str) -> Optional[_ScannedSession]:
+        session = parse_session_dir(self.root_dir, session_dir)
+        if session is None:
+            return None
+        metadata = {}
+        files = []
+        try:
+            with os.scandir(session_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    if entry.name == METADATA_FILENAME:
+                        with open(entry.path, "r", encoding="utf-8") as f:
+                            metadata = json.load(f)
+                    elif parse_frame_filename(entry.name) is not None:
+                        files.append((entry.name, entry.stat().st_size))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not scan session {session_dir}: {e}")
+        return _ScannedSession(session, metadata, files)
+
+    def _session_filter(self, lighting, background_id, date_from, date_to, camera_id) -> Tuple[str, list]:
+        clauses, params = [], []
+        for column, value in (("lighting", lighting), ("background_id", background_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if date_from is not None:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("date <= ?")
+            params.append(date_to)
+        if camera_id is not None:
+            clauses.append("id IN (SELECT session_id FROM files WHERE camera_id = ?)")
+            params.append(camera_id)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def _query(self, sql: str, params: list) -> List[sqlite3.Row]:
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                raise StorageError(f"Capture catalog query failed: {e}", path=self.db_path)
+
+    def _relative(self, session_dir: str) -> str:
+        if os.path.isabs(session_dir):
+            return os.path.relpath(session_dir, self.root_dir)
+        return os.path.normpath(session_dir)
+
+    @staticmethod
+    def _session_record(row: sqlite3.Row) -> SessionRecord:
+        return SessionRecord(
+            session_id=row["id"],
+            session_dir=row["session_dir"],
+            date=row["date"],
+            lighting=row["lighting"],
+            background_id=row["background_id"],
+            sequence_number=row["sequence_number"],
+            capture_timestamp=row["capture_timestamp"],
+            num_files=row["num_files"],
+            total_bytes=row["total_bytes"],
+            sync_degraded=bool(row["sync_degraded"]) if row["sync_degraded"] is not None else None,
+            max_jitter_ms=row["max_jitter_ms"],
+        )
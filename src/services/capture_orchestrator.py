@@ -1,12 +1,22 @@
-from typing import List
-from src.models.camera import Frame
+from typing import Optional
+from src.services.config_service import ConfigService
+from src.services.frame_synchronizer import FrameSynchronizer, SyncResult
 
 class CaptureOrchestrator:
     """Orchestrates the capture of frames from all cameras."""
 
-    def __init__(self, preview_grid):
+    def __init__(self, preview_grid, synchronizer: Optional[FrameSynchronizer] = None):
         self._preview_grid = preview_grid
+        if synchronizer is None:
+            config = ConfigService()
+            synchronizer = FrameSynchronizer(
+                max_jitter_ms=float(config.get('capture.sync.max_jitter_ms', 20)),
+                deadline_ms=float(config.get('capture.sync.deadline_ms', 100)),
+                on_violation=config.get('capture.sync.on_violation', 'degrade'),
+                mode=config.get('capture.sync.mode', 'nearest'),
+            )
+        self._synchronizer = synchronizer
 
-    def capture_all_frames(self) -> List[Frame]:
-        """Get the last fully captured frame from each camera worker."""
-        return self._preview_grid.get_last_frames()
+    def capture_synchronized(self, trigger_ns: Optional[int] = None) -> SyncResult:
+        """Match one frame per camera to the trigger time; the caller must call `release()` on the result."""
+        return self._synchronizer.synchronize(self._preview_grid.get_frame_buffers(), trigger_ns)
@@ -0,0 +1,176 @@
+"""
+Per-session checksum manifest for detecting corruption after copies.
+
+StorageService hashes every encoded buffer while it is still in memory
+and writes manifest.json into the session, before metadata.json:
+
+    {
+        "algorithm": "sha256",
+        "files": {"<path relative to the session>": {"size": 123, "digest": "<hex>"}, ...}
+    }
+
+`verify_session` re-hashes the files on disk and compares them with it;
+`python -m src.tools.verify` runs it over whole date trees.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.services.exceptions import ConfigurationError, StorageError
+
+MANIFEST_FILENAME = "manifest.json"
+DEFAULT_ALGORITHM = "sha256"  # hardware accelerated on current CPUs, faster than blake2b or md5 there
+_READ_CHUNK_BYTES = 1 << 20
+
+
+def validate_algorithm(algorithm: str) -> str:
+    """
+    Raises:
+        ConfigurationError: If hashlib does not provide the algorithm on every platform
+    """
+    if algorithm not in hashlib.algorithms_guaranteed or algorithm.startswith("shake_"):
+        raise ConfigurationError(f"Unknown checksum algorithm '{algorithm}'", config_key="storage.checksums.algorithm")
+    return algorithm
+
+
+def checksum(data, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """The hex digest of an in-memory buffer (bytes or a contiguous array)."""
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def file_checksum(path: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """The hex digest of a file, read in chunks."""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class FileChecksum:
+    size: int
+    digest: str
+
+
+@dataclass
+class SessionManifest:
+    """The checksums of a session's files, keyed by path relative to the session directory."""
+    algorithm: str = DEFAULT_ALGORITHM
+    files: Dict[str, FileChecksum] = field(default_factory=dict)
+
+    def add(self, relative_path: str, data) -> None:
+        """Hash an in-memory buffer that is written to `relative_path`."""
+        self.add_digest(relative_path, len(data), checksum(data, self.algorithm))
+
+    def add_digest(self, relative_path: str, size: int, digest: str) -> None:
+        """Record a file hashed elsewhere, e.g. on an encoder worker."""
+        self.files[relative_path.replace(os.sep, "/")] = FileChecksum(size, digest)
+
+    def to_json(self) -> bytes:
+        files = {path: {"size": entry.size, "digest": entry.digest} for path, entry in sorted(self.files.items())}
+        return json.dumps({"algorithm": self.algorithm, "files": files}, indent=4, ensure_ascii=False).encode("utf-8")
+
+    def save(self, session_dir: str) -> None:
+        """
+        Replace a session's manifest atomically.
+
+        Raises:
+            OSError: If the manifest cannot be written
+        """
+        path = os.path.join(session_dir, MANIFEST_FILENAME)
+        with open(path + ".tmp", "wb") as f:
+            f.write(self.to_json())
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, session_dir: str) -> Optional["SessionManifest"]:
+        """
+        Read a session's manifest.
+
+        Returns:
+            The manifest, or None if the session has none
+
+        Raises:
+            StorageError: If the manifest cannot be read or parsed
+        """
+        path = os.path.join(session_dir, MANIFEST_FILENAME)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            files = {name: FileChecksum(int(entry["size"]), str(entry["digest"]))
+                     for name, entry in data["files"].items()}
+            return cls(validate_algorithm(data["algorithm"]), files)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, ConfigurationError) as e:
+            raise StorageError(f"Unreadable checksum manifest: {e}", path=path)
+
+
+@dataclass
+class VerifyResult:
+    """Differences between a session's manifest and the files on disk."""
+    session_dir: str
+    files: int = 0  # files checked
+    bytes: int = 0
+    missing: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)  # on disk but not in the manifest
+    corrupted: List[str] = field(default_factory=list)  # size or digest differs
+    error: str = ""  # no or unreadable manifest
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.extra or self.corrupted or self.error)
+
+    def summary(self) -> str:
+        if self.error:
+            return self.error
+        return (f"{len(self.missing)} missing, {len(self.extra)} extra, "
+                f"{len(self.corrupted)} corrupted of {self.files} files")
+
+
+def verify_session(session_dir: str) -> VerifyResult:
+    """
+    Re-hash a session's files and compare them with its manifest.
+
+    Defined at module level so it can run in a process pool.
+    """
+    result = VerifyResult(session_dir)
+    try:
+        manifest = SessionManifest.load(session_dir)
+    except StorageError as e:
+        result.error = str(e)
+        return result
+    if manifest is None:
+        result.error = "No checksum manifest"
+        return result
+
+    on_disk = set()
+    for directory, _, names in os.walk(session_dir):
+        for name in names:
+            relative = os.path.relpath(os.path.join(directory, name), session_dir).replace(os.sep, "/")
+            if relative != MANIFEST_FILENAME:
+                on_disk.add(relative)
+
+    for relative, expected in sorted(manifest.files.items()):
+        if relative not in on_disk:
+            result.missing.append(relative)
+            continue
+        path = os.path.join(session_dir, relative)
+        result.files += 1
+        try:
+            # The size check is free and catches truncated copies without reading the file
+            if os.path.getsize(path) != expected.size or file_checksum(path, manifest.algorithm) != expected.digest:
+                result.corrupted.append(relative)
+            else:
+                result.bytes += expected.size
+        except OSError:
+            result.corrupted.append(relative)
+    result.extra = sorted(on_disk - set(manifest.files))
+    return result
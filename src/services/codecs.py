@@ -0,0 +1,266 @@
+import io
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.services.depth_codec import decode_rvl, encode_rvl
+from src.services.exceptions import ConfigurationError, StorageError
+from src.services.point_cloud import PointCloud, decode_ply, encode_ply
+
+# libtiff compression codes accepted by cv2.IMWRITE_TIFF_COMPRESSION
+TIFF_COMPRESSION_CODES = {
+    "none": 1,
+    "lzw": 5,
+    "deflate": 8,
+    "packbits": 32773,
+}
+
+# Streams a capture can write, with the file name suffix each one uses
+STREAM_SUFFIXES = {
+    "rgb": "_rgb",
+    "depth": "_depth",
+    "raw_depth": "_depth_raw",
+    "point_cloud": "_PC",
+}
+
+# Codec assigned to each stream when the config does not name one
+DEFAULT_STREAM_CODECS = {
+    "rgb": "png",
+    "depth": "tiff",
+    "raw_depth": "tiff",
+    "point_cloud": "ply",
+}
+
+
+class Codec(ABC):
+    """
+    Encodes arrays of one stream to bytes and decodes them back.
+
+    Codecs are plain picklable objects so that encoding can run in a
+    process pool.
+    """
+
+    name = ""
+    extension = ""
+    lossless = True
+    dtypes: Tuple[str, ...] = ("uint8", "uint16")
+
+    def supports(self, dtype) -> bool:
+        """Check whether arrays of this dtype can be encoded."""
+        return np.dtype(dtype).name in self.dtypes
+
+    @abstractmethod
+    def encode(self, image: np.ndarray):
+        """Encode an array; returns a bytes-like object."""
+        pass
+
+    @abstractmethod
+    def decode(self, data) -> np.ndarray:
+        """Decode bytes produced by `encode`."""
+        pass
+
+    def describe(self) -> str:
+        return self.name
+
+
+class OpenCVCodec(Codec):
+    """An image format encoded through cv2.imencode with fixed parameters."""
+
+    def __init__(self, name: str, extension: str, params: Optional[List[int]] = None,
+                 lossless: bool = True, dtypes: Tuple[str, ...] = ("uint8", "uint16"), label: str = ""):
+        self.name = name
+        self.extension = extension
+        self.params = list(params or [])
+        self.lossless = lossless
+        self.dtypes = dtypes
+        self._label = label or name
+
+    def encode(self, image: np.ndarray):
+        is_success, buffer = cv2.imencode(self.extension, image, self.params)
+        if not is_success:
+            raise StorageError(f"Failed to encode image as {self.extension}")
+        return buffer
+
+    def decode(self, data) -> np.ndarray:
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise StorageError(f"Failed to decode {self.extension} image")
+        return image
+
+    def describe(self) -> str:
+        return self._label
+
+
+class NpyCodec(Codec):
+    """Raw NumPy `.npy` arrays: no compression, any dtype."""
+
+    name = "npy"
+    extension = ".npy"
+    dtypes = ("uint8", "uint16", "float32", "float64")
+
+    def encode(self, image: np.ndarray):
+        stream = io.BytesIO()
+        np.save(stream, np.ascontiguousarray(image), allow_pickle=False)
+        return stream.getvalue()
+
+    def decode(self, data) -> np.ndarray:
+        return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+class RvlCodec(Codec):
+    """Lossless RVL run-length/bit-packed coding of uint16 depth, see depth_codec."""
+
+    name = "rvl"
+    extension = ".rvl"
+    dtypes = ("uint16",)
+
+    def encode(self, image: np.ndarray):
+        return encode_rvl(image)
+
+    def decode(self, data) -> np.ndarray:
+        try:
+            return decode_rvl(data)
+        except ValueError as e:
+            raise StorageError(f"Failed to decode RVL depth: {e}")
+
+
+class PlyCodec(Codec):
+    """Point clouds as binary little-endian PLY files."""
+
+    name = "ply"
+    extension = ".ply"
+    dtypes = ("float32",)
+
+    def encode(self, cloud: PointCloud):
+        return encode_ply(cloud)
+
+    def decode(self, data) -> PointCloud:
+        try:
+            return decode_ply(data)
+        except ValueError as e:
+            raise StorageError(f"Failed to decode PLY: {e}")
+
+
+def _png(png_level: int = 1, **_) -> Codec:
+    level = max(0, min(9, int(png_level)))
+    return OpenCVCodec("png", ".png", [cv2.IMWRITE_PNG_COMPRESSION, level], label=f"png(level={level})")
+
+
+def _webp(**_) -> Codec:
+    # OpenCV switches WebP to lossless mode for quality values above 100
+    return OpenCVCodec("webp", ".webp", [cv2.IMWRITE_WEBP_QUALITY, 101], dtypes=("uint8",), label="webp(lossless)")
+
+
+def _jpeg(jpeg_quality: int = 95, **_) -> Codec:
+    quality = max(1, min(100, int(jpeg_quality)))
+    return OpenCVCodec("jpeg", ".jpg", [cv2.IMWRITE_JPEG_QUALITY, quality], lossless=False,
+                       dtypes=("uint8",), label=f"jpeg(quality={quality})")
+
+
+def _tiff(tiff: str = "lzw", **_) -> Codec:
+    mode = str(tiff).lower()
+    if mode not in TIFF_COMPRESSION_CODES:
+        raise ConfigurationError(
+            f"Unknown TIFF compression '{tiff}'. Expected one of {', '.join(TIFF_COMPRESSION_CODES)}"
+        )
+    return OpenCVCodec("tiff", ".tiff", [cv2.IMWRITE_TIFF_COMPRESSION, TIFF_COMPRESSION_CODES[mode]],
+                       label=f"tiff({mode})")
+
+
+_REGISTRY: Dict[str, Callable[..., Codec]] = {
+    "png": _png,
+    "webp": _webp,
+    "jpeg": _jpeg,
+    "tiff": _tiff,
+    "npy": lambda **_: NpyCodec(),
+    "rvl": lambda **_: RvlCodec(),
+    "ply": lambda **_: PlyCodec(),
+}
+
+
+def register_codec(name: str, factory: Callable[..., Codec]) -> None:
+    """
+    Register a codec factory under a name usable in the config.
+
+    Args:
+        name: Codec name, e.g. "png"
+        factory: Called with the codec options as keyword arguments; must accept
+            and ignore options it does not know
+    """
+    _REGISTRY[name.lower()] = factory
+
+
+def available_codecs() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def create_codec(spec: Union[str, Dict[str, Any]], **defaults) -> Codec:
+    """
+    Create a codec from a config entry.
+
+    Args:
+        spec: A codec name, or a mapping with a "codec" name and its options,
+            e.g. {"codec": "jpeg", "jpeg_quality": 90}
+        **defaults: Options used when the spec does not set them
+
+    Raises:
+        ConfigurationError: If the codec is unknown or an option is invalid
+    """
+    options = dict(defaults)
+    if isinstance(spec, dict):
+        options.update({k: v for k, v in spec.items() if k != "codec"})
+        name = spec.get("codec", "")
+    else:
+        name = spec
+    factory = _REGISTRY.get(str(name).lower())
+    if factory is None:
+        raise ConfigurationError(
+            f"Unknown codec '{name}'. Available codecs: {', '.join(available_codecs())}",
+            config_key="codec",
+        )
+    return factory(**options)
+
+
+def codec_for_extension(extension: str) -> Codec:
+    """
+    Get a codec that can decode files with the given extension.
+
+    Raises:
+        ConfigurationError: If no registered codec writes this extension
+    """
+    extension = extension.lower()
+    if extension == ".tif":
+        extension = ".tiff"
+    for name in available_codecs():
+        codec = create_codec(name)
+        if codec.extension == extension:
+            return codec
+    raise ConfigurationError(f"No codec for '{extension}' files")
+
+
+def stream_codecs(config) -> Dict[str, Codec]:
+    """
+    Build the codec of every stream from the `storage.streams` and
+    `storage.compression` config sections.
+
+    A stream whose codec is unknown or cannot hold its data type falls back
+    to its default codec with a warning.
+    """
+    compression = config.get('storage.compression', {}) or {}
+    streams = config.get('storage.streams', {}) or {}
+    stream_dtypes = {"rgb": "uint8", "depth": "uint16", "raw_depth": "uint16", "point_cloud": "float32"}
+
+    codecs = {}
+    for stream, default in DEFAULT_STREAM_CODECS.items():
+        spec = streams.get(stream, default)
+        try:
+            codec = create_codec(spec, **compression)
+            if not codec.supports(stream_dtypes[stream]):
+                raise ConfigurationError(f"Codec '{codec.name}' cannot store {stream_dtypes[stream]} data")
+        except ConfigurationError as e:
+            print(f"Warning: Invalid codec for stream '{stream}': {e}. Using '{default}'.")
+            codec = create_codec(default)
+        codecs[stream] = codec
+    return codecs
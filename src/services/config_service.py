@@ -53,6 +53,35 @@ class ConfigService:
         """Returns the thread stop timeout in milliseconds."""
         return int(self.ui_settings.get("thread_stop_timeout_ms", 2000))
 
+    @property
+    def capture_settings(self) -> Dict[str, Any]:
+        """Returns the capture pipeline settings dictionary."""
+        return self._config.get("capture", {})
+
+    @property
+    def frame_buffer_capacity(self) -> int:
+        """Returns the number of frames kept in each camera's ring buffer."""
+        return int(self.capture_settings.get("buffer_capacity", 30))
+
+    @property
+    def target_fps(self) -> float:
+        """Returns the pacing rate for non-blocking frame sources (0 uses the camera's own FPS)."""
+        return float(self.capture_settings.get("target_fps", 0) or 0)
+
+    @property
+    def acquisition_mode(self) -> str:
+        """Returns how cameras are run: "thread" (in-process) or "process" (one process per camera)."""
+        mode = str(self.capture_settings.get("acquisition_mode", "thread")).lower()
+        if mode not in ("thread", "process"):
+            print(f"Warning: Invalid acquisition_mode '{mode}'. Using 'thread'.")
+            return "thread"
+        return mode
+
+    @property
+    def storage_settings(self) -> Dict[str, Any]:
+        """Returns the storage pipeline settings dictionary."""
+        return self._config.get("storage", {})
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         Retrieves a value from the config using dot notation.
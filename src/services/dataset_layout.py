@@ -0,0 +1,108 @@
+"""
+Naming rules of the dataset tree written by StorageService:
+
+    <root>/<YYYYMMDD>/<lighting>/<background_id>/seq_<NNN>/
+        metadata.json
+        <timestamp>_<camera_id>_frame_<NNNN><stream suffix><extension>
+
+Everything that reads the tree back parses paths through this module.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from src.services.codecs import STREAM_SUFFIXES
+
+METADATA_FILENAME = "metadata.json"
+FILE_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%f"  # truncated to milliseconds in file names
+
+_SUFFIX_STREAMS = {suffix: stream for stream, suffix in STREAM_SUFFIXES.items()}
+# Longer suffixes first so "_depth_raw" is not read as "_depth"
+_SUFFIX_PATTERN = "|".join(re.escape(s) for s in sorted(_SUFFIX_STREAMS, key=len, reverse=True))
+FRAME_FILE_RE = re.compile(
+    r"^(?P<timestamp>\d{8}T\d{9})_(?P<camera_id>.+)_frame_(?P<frame_number>\d+)"
+    rf"(?P<suffix>{_SUFFIX_PATTERN})(?P<extension>\.[A-Za-z0-9]+)$"
+)
+_DATE_RE = re.compile(r"^\d{8}$")
+_SEQUENCE_RE = re.compile(r"^seq_(\d+)$")
+
+
+@dataclass(frozen=True)
+class FrameFileName:
+    """The parts of a frame file name."""
+    timestamp: str
+    camera_id: str
+    frame_number: int
+    stream: str
+    extension: str
+
+
+@dataclass(frozen=True)
+class SessionPath:
+    """The parts of a session directory path relative to the dataset root."""
+    date: str
+    lighting: str
+    background_id: str
+    sequence_number: int
+    relative_dir: str
+
+
+def parse_frame_filename(filename: str) -> Optional[FrameFileName]:
+    """Parse a frame file name; returns None for files that are not frame files."""
+    match = FRAME_FILE_RE.match(filename)
+    if match is None:
+        return None
+    return FrameFileName(
+        timestamp=match["timestamp"],
+        camera_id=match["camera_id"],
+        frame_number=int(match["frame_number"]),
+        stream=_SUFFIX_STREAMS[match["suffix"]],
+        extension=match["extension"].lower(),
+    )
+
+
+def parse_session_dir(root_dir: str, session_dir: str) -> Optional[SessionPath]:
+    """Parse a session directory path; returns None if it is not a session directory under `root_dir`."""
+    try:
+        relative = os.path.relpath(session_dir, root_dir)
+    except ValueError:
+        # Different drives on Windows
+        return None
+    parts = relative.replace("\\", "/").split("/")
+    if len(parts) != 4 or not _DATE_RE.match(parts[0]):
+        return None
+    sequence = _SEQUENCE_RE.match(parts[3])
+    if sequence is None:
+        return None
+    return SessionPath(parts[0], parts[1], parts[2], int(sequence.group(1)), os.path.normpath(relative))
+
+
+def iter_session_dirs(root_dir: str, date: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the session directories under a dataset root, in sorted order.
+
+    Only the four directory levels of the layout are listed, so this never
+    touches the frame files themselves.
+
+    Args:
+        root_dir: Dataset root
+        date: Only yield sessions of this YYYYMMDD date
+    """
+    for date_entry in _sorted_dirs(root_dir):
+        if not _DATE_RE.match(date_entry.name) or (date is not None and date_entry.name != date):
+            continue
+        for lighting_entry in _sorted_dirs(date_entry.path):
+            for background_entry in _sorted_dirs(lighting_entry.path):
+                for sequence_entry in _sorted_dirs(background_entry.path):
+                    if _SEQUENCE_RE.match(sequence_entry.name):
+                        yield sequence_entry.path
+
+
+def _sorted_dirs(path: str):
+    try:
+        with os.scandir(path) as entries:
+            return sorted((e for e in entries if e.is_dir()), key=lambda e: e.name)
+    except OSError:
+        return []
@@ -0,0 +1,337 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from src.models.camera import MILLIMETER_SCALE, DepthMap, Frame
+from src.services.capture_catalog import CATALOG_FILENAME, CaptureCatalog
+from src.services.codecs import Codec, codec_for_extension
+from src.services.dataset_layout import (
+    FILE_TIMESTAMP_FORMAT, METADATA_FILENAME, SessionPath,
+    iter_session_dirs, parse_frame_filename, parse_session_dir
+)
+from src.services.exceptions import StorageError
+
+IMAGE_STREAMS = ("rgb", "depth", "raw_depth")
+
+
+@dataclass
+class CameraFrame:
+    """
+    The files one camera wrote for a capture.
+
+    Streams are decoded on first access and cached; `DatasetReader` decodes
+    them ahead of time on its prefetch threads.
+    """
+    camera_id: str
+    frame_number: int
+    timestamp: str  # file name timestamp, YYYYMMDDTHHMMSSmmm
+    paths: Dict[str, str] = field(default_factory=dict)  # stream -> absolute path
+    _decoded: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def streams(self) -> List[str]:
+        return list(self.paths)
+
+    def is_loaded(self, stream: str) -> bool:
+        return stream in self._decoded
+
+    def load(self, stream: str) -> Any:
+        """
+        Decode one stream: a BGR image for "rgb", uint16 millimeters for the
+        depth streams and a PointCloud for "point_cloud".
+
+        Raises:
+            KeyError: If the camera did not write this stream
+            StorageError: If the file cannot be read or decoded
+        """
+        if stream not in self._decoded:
+            self._decoded[stream] = _decode_file(self.paths[stream])
+        return self._decoded[stream]
+
+    def unload(self, stream: Optional[str] = None) -> None:
+        """Drop the decoded data of one stream, or of all streams."""
+        if stream is None:
+            self._decoded.clear()
+        else:
+            self._decoded.pop(stream, None)
+
+    @property
+    def timestamp_ns(self) -> int:
+        """The file name timestamp as nanoseconds since the epoch (millisecond resolution)."""
+        # The file names drop the last three digits of the microseconds
+        parsed = datetime.strptime(self.timestamp + "000", FILE_TIMESTAMP_FORMAT)
+        return int(parsed.timestamp() * 1e6) * 1000
+
+    def to_frame(self) -> Frame:
+        """
+        Decode the image streams into a Frame like the one that was saved.
+
+        Depth is read back at millimeter scale, which is how StorageService writes it.
+        """
+        rgb = self.load("rgb") if "rgb" in self.paths else None
+        depth = DepthMap(self.load("depth"), MILLIMETER_SCALE) if "depth" in self.paths else None
+        raw_depth = DepthMap(self.load("raw_depth"), MILLIMETER_SCALE) if "raw_depth" in self.paths else None
+        return Frame(
+            camera_id=self.camera_id,
+            frame_number=self.frame_number,
+            timestamp_ns=self.timestamp_ns,
+            rgb_image=rgb,
+            depth=depth,
+            raw_depth=raw_depth,
+        )
+
+
+@dataclass
+class CaptureRecord:
+    """One capture session: its metadata and the frames of every camera."""
+    session: SessionPath
+    session_dir: str  # absolute
+    metadata: Dict[str, Any]
+    frames: List[CameraFrame]  # sorted by camera ID, then frame number
+
+    @property
+    def camera_ids(self) -> List[str]:
+        return sorted({frame.camera_id for frame in self.frames})
+
+    def camera(self, camera_id: str) -> Optional[CameraFrame]:
+        """The first frame of a camera, or None if it has no files in this capture."""
+        return next((frame for frame in self.frames if frame.camera_id == camera_id), None)
+
+    def load(self, streams: Optional[Iterable[str]] = None) -> "CaptureRecord":
+        """Decode the given streams (default: all) of every frame now."""
+        for frame in self.frames:
+            for stream in (streams if streams is not None else frame.streams):
+                if stream in frame.paths:
+                    frame.load(stream)
+        return self
+
+
+class DatasetReader:
+    """
+    Reads back the dataset tree written by StorageService.
+
+    Iterating the reader yields one CaptureRecord per session, in path order.
+    Sessions are found by listing the directory levels of the layout, or,
+    when the dataset has a capture catalog, by querying it, which avoids
+    walking the tree and applies the filters in SQL.
+
+    With `workers` > 0 the listing, metadata loading and decoding of the
+    requested streams run on a thread pool ahead of the consumer (OpenCV
+    releases the GIL while decoding). At most `prefetch` records are in
+    flight or waiting at any time, which bounds the decoded data held in
+    memory. Streams not prefetched are decoded lazily on access.
+
+    Example:
+        reader = DatasetReader(root, lighting="Dark", streams=["rgb", "depth"], workers=8)
+        for record in reader:
+            for frame in record.frames:
+                image = frame.load("rgb")
+    """
+
+    def __init__(self, root_dir: str, lighting: Optional[str] = None, background_id: Optional[str] = None,
+                 date_from: Optional[str] = None, date_to: Optional[str] = None,
+                 camera_ids: Optional[Sequence[str]] = None, streams: Optional[Sequence[str]] = IMAGE_STREAMS,
+                 workers: int = 4, prefetch: int = 8, use_catalog: bool = True,
+                 catalog_path: Optional[str] = None):
+        """
+        Args:
+            root_dir: Dataset root
+            lighting: Lighting level value, e.g. "Dark" (a LightingLevel is accepted too)
+            background_id: Background ID
+            date_from: First YYYYMMDD date, inclusive
+            date_to: Last YYYYMMDD date, inclusive
+            camera_ids: Only read files of these cameras; sessions without any are skipped
+            streams: Streams to decode ahead of the consumer; None or empty for fully lazy decoding
+            workers: Prefetch threads; 0 lists and decodes in the consuming thread
+            prefetch: Maximum number of records decoded ahead of the consumer
+            use_catalog: Query the capture catalog when the dataset has one
+            catalog_path: Catalog file; defaults to <root_dir>/catalog.sqlite
+        """
+        self.root_dir = root_dir
+        self.lighting = getattr(lighting, "value", lighting)
+        self.background_id = background_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.camera_ids = set(camera_ids) if camera_ids else None
+        self.streams = list(streams or [])
+        self.workers = max(0, int(workers))
+        self.prefetch = max(1, int(prefetch))
+        self.use_catalog = use_catalog
+        self.catalog_path = catalog_path or os.path.join(root_dir, CATALOG_FILENAME)
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        catalog = self._open_catalog()
+        try:
+            if catalog is not None:
+                sources = self._catalog_sessions(catalog)
+            else:
+                sources = ((path, None) for path in self._scan_sessions())
+            if self.workers == 0:
+                for session_dir, files in sources:
+                    record = self._read_session(session_dir, files)
+                    if record is not None:
+                        yield record
+            else:
+                yield from self._prefetched(sources)
+        finally:
+            if catalog is not None:
+                catalog.close()
+
+    def session_dirs(self) -> List[str]:
+        """The absolute directories of the matching sessions, without reading them."""
+        catalog = self._open_catalog()
+        if catalog is None:
+            return list(self._scan_sessions())
+        try:
+            return [session_dir for session_dir, _ in self._catalog_sessions(catalog)]
+        finally:
+            catalog.close()
+
+    def _prefetched(self, sources: Iterator[Tuple[str, Optional[List[str]]]]) -> Iterator[CaptureRecord]:
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dataset-prefetch") as pool:
+            try:
+                for session_dir, files in sources:
+                    pending.append(pool.submit(self._read_session, session_dir, files))
+                    if len(pending) >= self.prefetch:
+                        record = pending.popleft().result()
+                        if record is not None:
+                            yield record
+                while pending:
+                    record = pending.popleft().result()
+                    if record is not None:
+                        yield record
+            finally:
+                # The consumer stopped early; skip the sessions that have not started
+                for future in pending:
+                    future.cancel()
+
+    def _open_catalog(self) -> Optional[CaptureCatalog]:
+        if not (self.use_catalog and os.path.isfile(self.catalog_path)):
+            return None
+        try:
+            return CaptureCatalog(self.root_dir, self.catalog_path)
+        except StorageError as e:
+            print(f"Warning: {e}; scanning the dataset tree instead")
+            return None
+
+    def _catalog_sessions(self, catalog: CaptureCatalog) -> Iterator[Tuple[str, Optional[List[str]]]]:
+        records = catalog.sessions(
+            lighting=self.lighting, background_id=self.background_id,
+            date_from=self.date_from, date_to=self.date_to,
+        )
+        for record in records:
+            files = [os.path.basename(f.path) for f in catalog.files(session_dir=record.session_dir)]
+            if self.camera_ids is not None and not any(self._wanted(name) for name in files):
+                continue
+            yield os.path.join(self.root_dir, record.session_dir), files
+
+    def _scan_sessions(self) -> Iterator[str]:
+        for session_dir in iter_session_dirs(self.root_dir):
+            session = parse_session_dir(self.root_dir, session_dir)
+            if session is not None and self._matches(session):
+                yield session_dir
+
+    def _matches(self, session: SessionPath) -> bool:
+        return (
+            (self.lighting is None or session.lighting == self.lighting)
+            and (self.background_id is None or session.background_id == self.background_id)
+            and (self.date_from is None or session.date >= self.date_from)
+            and (self.date_to is None or session.date <= self.date_to)
+        )
+
+    def _wanted(self, filename: str) -> bool:
+        parsed = parse_frame_filename(filename)
+        return parsed is not None and (self.camera_ids is None or parsed.camera_id in self.camera_ids)
+
+    def _read_session(self, session_dir: str, files: Optional[List[str]]) -> Optional[CaptureRecord]:
+        """List (unless the catalog did), group and prefetch one session; None if nothing matches."""
+        record = read_capture(self.root_dir, session_dir, files, self.camera_ids)
+        if record is None:
+            return None
+        for frame in record.frames:
+            for stream in self.streams:
+                if stream not in frame.paths:
+                    continue
+                try:
+                    frame.load(stream)
+                except StorageError as e:
+                    # Left undecoded, so the consumer gets the error if it asks for the stream
+                    print(f"Warning: {e}")
+        return record
+
+
+def read_capture(root_dir: str, session_dir: str, files: Optional[List[str]] = None,
+                 camera_ids: Optional[Set[str]] = None) -> Optional[CaptureRecord]:
+    """
+    Read one session's metadata and group its frame files, without decoding them.
+
+    Args:
+        root_dir: Dataset root
+        session_dir: Absolute session directory
+        files: The session's file names, if already known; otherwise the directory is listed
+        camera_ids: Only include files of these cameras
+
+    Returns:
+        The capture, or None if the directory is not a session or has no matching files
+    """
+    session = parse_session_dir(root_dir, session_dir)
+    if session is None:
+        return None
+    if files is None:
+        try:
+            with os.scandir(session_dir) as entries:
+                files = [entry.name for entry in entries if entry.is_file()]
+        except OSError as e:
+            print(f"Warning: Could not list session {session_dir}: {e}")
+            return None
+
+    wanted = []
+    for name in files:
+        parsed = parse_frame_filename(name)
+        if parsed is not None and (camera_ids is None or parsed.camera_id in camera_ids):
+            wanted.append(name)
+    frames = _group_frames(session_dir, wanted)
+    if not frames:
+        return None
+
+    metadata = {}
+    try:
+        with open(os.path.join(session_dir, METADATA_FILENAME), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read metadata of {session_dir}: {e}")
+    return CaptureRecord(session, session_dir, metadata, frames)
+
+
+def _group_frames(session_dir: str, filenames: Iterable[str]) -> List[CameraFrame]:
+    frames: Dict[Tuple[str, int], CameraFrame] = {}
+    for name in filenames:
+        parsed = parse_frame_filename(name)
+        key = (parsed.camera_id, parsed.frame_number)
+        frame = frames.get(key)
+        if frame is None:
+            frame = frames[key] = CameraFrame(parsed.camera_id, parsed.frame_number, parsed.timestamp)
+        frame.paths[parsed.stream] = os.path.join(session_dir, name)
+    return [frames[key] for key in sorted(frames)]
+
+
+_decoders: Dict[str, Codec] = {}
+
+
+def _decode_file(path: str) -> Any:
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        codec = _decoders.get(extension)
+        if codec is None:
+            codec = _decoders.setdefault(extension, codec_for_extension(extension))
+        # Reading the bytes ourselves handles non-ASCII paths on Windows
+        with open(path, "rb") as f:
+            data = f.read()
+        return codec.decode(data)
+    except Exception as e:
+        raise StorageError(f"Could not decode {os.path.basename(path)}: {e}", path=path)
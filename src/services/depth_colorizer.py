@@ -0,0 +1,167 @@
+import threading
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.services.exceptions import ConfigurationError
+
+COLORMAPS = {
+    "jet": cv2.COLORMAP_JET,
+    "turbo": cv2.COLORMAP_TURBO,
+    "viridis": cv2.COLORMAP_VIRIDIS,
+    "inferno": cv2.COLORMAP_INFERNO,
+    "bone": cv2.COLORMAP_BONE,
+}
+
+# How the colormap range follows the depth of each frame:
+#   "minmax":     from the frame's nearest to farthest depth within the fixed
+#                 range, like cv2.NORM_MINMAX (the original preview look)
+#   "percentile": between two percentiles of a subsample of the valid pixels,
+#                 so single outliers do not flatten the contrast
+#   "fixed":      the fixed range itself, so colors mean the same distance in every frame
+RANGE_MODES = ("minmax", "percentile", "fixed")
+
+
+class DepthColorizer:
+    """
+    Turns native uint16 depth into RGBX8888 images with one table lookup per pixel.
+
+    For a depth range the whole chain clip -> scale to 0..255 -> colormap
+    is folded into a 65536-entry table of packed RGBX pixels, which is
+    cached per range. Colorizing a frame is then a single `np.take`, whose
+    result is viewed as an (H, W, 4) image that Qt draws without conversion.
+    """
+
+    def __init__(self, mode: str = "minmax", min_m: float = 0.1, max_m: float = 5.0,
+                 percentiles: Sequence[float] = (2.0, 98.0), colormap: str = "jet",
+                 sample_step: int = 4, cache_size: int = 16):
+        """
+        Args:
+            mode: One of RANGE_MODES
+            min_m: Near end of the fixed range in meters; nearer depth gets the first color
+            max_m: Far end of the fixed range in meters
+            percentiles: Low and high percentile of the "percentile" mode
+            colormap: One of COLORMAPS
+            sample_step: Pixel stride of the "percentile" subsample
+            cache_size: Lookup tables kept (256 KB each)
+
+        Raises:
+            ConfigurationError: If the mode or colormap is unknown
+        """
+        if mode not in RANGE_MODES:
+            raise ConfigurationError(
+                f"Unknown depth preview range '{mode}'; expected one of {', '.join(RANGE_MODES)}",
+                config_key="ui.depth_preview.range",
+            )
+        if colormap not in COLORMAPS:
+            raise ConfigurationError(
+                f"Unknown colormap '{colormap}'; expected one of {', '.join(COLORMAPS)}",
+                config_key="ui.depth_preview.colormap",
+            )
+        self.mode = mode
+        self.min_m = min_m
+        self.max_m = max_m
+        self.percentiles = (float(percentiles[0]), float(percentiles[1]))
+        self.colormap = colormap
+        self.sample_step = max(1, sample_step)
+        self.cache_size = max(1, cache_size)
+        self._palette = self._packed_palette(COLORMAPS[colormap])
+        self._luts: "OrderedDict[Tuple[int, int], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> "DepthColorizer":
+        """Create a colorizer from the `ui.depth_preview` config section."""
+        section = config.get('ui.depth_preview', {}) or {}
+        return cls(
+            mode=str(section.get('range', 'minmax')).lower(),
+            min_m=float(section.get('min_m', 0.1)),
+            max_m=float(section.get('max_m', 5.0)),
+            percentiles=section.get('percentiles', (2.0, 98.0)) or (2.0, 98.0),
+            colormap=str(section.get('colormap', 'jet')).lower(),
+        )
+
+    def fixed_range(self) -> Tuple[np.float32, np.float32]:
+        """The fixed range in meters, as float32 like the metric depth."""
+        low = np.float32(self.min_m)
+        return low, max(low, np.float32(self.max_m))
+
+    def value_range(self, depth: np.ndarray, depth_scale: float) -> Tuple[np.float32, np.float32]:
+        """The depth range in meters spread over the colormap for this frame."""
+        low, high = self.fixed_range()
+        if self.mode == "minmax":
+            frame_min, frame_max = cv2.minMaxLoc(depth)[:2]
+            return self._clipped_meters(frame_min, depth_scale), self._clipped_meters(frame_max, depth_scale)
+        if self.mode == "percentile":
+            sample = depth[::self.sample_step, ::self.sample_step]
+            valid = sample[sample > 0]
+            if valid.size == 0:
+                return low, high
+            p_low, p_high = np.percentile(valid, self.percentiles)
+            # Snapped to about one color step so consecutive frames reuse the cached table
+            quantum = max(1, int((high - low) / depth_scale) // 256)
+            p_low = int(p_low) // quantum * quantum
+            p_high = -(-int(p_high) // quantum) * quantum
+            return self._clipped_meters(p_low, depth_scale), self._clipped_meters(p_high, depth_scale)
+        return low, high
+
+    def colorize(self, depth: np.ndarray, depth_scale: float) -> np.ndarray:
+        """
+        Colorize a uint16 depth image.
+
+        Returns:
+            A new contiguous (H, W, 4) uint8 RGBX image
+        """
+        if depth.dtype != np.uint16:
+            depth = depth.astype(np.uint16)
+        lut = self.lut(*self.value_range(depth, depth_scale), depth_scale)
+        # "wrap" skips the bounds check; uint16 indices are always inside the table
+        return np.take(lut, depth, mode="wrap").view(np.uint8).reshape(depth.shape + (4,))
+
+    def lut(self, low: float, high: float, depth_scale: float) -> np.ndarray:
+        """The packed RGBX table of a range in meters, built on first use."""
+        key = (float(low), float(high), float(depth_scale))
+        with self._lock:
+            lut = self._luts.get(key)
+            if lut is not None:
+                self._luts.move_to_end(key)
+                return lut
+        lut = self._build_lut(np.float32(low), np.float32(high), depth_scale)
+        with self._lock:
+            self._luts[key] = lut
+            while len(self._luts) > self.cache_size:
+                self._luts.popitem(last=False)
+        return lut
+
+    def _clipped_meters(self, value: float, depth_scale: float) -> np.float32:
+        """A sensor value in meters as DepthMap.meters computes it, clipped to the fixed range."""
+        low, high = self.fixed_range()
+        return min(max(np.float32(value) * np.float32(depth_scale), low), high)
+
+    def _build_lut(self, low: np.float32, high: np.float32, depth_scale: float) -> np.ndarray:
+        # The previous preview chain on float32 meters, evaluated once per sensor value:
+        # np.clip, then cv2.normalize(NORM_MINMAX) and astype(np.uint8)
+        meters = np.arange(65536, dtype=np.float32) * np.float32(depth_scale)
+        np.clip(meters, low, high, out=meters)
+        if high > low:
+            # cv2.normalize computes scale and shift in double and applies them in float32 as a
+            # fused multiply-add (one rounding to float32)
+            scale = 255.0 * (1.0 / (float(high) - float(low)))
+            shift = -float(low) * scale
+            levels = (meters.astype(np.float64) * np.float64(np.float32(scale))
+                      + np.float64(np.float32(shift))).astype(np.float32)
+        else:
+            levels = np.zeros_like(meters)
+        # astype(np.uint8) truncates toward zero
+        return self._palette[np.clip(np.trunc(levels), 0, 255).astype(np.uint8)]
+
+    @staticmethod
+    def _packed_palette(colormap: int) -> np.ndarray:
+        """The colormap's 256 colors as RGBX pixels packed into uint32, in memory byte order."""
+        bgr = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(256, 1), colormap).reshape(256, 3)
+        rgbx = np.empty((256, 4), dtype=np.uint8)
+        rgbx[:, :3] = bgr[:, ::-1]
+        rgbx[:, 3] = 255
+        return rgbx.view(np.uint32).ravel()
@@ -0,0 +1,177 @@
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from src.models.camera import Frame
+
+
+class FrameRingBuffer:
+    """
+    A fixed-capacity, thread-safe ring buffer of frames for a single camera,
+    indexed by `timestamp_ns`.
+
+    Slots are preallocated once: timestamps live in an int64 array and frames
+    in a fixed-size list, so pushing a frame never allocates. Frames are stored
+    by reference, so lookups hand back the original arrays without copying.
+    Frames are expected to arrive in non-decreasing timestamp order; a frame
+    older than the newest stored one is dropped.
+
+    The buffer owns one reference to each stored frame's pooled buffers: the
+    frame returned by `push` has left the buffer and should be released by
+    the caller, and lookups can retain frames under the buffer's lock so they
+    cannot be recycled before the caller is done with them.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Ring buffer capacity must be at least 1, got {capacity}")
+        self._capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._frames: List[Optional[Frame]] = [None] * capacity
+        self._start = 0  # Physical index of the oldest frame
+        self._count = 0
+        self._lock = threading.Lock()
+        self._frame_pushed = threading.Condition(self._lock)
+
+    @property
+    def capacity(self) -> int:
+        """Get the maximum number of frames held by the buffer."""
+        return self._capacity
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def push(self, frame: Frame) -> Optional[Frame]:
+        """
+        Append a frame, evicting the oldest one if the buffer is full.
+
+        Returns:
+            The frame that left the buffer: the evicted oldest frame, `frame`
+            itself if it was rejected as out of order, or None.
+        """
+        with self._lock:
+            if self._count and frame.timestamp_ns < self._timestamps[self._physical(self._count - 1)]:
+                return frame
+
+            evicted = None
+            if self._count < self._capacity:
+                index = self._physical(self._count)
+                self._count += 1
+            else:
+                index = self._start
+                evicted = self._frames[index]
+                self._start = (self._start + 1) % self._capacity
+
+            self._timestamps[index] = frame.timestamp_ns
+            self._frames[index] = frame
+            self._frame_pushed.notify_all()
+            return evicted
+
+    def latest(self, retain: bool = False) -> Optional[Frame]:
+        """Get the most recently pushed frame, optionally retaining it for the caller."""
+        with self._lock:
+            if not self._count:
+                return None
+            return self._retained(self._frames[self._physical(self._count - 1)], retain)
+
+    def wait_for_timestamp(self, timestamp_ns: int, timeout: float) -> bool:
+        """
+        Block until a frame with `timestamp_ns` or later has been pushed.
+
+        Args:
+            timestamp_ns: The timestamp the newest frame must reach
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if such a frame is available, False if the timeout expired.
+        """
+        with self._frame_pushed:
+            return bool(self._frame_pushed.wait_for(
+                lambda: self._count > 0 and self._timestamps[self._physical(self._count - 1)] >= timestamp_ns,
+                timeout=max(0.0, timeout),
+            ))
+
+    def nearest(self, timestamp_ns: int, retain: bool = False) -> Optional[Frame]:
+        """
+        Get the frame whose timestamp is closest to `timestamp_ns` in O(log n),
+        optionally retaining it for the caller.
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            pos = self._bisect_left(timestamp_ns)
+            if pos == self._count:
+                index = self._physical(pos - 1)
+            elif pos == 0:
+                index = self._physical(0)
+            else:
+                before = self._physical(pos - 1)
+                after = self._physical(pos)
+                if timestamp_ns - self._timestamps[before] <= self._timestamps[after] - timestamp_ns:
+                    index = before
+                else:
+                    index = after
+            return self._retained(self._frames[index], retain)
+
+    def first_after(self, timestamp_ns: int, retain: bool = False) -> Optional[Frame]:
+        """
+        Get the oldest frame with a timestamp strictly after `timestamp_ns`,
+        optionally retaining it for the caller.
+        """
+        with self._lock:
+            pos = self._bisect_right(timestamp_ns)
+            if pos == self._count:
+                return None
+            return self._retained(self._frames[self._physical(pos)], retain)
+
+    def range(self, start_ns: int, end_ns: int, retain: bool = False) -> List[Frame]:
+        """
+        Get all frames with `start_ns <= timestamp_ns <= end_ns`, oldest first,
+        optionally retaining them for the caller.
+        """
+        with self._lock:
+            if not self._count or end_ns < start_ns:
+                return []
+            lo = self._bisect_left(start_ns)
+            hi = self._bisect_right(end_ns)
+            return [self._retained(self._frames[self._physical(i)], retain) for i in range(lo, hi)]
+
+    def clear(self) -> None:
+        """Drop and release all frames held by the buffer."""
+        with self._lock:
+            frames = [self._frames[self._physical(i)] for i in range(self._count)]
+            self._frames = [None] * self._capacity
+            self._start = 0
+            self._count = 0
+        for frame in frames:
+            frame.release()
+
+    @staticmethod
+    def _retained(frame: Frame, retain: bool) -> Frame:
+        return frame.retain() if retain else frame
+
+    def _physical(self, logical: int) -> int:
+        """Map a logical index (0 = oldest) to a physical slot index."""
+        return (self._start + logical) % self._capacity
+
+    def _segments(self):
+        """Return the stored timestamps as at most two sorted physical segments."""
+        end = self._start + self._count
+        if end <= self._capacity:
+            return self._timestamps[self._start:end], None
+        return self._timestamps[self._start:], self._timestamps[:end - self._capacity]
+
+    def _bisect(self, timestamp_ns: int, side: str) -> int:
+        first, second = self._segments()
+        pos = int(np.searchsorted(first, timestamp_ns, side=side))
+        if second is None or pos < len(first):
+            return pos
+        return len(first) + int(np.searchsorted(second, timestamp_ns, side=side))
+
+    def _bisect_left(self, timestamp_ns: int) -> int:
+        return self._bisect(timestamp_ns, "left")
+
+    def _bisect_right(self, timestamp_ns: int) -> int:
+        return self._bisect(timestamp_ns, "right")
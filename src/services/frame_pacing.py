@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+
+class FrameRateMeter:
+    """Measures the delivered frame rate over a rolling window of frame arrivals."""
+
+    def __init__(self, window_size: int = 30):
+        self._arrivals = deque(maxlen=max(2, window_size))
+        self._lock = threading.Lock()
+
+    def tick(self, now: float = None) -> None:
+        """Record the arrival of a frame."""
+        with self._lock:
+            self._arrivals.append(time.monotonic() if now is None else now)
+
+    @property
+    def fps(self) -> float:
+        """Get the measured frames per second, or 0.0 if too few frames arrived."""
+        with self._lock:
+            if len(self._arrivals) < 2:
+                return 0.0
+            elapsed = self._arrivals[-1] - self._arrivals[0]
+            return (len(self._arrivals) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._arrivals.clear()
+
+
+class FramePacer:
+    """
+    Paces a non-blocking frame source to a target rate.
+
+    Deadlines advance by a fixed interval from the previous deadline rather
+    than from the end of the last capture, so the time spent capturing is
+    not added on top of the interval. If the caller falls more than one
+    interval behind, the schedule restarts from now instead of bursting to
+    catch up.
+    """
+
+    def __init__(self, target_fps: float):
+        if target_fps <= 0:
+            raise ValueError(f"Target FPS must be positive, got {target_fps}")
+        self._interval = 1.0 / target_fps
+        self._next_deadline = None
+
+    @property
+    def target_fps(self) -> float:
+        return 1.0 / self._interval
+
+    def wait(self) -> None:
+        """Sleep until the next frame is due."""
+        now = time.monotonic()
+        if self._next_deadline is None or now - self._next_deadline > self._interval:
+            self._next_deadline = now
+        elif self._next_deadline > now:
+            time.sleep(self._next_deadline - now)
+        self._next_deadline += self._interval
+
+
+@dataclass
+class MailboxStats:
+    """Delivery counters of a FrameMailbox."""
+    delivered: int  # items taken by the consumer
+    dropped: int  # items overwritten before the consumer took them
+    max_wait_ms: float  # longest time an item waited in the slot
+    last_wait_ms: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class FrameMailbox:
+    """
+    A single-slot, latest-wins handoff from a producer thread to a consumer.
+
+    `put` replaces whatever the consumer has not taken yet, so at most one
+    item is ever pending and the consumer always gets the newest one. A
+    slow consumer therefore skips items instead of building a backlog, and
+    an item waits at most one consumer poll interval plus the consumer's
+    own processing time.
+    """
+
+    def __init__(self):
+        self._item = None
+        self._put_at = 0.0
+        self._delivered = 0
+        self._dropped = 0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+        self._lock = threading.Lock()
+
+    def put(self, item) -> None:
+        """Offer an item, replacing the pending one."""
+        with self._lock:
+            if self._item is not None:
+                self._dropped += 1
+            self._item = item
+            self._put_at = time.monotonic()
+
+    def take(self):
+        """Take the pending item, or None if nothing new arrived since the last take."""
+        with self._lock:
+            item, self._item = self._item, None
+            if item is not None:
+                self._delivered += 1
+                self._last_wait = time.monotonic() - self._put_at
+                self._max_wait = max(self._max_wait, self._last_wait)
+            return item
+
+    def clear(self) -> None:
+        with self._lock:
+            self._item = None
+
+    def stats(self) -> MailboxStats:
+        with self._lock:
+            return MailboxStats(self._delivered, self._dropped, self._max_wait * 1000, self._last_wait * 1000)
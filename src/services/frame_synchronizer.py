@@ -0,0 +1,160 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+from src.models.camera import Frame
+from src.services.exceptions import SynchronizationError
+from src.services.frame_buffer import FrameRingBuffer
+
+
+@dataclass
+class SyncResult:
+    """The outcome of matching one frame per camera to a trigger time."""
+    trigger_ns: int
+    mode: str = "nearest"
+    frames: List[Frame] = field(default_factory=list)
+    skews_ns: Dict[str, int] = field(default_factory=dict)  # frame timestamp - trigger, per camera
+    wait_ns: Dict[str, int] = field(default_factory=dict)  # time spent waiting until each camera was resolved
+    missing: List[str] = field(default_factory=list)
+    stale: List[str] = field(default_factory=list)  # cameras without a frame after the trigger ("fresh" mode)
+    max_jitter_ns: int = 0
+    degraded: bool = False
+
+    @property
+    def max_jitter_ms(self) -> float:
+        return self.max_jitter_ns / 1e6
+
+    def release(self) -> None:
+        """Release the selected frames once they are no longer needed."""
+        for frame in self.frames:
+            frame.release()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trigger_ns": self.trigger_ns,
+            "mode": self.mode,
+            "max_jitter_ms": self.max_jitter_ms,
+            "degraded": self.degraded,
+            "missing_cameras": list(self.missing),
+            "stale_cameras": list(self.stale),
+            "cameras": {
+                frame.camera_id: {
+                    "frame_number": frame.frame_number,
+                    "timestamp_ns": frame.timestamp_ns,
+                    "skew_ms": self.skews_ns[frame.camera_id] / 1e6,
+                    "fresh": self.skews_ns[frame.camera_id] > 0,
+                    # How long before the trigger the frame was captured (0 for fresh frames)
+                    "staleness_ms": max(0, -self.skews_ns[frame.camera_id]) / 1e6,
+                    "wait_ms": self.wait_ns.get(frame.camera_id, 0) / 1e6,
+                }
+                for frame in self.frames
+            },
+        }
+
+
+class FrameSynchronizer:
+    """
+    Matches frames across cameras to a common trigger time.
+
+    In "nearest" mode the frame closest to the trigger is taken from each
+    camera's ring buffer. Cameras whose newest frame is still older than the
+    trigger are given until a shared deadline to deliver a later frame, so
+    the nearest match can come from either side of the trigger.
+
+    In "fresh" mode only frames captured after the trigger are accepted:
+    each camera's first frame after the trigger is taken, waiting for it
+    until the deadline. A camera that has stalled or disconnected delivers
+    none and is reported as stale, with its newest frame selected instead.
+
+    If the spread between the selected timestamps exceeds `max_jitter_ms`,
+    a camera delivered nothing at all, or (in "fresh" mode) a camera is
+    stale, the capture either raises `SynchronizationError` or is tagged as
+    degraded, depending on `on_violation`. Blocking for up to the deadline,
+    `synchronize` should not be called on the GUI thread.
+
+    The selected frames are retained and must be released through
+    `SyncResult.release()`.
+    """
+
+    VIOLATION_MODES = ("degrade", "raise")
+    MODES = ("nearest", "fresh")
+
+    def __init__(self, max_jitter_ms: float = 20.0, deadline_ms: float = 100.0, on_violation: str = "degrade",
+                 mode: str = "nearest"):
+        if on_violation not in self.VIOLATION_MODES:
+            raise ValueError(f"on_violation must be one of {self.VIOLATION_MODES}, got '{on_violation}'")
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, got '{mode}'")
+        self.max_jitter_ms = max_jitter_ms
+        self.deadline_ms = deadline_ms
+        self.on_violation = on_violation
+        self.mode = mode
+
+    def synchronize(self, buffers: Dict[str, FrameRingBuffer], trigger_ns: Optional[int] = None) -> SyncResult:
+        """
+        Select one frame per camera for `trigger_ns`: the nearest one, or in
+        "fresh" mode the first one after it.
+
+        Args:
+            buffers: Frame ring buffers keyed by camera ID
+            trigger_ns: Trigger time on the `time.time_ns()` clock; defaults to now
+
+        Returns:
+            SyncResult with the selected frames and per-camera skew
+
+        Raises:
+            SynchronizationError: If the capture violates the jitter limit and
+                `on_violation` is "raise"
+        """
+        if trigger_ns is None:
+            trigger_ns = time.time_ns()
+        result = SyncResult(trigger_ns=trigger_ns, mode=self.mode)
+        start = time.monotonic()
+        deadline = start + self.deadline_ms / 1000.0
+
+        for camera_id, buffer in buffers.items():
+            if self.mode == "fresh":
+                frame = None
+                if buffer.wait_for_timestamp(trigger_ns + 1, deadline - time.monotonic()):
+                    frame = buffer.first_after(trigger_ns, retain=True)
+                if frame is None:
+                    frame = buffer.latest(retain=True)
+                    if frame is not None:
+                        result.stale.append(camera_id)
+            else:
+                buffer.wait_for_timestamp(trigger_ns, deadline - time.monotonic())
+                frame = buffer.nearest(trigger_ns, retain=True)
+            result.wait_ns[camera_id] = int((time.monotonic() - start) * 1e9)
+            if frame is None:
+                result.missing.append(camera_id)
+                continue
+            result.frames.append(frame)
+            result.skews_ns[camera_id] = frame.timestamp_ns - trigger_ns
+
+        if result.frames:
+            timestamps = [frame.timestamp_ns for frame in result.frames]
+            result.max_jitter_ns = max(timestamps) - min(timestamps)
+
+        violations = []
+        if result.missing:
+            violations.append(f"no frames from {', '.join(result.missing)}")
+        if result.stale:
+            ages = ", ".join(f"{cid} {-result.skews_ns[cid] / 1e6:.0f} ms old" for cid in result.stale)
+            violations.append(f"no frame after the trigger from {ages}")
+        if result.max_jitter_ms > self.max_jitter_ms:
+            violations.append(f"jitter {result.max_jitter_ms:.1f} ms exceeds {self.max_jitter_ms:.1f} ms")
+
+        if violations:
+            if self.on_violation == "raise":
+                result.release()
+                raise SynchronizationError(
+                    f"Frame synchronization failed: {'; '.join(violations)}",
+                    max_jitter=result.max_jitter_ms,
+                    skews_ms={cid: skew / 1e6 for cid, skew in result.skews_ns.items()},
+                    missing_cameras=result.missing,
+                    stale_cameras=result.stale,
+                )
+            result.degraded = True
+            print(f"Warning: Degraded synchronized capture: {'; '.join(violations)}")
+
+        return result
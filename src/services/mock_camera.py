@@ -2,7 +2,8 @@ import time
 import numpy as np
 from typing import Iterator, Dict, Any
 from src.services.abstract_camera import AbstractCamera
-from src.models.camera import Frame
+from src.models.camera import Frame, DepthMap
+from src.services.buffer_pool import BufferPool
 import cv2
 
 class MockCamera(AbstractCamera):
@@ -19,6 +20,10 @@ class MockCamera(AbstractCamera):
             self._resolution = (1280, 720)
             self._fps = 30
         self._frame_number = 0
+        self._buffer_pool = BufferPool()
+        # Static content is rendered once and copied into pooled buffers per frame
+        self._base_image = None
+        self._base_depth = None
 
     def _get_resolution(self) -> tuple:
         """Get resolution based on camera model."""
@@ -29,15 +34,20 @@ class MockCamera(AbstractCamera):
     def _generate_mock_image(self) -> np.ndarray:
         """Generate mock image with camera model and ID overlay."""
         height, width = self._resolution
-        img = np.zeros((height, width, 3), dtype=np.uint8)
-        for i in range(3):
-            img[:, :, i] = np.linspace(0, 255, width, dtype=np.uint8)
+        img = np.empty((height, width, 3), dtype=np.uint8)
+        img[:] = np.linspace(0, 255, width, dtype=np.uint8)[np.newaxis, :, np.newaxis]
         
         text = f"{self._model} ({self._camera_id})"
         font = cv2.FONT_HERSHEY_SIMPLEX
         cv2.putText(img, text, (50, height//2), font, 1, (255, 255, 255), 2, cv2.LINE_AA)
         return img
 
+    def _pooled_copy(self, source: np.ndarray):
+        """Copy static content into a buffer from the pool."""
+        buffer = self._buffer_pool.acquire(source.shape, source.dtype)
+        np.copyto(buffer.array, source)
+        return buffer
+
     def connect(self) -> None:
         """Simulate connecting to the camera."""
         print(f"Connecting to mock camera: {self._camera_id} ({self._model})")
@@ -53,13 +63,20 @@ class MockCamera(AbstractCamera):
         if not self._is_connected:
             raise ConnectionError(f"Camera {self._camera_id} is not connected.")
         
+        if self._base_image is None:
+            self._base_image = self._generate_mock_image()
+            self._base_depth = np.random.randint(0, 1000, self._resolution, dtype=np.uint16)
+
+        rgb_buffer = self._pooled_copy(self._base_image)
+        depth_buffer = self._pooled_copy(self._base_depth)
         frame = Frame(
             camera_id=self._camera_id,
             frame_number=self._frame_number,
             timestamp_ns=time.time_ns(),
-            rgb_image=self._generate_mock_image(),
-            depth_image=np.random.randint(0, 1000, self._resolution, dtype=np.uint16),
+            rgb_image=rgb_buffer.array,
+            depth=DepthMap(depth_buffer.array),  # Mock depth is in millimeters
             sequence_id=int(time.time()),
+            buffers=[rgb_buffer, depth_buffer],
         )
         self._frame_number += 1
         return frame
@@ -70,6 +87,10 @@ class MockCamera(AbstractCamera):
             yield self.capture_frame()
             time.sleep(1 / 30)  # Simulate 30 FPS
 
+    @property
+    def buffer_pool(self) -> BufferPool:
+        return self._buffer_pool
+
     @property
     def is_connected(self) -> bool:
         return self._is_connected
@@ -100,4 +121,4 @@ class MockCamera(AbstractCamera):
     @property
     def fps(self) -> float:
         """Get the frame rate for the camera."""
-        return 30.0  # Default FPS for mock camera
+        return float(self._fps)
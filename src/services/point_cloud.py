@@ -0,0 +1,419 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.camera import DepthMap
+
+# Vertex layout of the binary PLY files
+PLY_VERTEX_DTYPE = np.dtype([
+    ("x", "<f4"), ("y", "<f4"), ("z", "<f4"),
+    ("red", "u1"), ("green", "u1"), ("blue", "u1"),
+])
+PLY_POSITION_DTYPE = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4")])
+
+
+@dataclass(frozen=True)
+class CameraIntrinsics:
+    """Pinhole intrinsics of the stream the depth is aligned to."""
+    width: int
+    height: int
+    fx: float
+    fy: float
+    ppx: float
+    ppy: float
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CameraIntrinsics":
+        return cls(
+            width=int(data["width"]),
+            height=int(data["height"]),
+            fx=float(data["fx"]),
+            fy=float(data["fy"]),
+            ppx=float(data["ppx"]),
+            ppy=float(data["ppy"]),
+        )
+
+
+def intrinsics_path(root_dir: str, camera_id: str) -> str:
+    """Path of the intrinsics file `RealsenseCamera` writes for a camera ID such as "RealSense_<serial>"."""
+    serial = camera_id.split("_", 1)[1] if "_" in camera_id else camera_id
+    return os.path.join(root_dir, "intrinsics", f"intrinsics_{serial}.json")
+
+
+def load_intrinsics(path: str, stream: str = "Color") -> Optional[CameraIntrinsics]:
+    """
+    Load the intrinsics of one stream from an intrinsics file.
+
+    Returns:
+        The intrinsics, or None if the file or stream does not exist.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return CameraIntrinsics.from_dict(data[stream])
+    except (FileNotFoundError, KeyError):
+        return None
+
+
+@dataclass
+class PointCloud:
+    """Points in meters in the camera frame, with optional per-point RGB colors."""
+    points: np.ndarray  # (N, 3) float32
+    colors: Optional[np.ndarray] = None  # (N, 3) uint8, RGB order
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+@dataclass
+class PointCloudStats:
+    """Points removed and time taken by each stage of building a point cloud."""
+    input_points: int = 0  # pixels with depth
+    output_points: int = 0  # points in the returned cloud, including the zero points of an organized cloud
+    removed: Dict[str, int] = field(default_factory=dict)
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def removed_points(self) -> int:
+        return sum(self.removed.values())
+
+    def record(self, stage: str, before: int, after: int, start: float) -> None:
+        self.removed[stage] = before - after
+        self.stage_ms[stage] = (time.perf_counter() - start) * 1000
+
+    def summary(self) -> str:
+        stages = ", ".join(
+            f"{stage} -{self.removed[stage]} in {self.stage_ms[stage]:.1f} ms" for stage in self.removed
+        )
+        text = f"{self.input_points} -> {self.output_points} points"
+        return f"{text} ({stages})" if stages else text
+
+
+class PointCloudBuilder:
+    """
+    Back-projects depth maps into point clouds and optionally reduces them.
+
+    The normalized pixel rays (x - ppx) / fx and (y - ppy) / fy are computed
+    once per set of intrinsics and reused, so building a cloud is a handful
+    of vectorized multiplies over the valid pixels.
+
+    Reduction stages run in this order, each one only when configured:
+    depth range cut, statistical outlier removal, bounding box crop and
+    voxel downsampling.
+    """
+
+    def __init__(self, min_depth_m: float = 0.0, max_depth_m: float = 0.0, drop_invalid: bool = True,
+                 outlier_std_ratio: float = 0.0, crop_min: Optional[Sequence[float]] = None,
+                 crop_max: Optional[Sequence[float]] = None, voxel_size_m: float = 0.0):
+        """
+        Args:
+            min_depth_m: Points closer than this are dropped
+            max_depth_m: Points farther than this are dropped; 0 disables the cut
+            drop_invalid: Drop pixels without depth. When False, the cloud keeps
+                one point per pixel (an organized cloud) with invalid points at the origin
+            outlier_std_ratio: Drop points whose mean distance to their neighbors exceeds
+                the cloud-wide mean by this many standard deviations; 0 disables the stage
+            crop_min: Lower (x, y, z) corner of the crop box in meters, camera frame
+            crop_max: Upper (x, y, z) corner of the crop box in meters, camera frame
+            voxel_size_m: Edge length of the downsampling voxels; 0 disables the stage.
+                Ignored for organized clouds, which must keep one point per pixel
+        """
+        self.min_depth_m = min_depth_m
+        self.max_depth_m = max_depth_m
+        self.drop_invalid = drop_invalid
+        self.outlier_std_ratio = outlier_std_ratio
+        self.crop_min = np.asarray(crop_min, dtype=np.float32) if crop_min is not None else None
+        self.crop_max = np.asarray(crop_max, dtype=np.float32) if crop_max is not None else None
+        self.voxel_size_m = voxel_size_m
+        if voxel_size_m > 0 and not drop_invalid:
+            print("Warning: Voxel downsampling needs drop_invalid; it is disabled for organized point clouds.")
+            self.voxel_size_m = 0.0
+        self._rays: Dict[CameraIntrinsics, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # The ray cache is rebuilt on demand in a worker process
+        state = self.__dict__.copy()
+        state["_rays"] = {}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def build(self, depth: DepthMap, intrinsics: CameraIntrinsics, bgr_image: Optional[np.ndarray] = None) -> PointCloud:
+        """Build a point cloud; see `build_with_stats`."""
+        return self.build_with_stats(depth, intrinsics, bgr_image)[0]
+
+    def build_with_stats(self, depth: DepthMap, intrinsics: CameraIntrinsics,
+                         bgr_image: Optional[np.ndarray] = None) -> Tuple[PointCloud, PointCloudStats]:
+        """
+        Build a point cloud from a depth map aligned to the color stream.
+
+        Args:
+            depth: Depth map aligned to the stream described by `intrinsics`
+            intrinsics: Intrinsics of that stream
+            bgr_image: Optional color image (OpenCV BGR order) of the same size
+
+        Returns:
+            The point cloud and the points removed by each stage
+
+        Raises:
+            ValueError: If the depth map or color image does not match the intrinsics
+        """
+        height, width = depth.shape
+        if (width, height) != (intrinsics.width, intrinsics.height):
+            raise ValueError(
+                f"Depth map is {width}x{height} but intrinsics are for "
+                f"{intrinsics.width}x{intrinsics.height}"
+            )
+        if bgr_image is not None and bgr_image.shape[:2] != (height, width):
+            raise ValueError("Color image does not match the depth map size")
+
+        stats = PointCloudStats()
+        ray_x, ray_y = self._ray_grid(intrinsics)
+        z = depth.meters.ravel()
+        valid = z > 0
+        stats.input_points = count = int(np.count_nonzero(valid))
+
+        if self.min_depth_m > 0 or self.max_depth_m > 0:
+            start = time.perf_counter()
+            if self.min_depth_m > 0:
+                valid &= z >= self.min_depth_m
+            if self.max_depth_m > 0:
+                valid &= z <= self.max_depth_m
+            count, before = int(np.count_nonzero(valid)), count
+            stats.record("depth_range", before, count, start)
+
+        cropping = self.crop_min is not None or self.crop_max is not None
+        # Outlier removal, cropping and organized clouds work on the full pixel grid,
+        # otherwise only the valid pixels are back-projected
+        if self.outlier_std_ratio > 0 or cropping or not self.drop_invalid:
+            z = np.where(valid, z, np.float32(0))
+            x = ray_x * z
+            y = ray_y * z
+            if self.outlier_std_ratio > 0:
+                start = time.perf_counter()
+                shape = (height, width)
+                outliers = _grid_outliers(
+                    x.reshape(shape), y.reshape(shape), z.reshape(shape), valid.reshape(shape),
+                    self.outlier_std_ratio,
+                )
+                valid &= ~outliers.ravel()
+                count, before = int(np.count_nonzero(valid)), count
+                stats.record("outliers", before, count, start)
+            if cropping:
+                start = time.perf_counter()
+                valid &= box_mask(x, y, z, self.crop_min, self.crop_max)
+                count, before = int(np.count_nonzero(valid)), count
+                stats.record("crop", before, count, start)
+
+            if self.drop_invalid:
+                index = np.flatnonzero(valid)
+                points = np.stack([x[index], y[index], z[index]], axis=1)
+            else:
+                index = None
+                removed = ~valid
+                for axis in (x, y, z):
+                    axis[removed] = 0
+                points = np.stack([x, y, z], axis=1)
+        else:
+            index = np.flatnonzero(valid)
+            z = z[index]
+            points = np.empty((len(index), 3), dtype=np.float32)
+            np.multiply(ray_x[index], z, out=points[:, 0])
+            np.multiply(ray_y[index], z, out=points[:, 1])
+            points[:, 2] = z
+
+        colors = None
+        if bgr_image is not None:
+            bgr = bgr_image.reshape(-1, 3)
+            colors = (bgr[index] if index is not None else bgr)[:, ::-1]
+        cloud = PointCloud(points, colors)
+
+        if self.voxel_size_m > 0:
+            start = time.perf_counter()
+            cloud = voxel_downsample(cloud, self.voxel_size_m)
+            count, before = len(cloud), count
+            stats.record("voxel", before, count, start)
+
+        stats.output_points = len(cloud)
+        return cloud, stats
+
+    def _ray_grid(self, intrinsics: CameraIntrinsics) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            rays = self._rays.get(intrinsics)
+            if rays is None:
+                u = (np.arange(intrinsics.width, dtype=np.float32) - intrinsics.ppx) / intrinsics.fx
+                v = (np.arange(intrinsics.height, dtype=np.float32) - intrinsics.ppy) / intrinsics.fy
+                ray_x = np.broadcast_to(u, (intrinsics.height, intrinsics.width)).ravel()
+                ray_y = np.broadcast_to(v[:, np.newaxis], (intrinsics.height, intrinsics.width)).ravel()
+                rays = (ray_x, ray_y)
+                self._rays[intrinsics] = rays
+            return rays
+
+
+def box_mask(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+             box_min: Optional[np.ndarray], box_max: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Get the points inside an axis-aligned box.
+
+    Args:
+        x, y, z: Point coordinates as separate arrays
+        box_min: Lower (x, y, z) corner, or None for no lower bound
+        box_max: Upper (x, y, z) corner, or None for no upper bound
+    """
+    inside = np.ones(x.shape, dtype=bool)
+    for axis, values in enumerate((x, y, z)):
+        if box_min is not None:
+            inside &= values >= box_min[axis]
+        if box_max is not None:
+            inside &= values <= box_max[axis]
+    return inside
+
+
+def voxel_downsample(cloud: PointCloud, voxel_size: float) -> PointCloud:
+    """
+    Replace the points in each occupied voxel by their centroid (and mean color).
+
+    Voxel coordinates are packed into one int64 key per point. When the
+    occupied key range is small compared to the number of points the keys
+    index a dense count table directly; otherwise they are grouped by sorting.
+    """
+    if len(cloud) == 0:
+        return cloud
+    scale = np.float32(1.0 / voxel_size)
+    flat = np.zeros(len(cloud), dtype=np.int64)
+    key_range = 1
+    # Mixed-radix packing of the per-axis voxel indices: x + nx * (y + ny * z)
+    for axis in (2, 1, 0):
+        keys = np.floor(cloud.points[:, axis] * scale).astype(np.int64)
+        low = keys.min()
+        size = int(keys.max() - low) + 1
+        flat *= size
+        flat += keys - low
+        key_range *= size
+
+    if key_range <= 8 * len(flat):
+        occupied = np.bincount(flat, minlength=key_range)
+        voxel_keys = np.flatnonzero(occupied)
+        lookup = np.empty(key_range, dtype=np.int64)
+        lookup[voxel_keys] = np.arange(len(voxel_keys))
+        inverse = lookup[flat]
+        counts = occupied[voxel_keys]
+    else:
+        _, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+    num_voxels = len(counts)
+
+    points = np.empty((num_voxels, 3), dtype=np.float32)
+    for axis in range(3):
+        points[:, axis] = np.bincount(inverse, weights=cloud.points[:, axis], minlength=num_voxels) / counts
+    colors = None
+    if cloud.colors is not None:
+        colors = np.empty((num_voxels, 3), dtype=np.uint8)
+        for channel in range(3):
+            sums = np.bincount(inverse, weights=cloud.colors[:, channel], minlength=num_voxels)
+            colors[:, channel] = np.rint(sums / counts)
+    return PointCloud(points, colors)
+
+
+def _grid_outliers(x: np.ndarray, y: np.ndarray, z: np.ndarray, valid: np.ndarray, std_ratio: float) -> np.ndarray:
+    """
+    Statistical outlier removal on the organized pixel grid.
+
+    The neighbors of a point are its valid 8-connected pixels, which avoids a
+    nearest-neighbor search. Distances are divided by the point's depth, since
+    the spacing between neighboring pixels grows linearly with range and far
+    surfaces would otherwise all look like outliers. Points whose mean
+    neighbor distance exceeds the cloud-wide mean by `std_ratio` standard
+    deviations, and points without any valid neighbor, are outliers.
+    """
+    height, width = z.shape
+    sums = np.zeros((height, width), dtype=np.float32)
+    counts = np.zeros((height, width), dtype=np.uint8)
+    # Each pair of neighbors is visited once and credited to both pixels
+    for dy, dx in ((0, 1), (1, -1), (1, 0), (1, 1)):
+        a = (slice(0, height - dy), slice(max(0, -dx), width - max(0, dx)))
+        b = (slice(dy, height), slice(max(0, dx), width + min(0, dx)))
+        both = valid[a] & valid[b]
+        distance = np.sqrt((x[a] - x[b]) ** 2 + (y[a] - y[b]) ** 2 + (z[a] - z[b]) ** 2)
+        distance = np.divide(distance, z[a], out=np.zeros_like(distance), where=both)
+        sums[a] += distance
+        sums[b] += distance
+        counts[a] += both
+        counts[b] += both
+
+    connected = valid & (counts > 0)
+    if not connected.any():
+        return valid.copy()
+    mean_distance = sums[connected] / counts[connected]
+    threshold = mean_distance.mean() + std_ratio * mean_distance.std()
+    outliers = valid & ~connected
+    outliers[connected] = mean_distance > threshold
+    return outliers
+
+
+def encode_ply(cloud: PointCloud) -> bytes:
+    """Encode a point cloud as binary little-endian PLY."""
+    has_color = cloud.colors is not None
+    vertex_dtype = PLY_VERTEX_DTYPE if has_color else PLY_POSITION_DTYPE
+    vertices = np.empty(len(cloud), dtype=vertex_dtype)
+    vertices["x"] = cloud.points[:, 0]
+    vertices["y"] = cloud.points[:, 1]
+    vertices["z"] = cloud.points[:, 2]
+    if has_color:
+        vertices["red"] = cloud.colors[:, 0]
+        vertices["green"] = cloud.colors[:, 1]
+        vertices["blue"] = cloud.colors[:, 2]
+
+    properties = "".join(
+        f"property {'float' if vertex_dtype[name].kind == 'f' else 'uchar'} {name}\n"
+        for name in vertex_dtype.names
+    )
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        f"element vertex {len(cloud)}\n"
+        f"{properties}"
+        "end_header\n"
+    )
+    return header.encode("ascii") + vertices.tobytes()
+
+
+def decode_ply(data) -> PointCloud:
+    """
+    Decode a binary little-endian PLY written by `encode_ply`.
+
+    Raises:
+        ValueError: If the data is not such a PLY file
+    """
+    data = bytes(data)
+    end = data.find(b"end_header\n")
+    if not data.startswith(b"ply\n") or end < 0:
+        raise ValueError("Not a PLY file")
+    header = data[:end].decode("ascii").splitlines()
+    if "format binary_little_endian 1.0" not in header:
+        raise ValueError("Only binary little-endian PLY files are supported")
+
+    count = 0
+    names = []
+    for line in header:
+        parts = line.split()
+        if parts[:2] == ["element", "vertex"]:
+            count = int(parts[2])
+        elif parts[:1] == ["property"]:
+            names.append(parts[2])
+    vertex_dtype = PLY_VERTEX_DTYPE if "red" in names else PLY_POSITION_DTYPE
+    vertices = np.frombuffer(data, dtype=vertex_dtype, count=count, offset=end + len(b"end_header\n"))
+
+    points = np.stack([vertices["x"], vertices["y"], vertices["z"]], axis=1)
+    colors = None
+    if "red" in names:
+        colors = np.stack([vertices["red"], vertices["green"], vertices["blue"]], axis=1)
+    return PointCloud(points, colors)
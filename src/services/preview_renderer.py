@@ -0,0 +1,101 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.services.depth_colorizer import DepthColorizer
+
+@dataclass
+class RenderedFrame:
+    """
+    Display-ready images of one frame: contiguous arrays already scaled to
+    the preview labels, owned by this object (never views of pooled frame
+    buffers), so the GUI thread only wraps them in a QImage.
+    """
+    camera_id: str
+    frame_number: int
+    timestamp_ns: int
+    rgb: Optional[np.ndarray] = None  # RGB888
+    depth: Optional[np.ndarray] = None  # RGBX8888
+    render_ms: float = 0.0
+
+
+def fit_size(image_size: Tuple[int, int], target_size: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    """The largest size with the image's aspect ratio that fits the target; the image size if there is none."""
+    img_w, img_h = image_size
+    if target_size is None:
+        return img_w, img_h
+    target_w, target_h = target_size
+    aspect_ratio = img_w / img_h
+    if target_w / target_h > aspect_ratio:
+        return max(1, int(target_h * aspect_ratio)), target_h
+    return target_w, max(1, int(target_w / aspect_ratio))
+
+
+class PreviewRenderer:
+    """
+    Turns camera frames into preview images on the frame worker's thread.
+
+    Images are scaled to the size of their label before the color
+    conversion and colormap, so those run on display-sized pixels. The GUI
+    reports label sizes through `set_target_size`, from its own thread.
+    """
+
+    def __init__(self, depth_colorizer: Optional[DepthColorizer] = None):
+        """
+        Args:
+            depth_colorizer: Depth to color mapping; default: the frame's depth range on the JET colormap
+        """
+        self.depth_colorizer = depth_colorizer or DepthColorizer()
+        self._target_sizes: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def set_target_size(self, stream: str, width: int, height: int) -> None:
+        """Set the label size a stream is rendered for; sizes of 10 pixels or less (not laid out yet) are ignored."""
+        with self._lock:
+            if width > 10 and height > 10:
+                self._target_sizes[stream] = (width, height)
+            else:
+                self._target_sizes.pop(stream, None)
+
+    def target_size(self, stream: str) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            return self._target_sizes.get(stream)
+
+    def render(self, frame) -> RenderedFrame:
+        """Render a frame's color and depth images for display."""
+        start = time.perf_counter()
+        rendered = RenderedFrame(frame.camera_id, frame.frame_number, frame.timestamp_ns)
+        if frame.rgb_image is not None and frame.rgb_image.size > 0:
+            rendered.rgb = self.render_color(frame.rgb_image, self.target_size("rgb"))
+        if frame.depth is not None and frame.depth.data.size > 0:
+            rendered.depth = self.render_depth(frame.depth.data, frame.depth.scale, self.target_size("depth"))
+        rendered.render_ms = (time.perf_counter() - start) * 1000
+        return rendered
+
+    def render_color(self, image: np.ndarray, target_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Scale a BGR (or grayscale) image to the target and convert it to RGB."""
+        scaled = self._scale(image, target_size, cv2.INTER_LINEAR)  # faster than INTER_AREA for downscaling
+        if scaled.ndim == 2:
+            return cv2.cvtColor(scaled, cv2.COLOR_GRAY2RGB)
+        if scaled.shape[2] == 4:
+            return cv2.cvtColor(scaled, cv2.COLOR_BGRA2RGB)
+        return cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB)
+
+    def render_depth(self, depth: np.ndarray, depth_scale: float,
+                     target_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Decimate a native depth image to the target, then colorize it with a single table lookup."""
+        # Nearest neighbor, so pixels without depth are not blended into their neighbors
+        scaled = self._scale(depth, target_size, cv2.INTER_NEAREST)
+        return self.depth_colorizer.colorize(scaled, depth_scale)
+
+    @staticmethod
+    def _scale(image: np.ndarray, target_size: Optional[Tuple[int, int]], interpolation: int) -> np.ndarray:
+        img_h, img_w = image.shape[:2]
+        new_w, new_h = fit_size((img_w, img_h), target_size)
+        if (new_w, new_h) == (img_w, img_h):
+            return image
+        return cv2.resize(image, (new_w, new_h), interpolation=interpolation)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass
+class PreviewTile:
+    """What the scheduler needs to know about one camera's preview."""
+    camera_id: str
+    visible_area: int  # on-screen pixels of the tile's images; 0 when covered or scrolled away
+    focused: bool = False
+
+
+class PreviewScheduler:
+    """
+    Decides how often each camera's preview is rendered.
+
+    Nothing is rendered while the window is hidden or minimized. A focused
+    tile gets the full display rate; the rest of the global budget is split
+    across the other visible tiles in proportion to their on-screen area,
+    none above the display rate and none below `min_fps`, so small tiles
+    stay alive. Capture is not affected; only the preview renders are.
+    """
+
+    def __init__(self, max_fps: float, budget_fps: float = 60.0, min_fps: float = 1.0):
+        """
+        Args:
+            max_fps: Rate of a focused tile, and the cap of every tile (the display rate)
+            budget_fps: Preview renders per second across all cameras; 0 for no limit
+            min_fps: Lowest rate of a visible tile, even when the budget is used up
+        """
+        self.max_fps = max_fps
+        self.budget_fps = budget_fps
+        self.min_fps = min(min_fps, max_fps)
+
+    @classmethod
+    def from_config(cls, config) -> "PreviewScheduler":
+        """Create a scheduler from `ui.display_fps` and the `ui.preview` config section."""
+        section = config.get('ui.preview', {}) or {}
+        return cls(
+            max_fps=float(config.display_fps),
+            budget_fps=float(section.get('budget_fps', 60.0)),
+            min_fps=float(section.get('min_fps', 1.0)),
+        )
+
+    def schedule(self, tiles: List[PreviewTile], window_visible: bool = True) -> Dict[str, float]:
+        """
+        Get the preview rate of every tile.
+
+        Returns:
+            Frames per second keyed by camera ID; 0 means do not render
+        """
+        rates = {tile.camera_id: 0.0 for tile in tiles}
+        if not window_visible:
+            return rates
+        visible = [tile for tile in tiles if tile.visible_area > 0]
+        if self.budget_fps <= 0:
+            rates.update({tile.camera_id: self.max_fps for tile in visible})
+            return rates
+
+        remaining = self.budget_fps
+        shared = []
+        for tile in visible:
+            if tile.focused:
+                rates[tile.camera_id] = self.max_fps
+                remaining -= self.max_fps
+            else:
+                shared.append(tile)
+
+        # Proportional shares, handing out what capped tiles cannot use to the others
+        while shared:
+            total_area = sum(tile.visible_area for tile in shared)
+            capped = [tile for tile in shared
+                      if max(remaining, 0.0) * tile.visible_area / total_area >= self.max_fps]
+            if not capped:
+                for tile in shared:
+                    share = max(remaining, 0.0) * tile.visible_area / total_area
+                    rates[tile.camera_id] = max(self.min_fps, share)
+                break
+            for tile in capped:
+                rates[tile.camera_id] = self.max_fps
+                remaining -= self.max_fps
+                shared.remove(tile)
+        return rates
@@ -4,14 +4,16 @@ import time
 from typing import Iterator, Tuple
 
 from src.services.abstract_camera import AbstractCamera
-from src.models.camera import Frame
+from src.models.camera import Frame, DepthMap
+from src.services.buffer_pool import BufferPool
 from src.services.storage_service import StorageService
 
 class RealsenseCamera(AbstractCamera):
     """
     Concrete implementation of AbstractCamera for Intel RealSense cameras.
     This class handles the connection, frame capture, and data conversion
-    for RealSense devices, outputting depth data in meters.
+    for RealSense devices, outputting depth in native uint16 units together
+    with the device's depth scale.
     """
 
     def __init__(self, camera_id: str, serial_number: str, resolution_wh: Tuple[int, int], fps: int, storage_service: StorageService):
@@ -27,6 +29,7 @@ class RealsenseCamera(AbstractCamera):
         self._is_connected = False
         self._sequence_id = 0
         self._depth_scale = None
+        self._buffer_pool = BufferPool()
 
         # Load configuration once during initialization to avoid repeated file access
         from src.services.config_service import ConfigService
@@ -167,25 +170,24 @@ class RealsenseCamera(AbstractCamera):
 
             # Store the raw depth data before any post-processing
             raw_depth_data = np.asanyarray(depth_frame.get_data())
-            raw_depth_image = raw_depth_data.astype(np.float32) * self._depth_scale
+            raw_depth_buffer = self._pooled_copy(raw_depth_data)
 
             if self._post_processing_enabled:
                 depth_frame = self._apply_post_processing(depth_frame)
 
-            rgb_image = np.asanyarray(color_frame.get_data()).copy()
-            
-            depth_data = np.asanyarray(depth_frame.get_data())
-            # Convert raw depth (uint16) to meters (float32)
-            depth_image = depth_data.astype(np.float32) * self._depth_scale
+            # Copy out of the SDK-owned frame into a pooled buffer
+            rgb_buffer = self._pooled_copy(np.asanyarray(color_frame.get_data()))
+            depth_buffer = self._pooled_copy(np.asanyarray(depth_frame.get_data()))
 
             timestamp_ns = int(time.time_ns())
             frame = Frame(
                 camera_id=self._camera_id,
                 frame_number=self._sequence_id,
                 timestamp_ns=timestamp_ns,
-                rgb_image=rgb_image,
-                depth_image=depth_image,
-                raw_depth_image=raw_depth_image
+                rgb_image=rgb_buffer.array,
+                depth=DepthMap(depth_buffer.array, self._depth_scale),
+                raw_depth=DepthMap(raw_depth_buffer.array, self._depth_scale),
+                buffers=[rgb_buffer, depth_buffer, raw_depth_buffer],
             )
             self._sequence_id += 1
             return frame
@@ -196,12 +198,27 @@ class RealsenseCamera(AbstractCamera):
             print(f"[{self._camera_id}] Unexpected error during frame processing: {e}")
             return None
 
+    def _pooled_copy(self, data: np.ndarray):
+        """Copy SDK-owned frame data into a pooled buffer."""
+        buffer = self._buffer_pool.acquire(data.shape, data.dtype)
+        np.copyto(buffer.array, data)
+        return buffer
+
     def stream(self) -> Iterator[Frame]:
         while self._is_connected:
             frame = self.capture_frame()
             if frame:
                 yield frame
 
+    @property
+    def buffer_pool(self) -> BufferPool:
+        return self._buffer_pool
+
+    @property
+    def blocks_for_frames(self) -> bool:
+        # wait_for_frames() blocks until the next frameset arrives
+        return True
+
     @property
     def is_connected(self) -> bool:
         return self._is_connected
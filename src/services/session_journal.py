@@ -0,0 +1,326 @@
+"""
+Append-only journal of the sessions StorageService writes.
+
+A session is written into a staging directory next to its final
+`seq_NNN` directory, with metadata.json written last, and then renamed
+into place:
+
+    1. "pending" entry appended (final and staging paths)
+    2. frame files written into the staging directory, then metadata.json
+    3. staging directory renamed to the final directory
+    4. "committed" entry appended
+
+If the session directory already exists (the sequence number was saved
+before), step 3 instead moves the staged files into it one by one.
+
+A crash leaves a "pending" entry without its "committed" entry. Recovery
+only reads the journal and looks at those sessions, so it takes
+milliseconds however large the dataset is. A staging directory holding
+metadata.json was completely written and is renamed into place. An
+interrupted merge is finished if the files left in the staging directory
+and the session match the staged checksum manifest (without checksums:
+if metadata.json was not moved yet). Anything else is moved to
+<root>/quarantine.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List
+
+from src.services.checksums import MANIFEST_FILENAME, SessionManifest, file_checksum
+from src.services.dataset_layout import METADATA_FILENAME
+from src.services.exceptions import ConfigurationError, StorageError
+
+JOURNAL_FILENAME = "session_journal.jsonl"
+QUARANTINE_DIRNAME = "quarantine"
+STAGING_SUFFIX = ".tmp"
+
+# fsync policies, from fastest to most durable:
+#   "none":    never fsync. Survives an application crash; after a power loss
+#              recent sessions may be lost or quarantined by recovery.
+#   "journal": fsync the journal entries, so recovery always knows which
+#              sessions were in flight, but not the frame files.
+#   "commit":  also fsync every file and directory before the commit entry;
+#              a session reported as saved survives a power loss.
+FSYNC_POLICIES = ("none", "journal", "commit")
+
+
+@dataclass
+class RecoveryReport:
+    """Outcome of a recovery pass."""
+    finished: List[str]
+    quarantined: List[str]
+    elapsed_ms: float
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.finished)} sessions finished, {len(self.quarantined)} quarantined "
+            f"in {self.elapsed_ms:.1f} ms"
+        )
+
+
+def staging_dir_for(session_dir: str) -> str:
+    """A unique staging directory next to a session directory, e.g. .seq_001.3f2a9c1e.tmp."""
+    parent, name = os.path.split(session_dir)
+    return os.path.join(parent, f".{name}.{uuid.uuid4().hex[:8]}{STAGING_SUFFIX}")
+
+
+def fsync_file(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: str) -> None:
+    """Flush a directory entry; a no-op where directories cannot be opened (Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def merge_session_dir(staging_dir: str, session_dir: str) -> None:
+    """
+    Move a completely written staging directory into an existing session
+    directory, keeping the checksums of the session's earlier files.
+
+    Safe to repeat after an interruption: files already moved are not
+    touched again and the manifests are combined the same way.
+    """
+    _merge_manifest(staging_dir, session_dir)
+    _merge_dir(staging_dir, session_dir)
+
+
+def _merge_manifest(staging_dir: str, session_dir: str) -> None:
+    """Combine the manifest of an existing session with the staged one before the staged one replaces it."""
+    try:
+        existing = SessionManifest.load(session_dir)
+        staged = SessionManifest.load(staging_dir)
+    except StorageError as e:
+        print(f"Warning: {e}")
+        return
+    if existing is None or staged is None or existing.algorithm != staged.algorithm:
+        return
+    existing.files.update(staged.files)
+    with open(os.path.join(staging_dir, MANIFEST_FILENAME), "wb") as f:
+        f.write(existing.to_json())
+
+
+def _merge_dir(source_dir: str, target_dir: str) -> None:
+    """Move the contents of a directory into an existing one, merging subdirectories (thumbnails)."""
+    for name in os.listdir(source_dir):
+        source, target = os.path.join(source_dir, name), os.path.join(target_dir, name)
+        if os.path.isdir(source) and os.path.isdir(target):
+            _merge_dir(source, target)
+        else:
+            os.replace(source, target)
+    os.rmdir(source_dir)
+
+
+def _relative_files(directory: str) -> List[str]:
+    files = []
+    for parent, _, names in os.walk(directory):
+        for name in names:
+            files.append(os.path.relpath(os.path.join(parent, name), directory).replace(os.sep, "/"))
+    return files
+
+
+def staged_merge_complete(staging_dir: str, session_dir: str) -> bool:
+    """
+    Whether an interrupted merge of a staging directory into an existing
+    session can be finished.
+
+    With checksums, every file of the manifest must be in the staging or
+    the session directory with its recorded digest, and every file left in
+    the staging directory must be listed; this reads the whole session.
+    The manifest is the staged one, or the session's once it was moved.
+    Without checksums, metadata.json must still be in the staging directory.
+    """
+    staged_files = [name for name in _relative_files(staging_dir) if name != MANIFEST_FILENAME]
+    try:
+        manifest = SessionManifest.load(staging_dir) or SessionManifest.load(session_dir)
+    except StorageError:
+        return False
+    if manifest is None:
+        return METADATA_FILENAME in staged_files
+    if any(name not in manifest.files for name in staged_files):
+        return False
+    for name, expected in manifest.files.items():
+        path = os.path.join(staging_dir, name)
+        if not os.path.isfile(path):
+            path = os.path.join(session_dir, name)
+        try:
+            if os.path.getsize(path) != expected.size or file_checksum(path, manifest.algorithm) != expected.digest:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+class SessionJournal:
+    """
+    The journal file of one dataset root.
+
+    Entries are JSON lines; paths are stored relative to the root so the
+    dataset can be moved. Appends from several storage threads are
+    serialized by a lock.
+    """
+
+    def __init__(self, root_dir: str, fsync: str = "journal"):
+        """
+        Args:
+            root_dir: Dataset root
+            fsync: One of FSYNC_POLICIES
+
+        Raises:
+            ConfigurationError: If the fsync policy is unknown
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ConfigurationError(
+                f"Unknown fsync policy '{fsync}'; expected one of {', '.join(FSYNC_POLICIES)}",
+                config_key="storage.fsync",
+            )
+        self.root_dir = root_dir
+        self.fsync = fsync
+        self.path = os.path.join(root_dir, JOURNAL_FILENAME)
+        self._lock = threading.Lock()
+
+    def pending(self, session_dir: str, staging_dir: str) -> None:
+        self._append({"event": "pending", "session": self._relative(session_dir),
+                      "staging": self._relative(staging_dir)})
+
+    def committed(self, session_dir: str, staging_dir: str) -> None:
+        self._append({"event": "committed", "session": self._relative(session_dir),
+                      "staging": self._relative(staging_dir)})
+
+    def quarantined(self, session_dir: str, staging_dir: str, quarantine_dir: str) -> None:
+        self._append({"event": "quarantined", "session": self._relative(session_dir),
+                      "staging": self._relative(staging_dir), "quarantine": self._relative(quarantine_dir)})
+
+    def unresolved(self) -> Dict[str, Dict]:
+        """
+        The "pending" entries without a later "committed" or "quarantined"
+        entry, keyed by staging directory (two saves may target the same session).
+        """
+        pending: Dict[str, Dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-append
+                        continue
+                    if entry.get("event") == "pending":
+                        pending[entry["staging"]] = entry
+                    else:
+                        pending.pop(entry.get("staging"), None)
+        except FileNotFoundError:
+            pass
+        return pending
+
+    def recover(self) -> RecoveryReport:
+        """
+        Finish or quarantine every session the journal has left pending, then
+        compact the journal.
+
+        Must only run while no session is being saved to this root, i.e. at
+        application startup.
+        """
+        start = time.perf_counter()
+        self._terminate_torn_line()
+        finished, quarantined = [], []
+        for relative_staging, entry in self.unresolved().items():
+            session_dir = os.path.join(self.root_dir, entry["session"])
+            staging_dir = os.path.join(self.root_dir, relative_staging)
+            if not os.path.isdir(staging_dir):
+                # The rename happened (or nothing was written); only the commit entry is missing
+                if os.path.isdir(session_dir):
+                    self.committed(session_dir, staging_dir)
+                    finished.append(session_dir)
+                else:
+                    self.quarantined(session_dir, staging_dir, "")
+                continue
+            if not os.path.exists(session_dir) and os.path.isfile(os.path.join(staging_dir, METADATA_FILENAME)):
+                os.rename(staging_dir, session_dir)
+                fsync_dir(os.path.dirname(session_dir))
+                self.committed(session_dir, staging_dir)
+                finished.append(session_dir)
+            elif os.path.isdir(session_dir) and staged_merge_complete(staging_dir, session_dir):
+                # The crash interrupted StorageService._commit merging into an existing session
+                merge_session_dir(staging_dir, session_dir)
+                fsync_dir(session_dir)
+                self.committed(session_dir, staging_dir)
+                finished.append(session_dir)
+            else:
+                quarantined.append(self.quarantine(session_dir, staging_dir))
+
+        self._compact()
+        return RecoveryReport(finished, quarantined, (time.perf_counter() - start) * 1000)
+
+    def quarantine(self, session_dir: str, staging_dir: str) -> str:
+        """
+        Move an incomplete staging directory to
+        <root>/quarantine/<date>/<lighting>/<background>/seq_NNN.<id>.tmp and record it.
+
+        Returns:
+            The quarantine directory
+        """
+        target = os.path.join(
+            self.root_dir, QUARANTINE_DIRNAME, os.path.dirname(self._relative(session_dir)),
+            os.path.basename(staging_dir).lstrip("."),
+        )
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(staging_dir, target)
+        self.quarantined(session_dir, staging_dir, target)
+        return target
+
+    def _terminate_torn_line(self) -> None:
+        """End a line torn by a crash mid-append, so the next entry starts on its own line."""
+        try:
+            with open(self.path, "rb+") as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+        except FileNotFoundError:
+            pass
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only its unresolved entries (normally none)."""
+        with self._lock:
+            pending = self.unresolved()
+            temp_path = self.path + STAGING_SUFFIX
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for entry in pending.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                if self.fsync != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+
+    def _append(self, entry: Dict) -> None:
+        entry["time"] = time.time()
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                if self.fsync != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.root_dir) if path else ""
@@ -0,0 +1,347 @@
+"""
+Export of captures into size-bounded tar shards in the WebDataset layout.
+
+Each capture becomes one sample. All members of a sample share its key
+(the session path with separators replaced, plus a version of the
+session's file list, e.g. "20250101_Dark_bg_01_seq_001-3f2a9c1e") and are
+stored consecutively:
+
+    <key>.<camera_id>.<stream>.<ext>    the encoded files as saved, not re-encoded
+    <key>.json                          metadata.json plus per-camera frame info and intrinsics
+
+Shards are written as shard-NNNNNN.tar.tmp and renamed when complete. The
+export directory's shards.jsonl lists every completed shard and its sample
+keys, so an interrupted export resumes by skipping those samples;
+unfinished .tmp shards are discarded. A session that a later save merged
+more frames into has a new version, so it is exported again as a new sample.
+"""
+
+import hashlib
+import io
+import json
+import os
+import queue
+import re
+import tarfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.services.dataset_reader import CaptureRecord, read_capture
+from src.services.exceptions import StorageError
+from src.services.point_cloud import intrinsics_path
+
+SHARD_MANIFEST = "shards.jsonl"
+_SHARD_NAME_RE = re.compile(r"^shard-(\d+)\.tar$")
+
+
+def sample_key(record: CaptureRecord) -> str:
+    """The WebDataset key of a capture; it must not contain dots, which separate the member suffixes."""
+    key = re.sub(r"[\\/]+", "_", record.session.relative_dir)
+    return f"{key.replace('.', '-')}-{content_version(record)}"
+
+
+def content_version(record: CaptureRecord) -> str:
+    """A short digest of the capture's file names; it changes when a save merges more frames into the session."""
+    names = sorted(os.path.basename(path) for frame in record.frames for path in frame.paths.values())
+    return hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()[:8]
+
+
+@dataclass
+class ExportSummary:
+    """Totals of an export run."""
+    samples: int = 0
+    skipped: int = 0  # already exported by an earlier run
+    failed: int = 0
+    shards: int = 0
+    bytes: int = 0
+    elapsed_s: float = 0.0
+
+    def summary(self) -> str:
+        rate = self.bytes / 1e6 / self.elapsed_s if self.elapsed_s > 0 else 0.0
+        return (
+            f"{self.samples} samples in {self.shards} shards, {self.bytes / 1e9:.2f} GB in {self.elapsed_s:.1f} s "
+            f"({rate:.0f} MB/s); {self.skipped} already exported, {self.failed} failed"
+        )
+
+
+@dataclass
+class _OpenShard:
+    name: str
+    path: str
+    tar: tarfile.TarFile
+    keys: List[str] = field(default_factory=list)
+    bytes: int = 0
+
+
+class ShardExporter:
+    """
+    Streams captures into tar shards using parallel shard writers.
+
+    Each writer thread owns one open shard and takes the next capture from
+    a bounded queue, reads its files and appends them as one sample. A
+    shard is closed before it would exceed `max_shard_bytes` (a single
+    larger sample gets a shard of its own) or once it holds `max_samples`.
+
+    Usage:
+        with ShardExporter(output_dir, root_dir, writers=4) as exporter:
+            for record in DatasetReader(root_dir, streams=None):
+                exporter.submit(record)
+    """
+
+    def __init__(self, output_dir: str, root_dir: str, max_shard_bytes: int = 1_000_000_000,
+                 max_samples: int = 0, writers: int = 4, streams: Optional[Iterable[str]] = None,
+                 queue_size: int = 16):
+        """
+        Args:
+            output_dir: Directory for the shards and their manifest
+            root_dir: Dataset root, where the camera intrinsics are
+            max_shard_bytes: Target maximum shard size
+            max_samples: Maximum samples per shard; 0 for no limit
+            writers: Parallel shard writers, each with its own open shard
+            streams: Streams to include; None for all
+            queue_size: Captures waiting for a writer before `submit` blocks
+        """
+        self.output_dir = output_dir
+        self.root_dir = root_dir
+        self.max_shard_bytes = max_shard_bytes
+        self.max_samples = max_samples
+        self.streams = set(streams) if streams else None
+        self.manifest_path = os.path.join(output_dir, SHARD_MANIFEST)
+        self.summary = ExportSummary()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self._exported, next_index = self._load_manifest()
+        self._next_index = next_index
+        self._lock = threading.Lock()
+        self._intrinsics: Dict[str, Optional[Dict]] = {}
+        self._queue: "queue.Queue[Optional[CaptureRecord]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._start = time.perf_counter()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._writer_loop, name=f"shard-writer-{i}", daemon=True)
+            for i in range(max(1, writers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "ShardExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_exported(self, key: str) -> bool:
+        """Whether a sample is in a shard completed by this or an earlier run."""
+        with self._lock:
+            return key in self._exported
+
+    def submit(self, record: CaptureRecord) -> bool:
+        """
+        Queue a capture for export; blocks while all writers are busy and the queue is full.
+
+        Returns:
+            False if the capture was already exported
+
+        Raises:
+            StorageError: If the exporter is closed or no shard writer is running
+        """
+        if self.is_exported(sample_key(record)):
+            with self._lock:
+                self.summary.skipped += 1
+            return False
+        if self._closed or not self._put(record):
+            raise StorageError("Shard export is not running", path=self.output_dir)
+        return True
+
+    def submit_session(self, session_dir: str) -> bool:
+        """Queue a session directory for export, e.g. right after StorageService saved it."""
+        record = read_capture(self.root_dir, session_dir)
+        if record is None:
+            return False
+        return self.submit(record)
+
+    def close(self) -> ExportSummary:
+        """Write the queued captures, complete the open shards and stop the writers."""
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._put(None)
+            for thread in self._threads:
+                thread.join()
+            self.summary.elapsed_s = time.perf_counter() - self._start
+        return self.summary
+
+    def _put(self, item: Optional[CaptureRecord]) -> bool:
+        """Queue an item for the writers; False if none is left to take it, which would block forever."""
+        while any(thread.is_alive() for thread in self._threads):
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _writer_loop(self) -> None:
+        shard: Optional[_OpenShard] = None
+        try:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                try:
+                    key = sample_key(record)
+                    members = self._sample_members(key, record)
+                except (OSError, StorageError) as e:
+                    print(f"Error exporting {record.session_dir}: {e}")
+                    with self._lock:
+                        self.summary.failed += 1
+                    continue
+
+                size = sum(len(data) + 1024 for _, data in members)  # data plus tar header and padding
+                if shard is not None and (
+                    shard.bytes + size > self.max_shard_bytes
+                    or (self.max_samples and len(shard.keys) >= self.max_samples)
+                ):
+                    self._finish_shard(shard)
+                    shard = None
+                if shard is None:
+                    try:
+                        shard = self._open_shard()
+                    except OSError as e:
+                        print(f"Error exporting {record.session_dir}: {e}")
+                        with self._lock:
+                            self.summary.failed += 1
+                        continue
+
+                mtime = record.metadata.get("timestamp") or time.time()
+                try:
+                    for name, data in members:
+                        info = tarfile.TarInfo(name)
+                        info.size = len(data)
+                        info.mtime = int(mtime)
+                        shard.tar.addfile(info, io.BytesIO(data))
+                except OSError as e:
+                    # The shard may now end in a partial member; drop it, its samples are exported again on resume
+                    print(f"Error writing {shard.name}: {e}")
+                    self._discard_shard(shard)
+                    shard = None
+                    with self._lock:
+                        self.summary.failed += 1
+                    continue
+                shard.keys.append(key)
+                shard.bytes += size
+        finally:
+            if shard is not None:
+                self._finish_shard(shard)
+
+    def _sample_members(self, key: str, record: CaptureRecord) -> List[Tuple[str, bytes]]:
+        """The tar members of a capture: its encoded files and the JSON sidecar."""
+        members = []
+        cameras = {}
+        for frame in record.frames:
+            streams = {}
+            for stream, path in sorted(frame.paths.items()):
+                if self.streams is not None and stream not in self.streams:
+                    continue
+                name = f"{key}.{frame.camera_id.replace('.', '-')}.{stream}{os.path.splitext(path)[1]}"
+                with open(path, "rb") as f:
+                    members.append((name, f.read()))
+                streams[stream] = name[len(key) + 1:]
+            cameras[frame.camera_id] = {
+                "frame_number": frame.frame_number,
+                "timestamp": frame.timestamp,
+                "files": streams,
+                "intrinsics": self._camera_intrinsics(frame.camera_id),
+            }
+        sidecar = {
+            "session_dir": record.session.relative_dir,
+            "metadata": record.metadata,
+            "cameras": cameras,
+        }
+        members.append((f"{key}.json", json.dumps(sidecar, ensure_ascii=False).encode("utf-8")))
+        return members
+
+    def _camera_intrinsics(self, camera_id: str) -> Optional[Dict]:
+        with self._lock:
+            if camera_id not in self._intrinsics:
+                try:
+                    with open(intrinsics_path(self.root_dir, camera_id), "r", encoding="utf-8") as f:
+                        self._intrinsics[camera_id] = json.load(f)
+                except (OSError, ValueError):
+                    self._intrinsics[camera_id] = None
+            return self._intrinsics[camera_id]
+
+    def _open_shard(self) -> _OpenShard:
+        with self._lock:
+            index = self._next_index
+            self._next_index += 1
+        name = f"shard-{index:06d}.tar"
+        path = os.path.join(self.output_dir, name)
+        return _OpenShard(name, path, tarfile.open(path + ".tmp", "w"))
+
+    def _discard_shard(self, shard: _OpenShard) -> None:
+        try:
+            shard.tar.close()
+        except OSError:
+            pass
+        for path in (shard.path + ".tmp", shard.path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _finish_shard(self, shard: _OpenShard) -> None:
+        """Complete a shard and record it; on a write error (e.g. a full disk) its samples count as failed."""
+        try:
+            shard.tar.close()
+            os.replace(shard.path + ".tmp", shard.path)
+            entry = {"shard": shard.name, "samples": len(shard.keys), "bytes": os.path.getsize(shard.path),
+                     "keys": shard.keys, "time": time.time()}
+            with self._lock:
+                with open(self.manifest_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            # Unrecorded, so its samples are exported again on resume
+            print(f"Error completing {shard.name}: {e}")
+            self._discard_shard(shard)
+            with self._lock:
+                self.summary.failed += len(shard.keys)
+            return
+        with self._lock:
+            self._exported.update(shard.keys)
+            self.summary.samples += len(shard.keys)
+            self.summary.shards += 1
+            self.summary.bytes += entry["bytes"]
+
+    def _load_manifest(self) -> Tuple[Set[str], int]:
+        """The sample keys of completed shards and the next free shard index; drops unfinished shards."""
+        exported: Set[str] = set()
+        completed: Set[str] = set()
+        next_index = 0
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    exported.update(entry.get("keys", []))
+                    completed.add(entry.get("shard"))
+        except FileNotFoundError:
+            pass
+
+        for name in os.listdir(self.output_dir):
+            if name.endswith(".tar.tmp"):
+                os.remove(os.path.join(self.output_dir, name))
+                continue
+            match = _SHARD_NAME_RE.match(name)
+            if match:
+                next_index = max(next_index, int(match.group(1)) + 1)
+                if name not in completed:
+                    # Renamed, but the run stopped before recording it; its samples are exported again
+                    os.remove(os.path.join(self.output_dir, name))
+        if exported:
+            print(f"Resuming export into {self.output_dir}: {len(exported)} samples already exported")
+        return exported, next_index
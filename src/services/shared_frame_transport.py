@@ -0,0 +1,166 @@
+import threading
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.camera import Frame, DepthMap
+
+# Frame attributes that are carried through shared memory; depth maps travel as their native data
+FRAME_ARRAY_FIELDS = ("rgb_image", "depth", "raw_depth", "rgb_image_left")
+
+_ALIGNMENT = 64
+
+# Blocks whose mapping could not be closed yet because views were still alive
+_deferred_close: List[shared_memory.SharedMemory] = []
+_deferred_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ArraySpec:
+    """Location of one frame array inside a shared memory slot."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    offset: int
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+
+@dataclass(frozen=True)
+class SlotLayout:
+    """Describes how frames are packed into a block of equally sized slots."""
+    arrays: Tuple[ArraySpec, ...]
+    slot_size: int
+    num_slots: int
+
+    @property
+    def header_size(self) -> int:
+        # One int64 per slot holding the sequence number of the frame it contains
+        return _align(self.num_slots * 8)
+
+    @property
+    def total_size(self) -> int:
+        return self.header_size + self.slot_size * self.num_slots
+
+    @classmethod
+    def for_frame(cls, frame: Frame, num_slots: int) -> "SlotLayout":
+        """Build a layout that fits the arrays present in `frame`."""
+        arrays = []
+        offset = 0
+        for name in FRAME_ARRAY_FIELDS:
+            image = frame_array(frame, name)
+            if image is None:
+                continue
+            spec = ArraySpec(name, tuple(image.shape), image.dtype.str, offset)
+            arrays.append(spec)
+            offset = _align(offset + spec.nbytes)
+        return cls(tuple(arrays), max(offset, _ALIGNMENT), num_slots)
+
+
+class SharedFrameRing:
+    """
+    A ring of frame slots in a `multiprocessing.shared_memory` block.
+
+    The producer process copies each frame's arrays into a free slot and
+    records the frame's sequence number in the slot header. The consumer
+    process maps the same block and wraps slots in numpy views, so frames
+    cross the process boundary with a single copy on the producer side and
+    none on the consumer side. A view stays valid until the producer reuses
+    its slot, which the producer only does once the consumer has released
+    the frame in it (see `CameraProcessHandle`).
+    """
+
+    def __init__(self, layout: SlotLayout, name: Optional[str] = None):
+        self.layout = layout
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=layout.total_size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._headers = np.frombuffer(self._shm.buf, dtype=np.int64, count=layout.num_slots)
+        if self._owner:
+            self._headers[:] = -1
+        self._views: List[Dict[str, np.ndarray]] = [self._slot_views(i) for i in range(layout.num_slots)]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(self, slot: int, sequence: int, frame: Frame) -> List[str]:
+        """
+        Copy a frame into `slot`, tagged with its sequence number.
+
+        Returns:
+            The names of the arrays that were written.
+        """
+        written = []
+        for spec in self.layout.arrays:
+            image = frame_array(frame, spec.name)
+            if image is None or tuple(image.shape) != spec.shape:
+                continue
+            np.copyto(self._views[slot][spec.name], image, casting="unsafe")
+            written.append(spec.name)
+        self._headers[slot] = sequence
+        return written
+
+    def read(self, slot: int, sequence: int, names: List[str]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get zero-copy views of the arrays stored in `slot` for `sequence`.
+
+        Returns:
+            The views keyed by frame attribute, or None if the slot has
+            already been reused for a newer frame.
+        """
+        if self._headers[slot] != sequence:
+            return None
+        views = self._views[slot]
+        return {name: views[name] for name in names if name in views}
+
+    def close(self) -> None:
+        """Release the mapping and, for the producer, the shared memory block."""
+        self._views = []
+        self._headers = None
+        with _deferred_lock:
+            _deferred_close.append(self._shm)
+        _close_deferred()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _slot_views(self, slot: int) -> Dict[str, np.ndarray]:
+        base = self.layout.header_size + slot * self.layout.slot_size
+        views = {}
+        for spec in self.layout.arrays:
+            # np.frombuffer holds a buffer export, so the mapping cannot be closed under a live view
+            count = int(np.prod(spec.shape))
+            view = np.frombuffer(self._shm.buf, dtype=np.dtype(spec.dtype), count=count, offset=base + spec.offset)
+            views[spec.name] = view.reshape(spec.shape)
+        return views
+
+
+def frame_array(frame: Frame, name: str) -> Optional[np.ndarray]:
+    """Get the array behind a frame attribute listed in FRAME_ARRAY_FIELDS."""
+    value = getattr(frame, name, None)
+    return value.data if isinstance(value, DepthMap) else value
+
+
+def _close_deferred() -> None:
+    """Close every pending mapping that no longer has views into it."""
+    with _deferred_lock:
+        for shm in list(_deferred_close):
+            try:
+                shm.close()
+            except BufferError:
+                # Frames still reference the block; retry on the next close
+                continue
+            _deferred_close.remove(shm)
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,240 @@
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from src.models.settings import Settings
+from src.services.exceptions import StorageError
+
+# Settings flag that enables each stream
+STREAM_SETTINGS = {
+    "rgb": "save_rgb",
+    "depth": "save_depth",
+    "raw_depth": "save_raw_depth",
+    "point_cloud": "save_point_cloud",
+}
+
+
+class StorageHealthState(Enum):
+    """Admission state of the storage path, from healthy to full."""
+    OK = "ok"
+    WARNING = "warning"
+    DEGRADED = "degraded"
+    REFUSING = "refusing"
+
+
+@dataclass(frozen=True)
+class HealthThreshold:
+    """Limits that put storage into a state; a limit of 0 is disabled."""
+    free_gb: float = 0.0
+    minutes_to_full: float = 0.0
+
+    def exceeded(self, free_bytes: int, seconds_to_full: Optional[float]) -> Optional[str]:
+        """The reason the threshold is exceeded, or None."""
+        if self.free_gb > 0 and free_bytes < self.free_gb * 1e9:
+            return f"{free_bytes / 1e9:.1f} GB free (limit {self.free_gb:g} GB)"
+        if self.minutes_to_full > 0 and seconds_to_full is not None and seconds_to_full < self.minutes_to_full * 60:
+            return f"full in {seconds_to_full / 60:.0f} min (limit {self.minutes_to_full:g} min)"
+        return None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "HealthThreshold":
+        data = data or {}
+        return cls(float(data.get("free_gb", 0.0)), float(data.get("minutes_to_full", 0.0)))
+
+
+@dataclass
+class StorageHealth:
+    """A snapshot of the storage path's free space, throughput and admission state."""
+    state: StorageHealthState
+    free_bytes: Optional[int]  # None until free space could be read
+    total_bytes: Optional[int]
+    data_rate_bps: float  # bytes written per second of wall time, over the window
+    write_mbps: Optional[float]  # disk write speed while writing, over the window
+    seconds_to_full: Optional[float]  # at the current data rate; None when idle
+    sessions: int  # sessions in the window
+    mean_encode_ms: Optional[float]  # per session, summed over files
+    mean_write_ms: Optional[float]
+    reason: str = ""
+    skipped_streams: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        if self.free_bytes is None:
+            return "free space unknown"
+        text = f"{self.free_bytes / 1e9:.1f} GB free"
+        if self.seconds_to_full is not None:
+            text += f", full in {_format_duration(self.seconds_to_full)} at {self.data_rate_bps / 1e6:.1f} MB/s"
+        if self.write_mbps is not None:
+            text += f", disk {self.write_mbps:.0f} MB/s"
+        return text
+
+
+class StorageHealthMonitor:
+    """
+    Watches free space and write throughput of the storage root and decides
+    whether new captures are admitted.
+
+    Every saved session is recorded with its size and its encode and write
+    times. Over a rolling window this gives the data rate (how fast the disk
+    fills) and the achieved write speed. Free space comes from
+    `shutil.disk_usage`, polled at most every `disk_check_interval_s`; if a
+    query fails the last reading is kept, and without one the state is
+    WARNING with "free space unknown" as the reason.
+
+    The thresholds are checked from the most to the least severe: REFUSING
+    rejects captures, DEGRADED drops the `skip_streams` from their settings
+    and WARNING only reports.
+    """
+
+    def __init__(self, root_dir: str, window_s: float = 60.0, disk_check_interval_s: float = 2.0,
+                 warn: HealthThreshold = HealthThreshold(), degrade: HealthThreshold = HealthThreshold(),
+                 refuse: HealthThreshold = HealthThreshold(), skip_streams: Sequence[str] = ("raw_depth",)):
+        """
+        Args:
+            root_dir: Storage root directory
+            window_s: Rolling window for the data rate and timing averages
+            disk_check_interval_s: Minimum time between free space queries
+            warn: Thresholds of the WARNING state
+            degrade: Thresholds of the DEGRADED state
+            refuse: Thresholds of the REFUSING state
+            skip_streams: Streams not saved while DEGRADED
+        """
+        self._root_dir = root_dir
+        self.window_s = window_s
+        self.disk_check_interval_s = disk_check_interval_s
+        self.warn = warn
+        self.degrade = degrade
+        self.refuse = refuse
+        self.skip_streams = [s for s in skip_streams if s in STREAM_SETTINGS]
+        self._sessions: Deque[Tuple[float, int, float, float]] = deque()  # (time, bytes, encode_ms, write_ms)
+        self._disk: Optional[Tuple[int, int]] = None  # last (free, total) read
+        self._disk_checked_at: Optional[float] = None  # None queries free space on the next check
+        self._disk_error = ""
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, root_dir: str, config) -> "StorageHealthMonitor":
+        """Create a monitor from the `storage.health` config section."""
+        section = config.get('storage.health', {}) or {}
+        degrade = section.get('degrade', {}) or {}
+        return cls(
+            root_dir,
+            window_s=float(section.get('window_s', 60.0)),
+            disk_check_interval_s=float(section.get('disk_check_interval_s', 2.0)),
+            warn=HealthThreshold.from_dict(section.get('warn')),
+            degrade=HealthThreshold.from_dict(degrade),
+            refuse=HealthThreshold.from_dict(section.get('refuse')),
+            skip_streams=degrade.get('skip_streams', ["raw_depth"]) or [],
+        )
+
+    def set_root_dir(self, root_dir: str) -> None:
+        """Follow a new storage root; its free space is queried on the next check."""
+        with self._lock:
+            self._root_dir = root_dir
+            self._disk = None
+            self._disk_checked_at = None
+
+    def record_session(self, total_bytes: int, encode_ms: float, write_ms: float) -> None:
+        """Record a saved session."""
+        now = time.monotonic()
+        with self._lock:
+            self._sessions.append((now, total_bytes, encode_ms, write_ms))
+            self._trim(now)
+            # The session just took space; don't wait for the poll interval to notice
+            self._disk_checked_at = None
+
+    def record_failure(self) -> None:
+        """Record a failed save, which often means the disk is full; free space is queried again."""
+        with self._lock:
+            self._disk_checked_at = None
+
+    def check(self) -> StorageHealth:
+        """Get the current health of the storage path."""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            free, total = self._disk_usage(now) or (None, None)
+            error = self._disk_error
+            sessions = list(self._sessions)
+
+        window_bytes = sum(s[1] for s in sessions)
+        encode_ms = sum(s[2] for s in sessions)
+        write_ms = sum(s[3] for s in sessions)
+        # Averaged over the whole window, so a single large capture does not look like a sustained rate
+        rate = window_bytes / self.window_s
+        seconds_to_full = free / rate if rate > 0 and free is not None else None
+
+        health = StorageHealth(
+            state=StorageHealthState.OK,
+            free_bytes=free,
+            total_bytes=total,
+            data_rate_bps=rate,
+            write_mbps=window_bytes / 1e6 / (write_ms / 1000) if write_ms > 0 else None,
+            seconds_to_full=seconds_to_full,
+            sessions=len(sessions),
+            mean_encode_ms=encode_ms / len(sessions) if sessions else None,
+            mean_write_ms=write_ms / len(sessions) if sessions else None,
+        )
+        if free is None:
+            # Not knowing is not the same as a full disk; report it without refusing captures
+            health.state = StorageHealthState.WARNING
+            health.reason = f"free space unknown: {error}"
+            return health
+        for state, threshold in ((StorageHealthState.REFUSING, self.refuse),
+                                 (StorageHealthState.DEGRADED, self.degrade),
+                                 (StorageHealthState.WARNING, self.warn)):
+            reason = threshold.exceeded(free, seconds_to_full)
+            if reason is not None:
+                health.state = state
+                health.reason = reason
+                if state == StorageHealthState.DEGRADED:
+                    health.skipped_streams = list(self.skip_streams)
+                break
+        return health
+
+    def admit(self, settings: Settings) -> Settings:
+        """
+        Apply admission control to a capture's save settings.
+
+        Returns:
+            The settings to save with: unchanged, or without the skipped
+            streams while DEGRADED
+
+        Raises:
+            StorageError: While REFUSING
+        """
+        health = self.check()
+        if health.state == StorageHealthState.REFUSING:
+            raise StorageError(f"Storage is almost full: {health.reason}", free_bytes=health.free_bytes)
+        if health.state == StorageHealthState.DEGRADED and health.skipped_streams:
+            return replace(settings, **{STREAM_SETTINGS[s]: False for s in health.skipped_streams})
+        return settings
+
+    def _trim(self, now: float) -> None:
+        while self._sessions and now - self._sessions[0][0] > self.window_s:
+            self._sessions.popleft()
+
+    def _disk_usage(self, now: float) -> Optional[Tuple[int, int]]:
+        """The free and total bytes, or None if free space has not been read since the root was set."""
+        if self._disk_checked_at is None or now - self._disk_checked_at >= self.disk_check_interval_s:
+            self._disk_checked_at = now
+            try:
+                usage = shutil.disk_usage(self._root_dir)
+                self._disk = (usage.free, usage.total)
+                self._disk_error = ""
+            except OSError as e:
+                # Keep the last reading; an unreadable path is not an empty disk
+                print(f"Warning: Could not query free space of {self._root_dir}: {e}")
+                self._disk_error = str(e)
+        return self._disk
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds >= 86400:
+        return f"{seconds / 86400:.1f} d"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 60:.0f} min"
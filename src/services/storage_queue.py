@@ -0,0 +1,141 @@
+import itertools
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from src.models.camera import Frame
+from src.models.metadata import CaptureMetadata
+from src.models.settings import Settings
+from src.services.exceptions import StorageError
+from src.services.storage_service import StorageReport, StorageService
+
+
+@dataclass
+class StorageJob:
+    """A capture waiting to be written to disk."""
+    job_id: int
+    frames: List[Frame]
+    metadata: CaptureMetadata
+    settings: Settings
+    session_dir: Optional[str] = field(default=None)
+    report: Optional[StorageReport] = field(default=None)
+
+
+class StorageQueue:
+    """
+    Write-behind storage: captures are queued and saved by a pool of
+    background worker threads so the caller never waits on encoding or disk.
+
+    The queue is bounded. When it is full, `submit` blocks for up to
+    `submit_timeout` seconds and then raises StorageError, so a burst of
+    captures slows the operator down instead of growing memory without
+    limit. Captures also pass the storage service's health monitor, which
+    may drop streams or reject them while the disk is nearly full.
+
+    Once a job is accepted the queue owns the frames' references and
+    releases them when the job is done; if `submit` raises, the caller
+    still owns them.
+
+    Completion is reported through the `on_finished(job)` and
+    `on_failed(job, error)` callbacks, which run on a worker thread.
+    """
+
+    def __init__(
+        self,
+        storage_service: StorageService,
+        max_pending: int = 8,
+        workers: int = 2,
+        submit_timeout: float = 0.5,
+        on_finished: Optional[Callable[[StorageJob], None]] = None,
+        on_failed: Optional[Callable[[StorageJob, Exception], None]] = None,
+    ):
+        self._storage_service = storage_service
+        self._jobs: "queue.Queue[Optional[StorageJob]]" = queue.Queue(maxsize=max(1, max_pending))
+        self._submit_timeout = submit_timeout
+        self._job_ids = itertools.count(1)
+        self._on_finished = on_finished
+        self._on_failed = on_failed
+        self._closed = False
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"storage-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Get the number of jobs waiting to be picked up by a worker."""
+        return self._jobs.qsize()
+
+    def submit(self, frames: List[Frame], metadata: CaptureMetadata, settings: Settings) -> StorageJob:
+        """
+        Queue frames for saving.
+
+        Raises:
+            StorageError: If the queue is closed, the storage is refusing captures,
+                or the queue stays full for `submit_timeout` seconds.
+        """
+        settings = self._storage_service.health.admit(settings)
+        with self._lock:
+            if self._closed:
+                raise StorageError("Storage queue is shut down")
+            job = StorageJob(next(self._job_ids), frames, metadata, settings)
+        try:
+            self._jobs.put(job, timeout=self._submit_timeout)
+        except queue.Full:
+            raise StorageError(
+                f"Storage queue is full ({self._jobs.maxsize} captures pending)",
+                pending=self._jobs.maxsize,
+            )
+        return job
+
+    def flush(self) -> None:
+        """Block until every queued job has been written."""
+        self._jobs.join()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting jobs, write everything still queued, then stop the workers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        print(f"Flushing storage queue ({self.pending} captures pending)...")
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        print("Storage queue stopped.")
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                self._run_job(job)
+            finally:
+                self._jobs.task_done()
+
+    def _run_job(self, job: StorageJob) -> None:
+        error = None
+        try:
+            job.report = self._storage_service.save_with_report(job.frames, job.metadata, job.settings)
+            job.session_dir = job.report.session_dir
+        except Exception as e:
+            print(f"Error saving capture {job.job_id}: {e}")
+            error = e
+        finally:
+            for frame in job.frames:
+                frame.release()
+
+        try:
+            if error is not None:
+                if self._on_failed:
+                    self._on_failed(job, error)
+            elif self._on_finished:
+                self._on_finished(job)
+        except Exception as e:
+            print(f"Error in storage queue callback for capture {job.job_id}: {e}")
@@ -1,107 +1,651 @@
 import json
+import multiprocessing as mp
 import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
-import cv2
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 import numpy as np
 
-from src.models.camera import Frame
+from src.models.camera import Frame, DepthMap
 from src.models.metadata import CaptureMetadata
 from src.models.settings import Settings
+from src.services.capture_catalog import CaptureCatalog
+from src.services.checksums import MANIFEST_FILENAME, SessionManifest, checksum, validate_algorithm
+from src.services.codecs import Codec, STREAM_SUFFIXES, stream_codecs
+from src.services.dataset_layout import METADATA_FILENAME
+from src.services.exceptions import StorageError
+from src.services.point_cloud import (
+    CameraIntrinsics, PointCloudBuilder, PointCloudStats, intrinsics_path, load_intrinsics
+)
+from src.services.shard_export import ShardExporter
+from src.services.session_journal import (
+    RecoveryReport, SessionJournal, fsync_dir, merge_session_dir, staging_dir_for
+)
+from src.services.storage_health import StorageHealthMonitor
+from src.services.thumbnails import (
+    CONTACT_SHEET_FILENAME, THUMBNAIL_DIRNAME, ThumbnailSettings, encode_contact_sheet, encode_thumbnail,
+    thumbnail_filename
+)
+
+
+@dataclass
+class FileReport:
+    """Timing and size of one file written during a save."""
+    path: str
+    size_bytes: int
+    encode_ms: float
+    write_ms: float
+    point_cloud: Optional[PointCloudStats] = None
+    checksum: Optional[str] = None  # hex digest of the written bytes, if checksums are enabled
+
+
+@dataclass
+class StorageReport:
+    """Per-file encode and write timings of one saved session."""
+    session_dir: str
+    files: List[FileReport] = field(default_factory=list)
+    total_ms: float = 0.0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(f.size_bytes for f in self.files)
+
+    @property
+    def encode_ms(self) -> float:
+        """Sum of the encode times of all files (exceeds wall time when encoding in parallel)."""
+        return sum(f.encode_ms for f in self.files)
+
+    @property
+    def write_ms(self) -> float:
+        return sum(f.write_ms for f in self.files)
+
+    @property
+    def points_removed(self) -> int:
+        return sum(f.point_cloud.removed_points for f in self.files if f.point_cloud is not None)
+
+    def summary(self) -> str:
+        text = (
+            f"{len(self.files)} files, {self.total_bytes / 1e6:.1f} MB in {self.total_ms:.0f} ms, "
+            f"encoding {self.encode_ms:.0f} ms across workers"
+        )
+        if any(f.point_cloud is not None for f in self.files):
+            text += f", {self.points_removed} cloud points removed"
+        return text
+
+    def format_table(self) -> str:
+        lines = [f"Storage report for {self.session_dir}: {self.summary()}"]
+        for f in sorted(self.files, key=lambda f: f.path):
+            lines.append(
+                f"  {os.path.relpath(f.path, self.session_dir)}: {f.size_bytes / 1e3:.0f} KB, "
+                f"encode {f.encode_ms:.1f} ms, write {f.write_ms:.1f} ms"
+            )
+            if f.point_cloud is not None:
+                lines.append(f"    {f.point_cloud.summary()}")
+        return "\n".join(lines)
+
+
+def encode_image(codec: Codec, image: np.ndarray) -> Tuple[Any, float, None]:
+    """
+    Encode an image in memory.
+
+    Defined at module level so it can run in a process pool.
+
+    Returns:
+        The encoded bytes, the encode time in seconds and no point cloud stats.
+    """
+    start = time.perf_counter()
+    buffer = codec.encode(image)
+    return buffer, time.perf_counter() - start, None
+
+
+def encode_point_cloud(builder: PointCloudBuilder, codec: Codec, depth: DepthMap,
+                       intrinsics: CameraIntrinsics, bgr_image: Optional[np.ndarray]
+                       ) -> Tuple[Any, float, PointCloudStats]:
+    """
+    Back-project a depth map, reduce the point cloud and encode it.
+
+    Defined at module level so it can run in a process pool.
+
+    Returns:
+        The encoded bytes, the time spent building and encoding in seconds,
+        and the points removed by each reduction stage.
+    """
+    start = time.perf_counter()
+    cloud, stats = builder.build_with_stats(depth, intrinsics, bgr_image)
+    buffer = codec.encode(cloud)
+    return buffer, time.perf_counter() - start, stats
+
+
+def run_encode_task(checksum_algorithm: Optional[str], encode: Callable, *args
+                    ) -> Tuple[Any, float, Optional[PointCloudStats], Optional[str]]:
+    """
+    Run an encode task, then hash its buffer on the same worker while it is
+    still in cache, so no file is read back for its checksum.
+
+    Defined at module level so it can run in a process pool.
+
+    Returns:
+        The encode task's result plus the hex digest (None without an algorithm).
+        The hashing time is included in the encode time.
+    """
+    start = time.perf_counter()
+    buffer, _, stats = encode(*args)
+    digest = checksum(buffer, checksum_algorithm) if checksum_algorithm else None
+    return buffer, time.perf_counter() - start, stats, digest
+
+
+class _RootGuard:
+    """
+    Lets saves run concurrently while a root directory change waits for the
+    saves in flight and holds off new ones until it is done.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._saves = 0
+        self._changing = False
+
+    @contextmanager
+    def saving(self):
+        with self._condition:
+            while self._changing:
+                self._condition.wait()
+            self._saves += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._saves -= 1
+                self._condition.notify_all()
+
+    @contextmanager
+    def changing(self):
+        with self._condition:
+            while self._changing:
+                self._condition.wait()
+            # Set first, so a steady stream of new saves cannot starve the change
+            self._changing = True
+            while self._saves:
+                self._condition.wait()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._changing = False
+                self._condition.notify_all()
+
 
 class StorageService:
-    """Handles saving captured frames and metadata to disk."""
+    """
+    Handles saving captured frames and metadata to disk.
+
+    Each session is written into a staging directory and renamed into
+    place once complete; a SessionJournal records the sessions in flight so
+    `recover` can finish or quarantine them after a crash.
+    """
 
     def __init__(self, root_dir: str):
+        # Encoder settings are loaded once; the pool itself is created on first use
+        from src.services.config_service import ConfigService
+        config = ConfigService()
+        self._fsync = str(config.get('storage.fsync', 'journal')).lower()
+        self._checksum_algorithm = (
+            validate_algorithm(str(config.get('storage.checksums.algorithm', 'sha256')).lower())
+            if config.get('storage.checksums.enabled', True) else None
+        )
+        self._health = StorageHealthMonitor.from_config(root_dir, config)
+        self._catalog: Optional[CaptureCatalog] = None
+        self._catalog_lock = threading.Lock()
+        self._export_config = config.get('storage.export', {}) or {}
+        self._exporter: Optional[ShardExporter] = None
+        self._exporter_lock = threading.Lock()
+        self._root_guard = _RootGuard()
         self.set_root_dir(root_dir)
 
+        self._encoder_mode = str(config.get('storage.encoder.executor', 'thread')).lower()
+        self._encoder_workers = int(config.get('storage.encoder.workers', 4))
+        self._codecs = stream_codecs(config)
+        self._point_cloud_builder = self._load_point_cloud_builder(config)
+        self._intrinsics_stream = config.get('storage.point_cloud.intrinsics_stream', 'Color')
+        self._thumbnails = (
+            ThumbnailSettings.from_config(config) if config.get('storage.thumbnails.enabled', False) else None
+        )
+        self._intrinsics_cache: Dict[str, Tuple[float, Optional[CameraIntrinsics]]] = {}
+        self._catalog_enabled = bool(config.get('storage.catalog.enabled', True))
+        self._catalog_path = config.get('storage.catalog.path', '') or None
+        self._encoder: Optional[Executor] = None
+        self._encoder_lock = threading.Lock()
+
     def get_root_dir(self) -> str:
         """Return the root directory for saving data."""
         return self._root_dir
 
-    def set_root_dir(self, root_dir: str):
-        """Set the root directory for saving data."""
-        self._root_dir = root_dir
-        os.makedirs(self._root_dir, exist_ok=True)
+    def set_root_dir(self, root_dir: str, recover: bool = False) -> Optional[RecoveryReport]:
+        """
+        Set the root directory for saving data.
+
+        Waits for the saves in flight, which finish under the old root, and
+        holds off new saves until the switch is done.
+
+        Args:
+            root_dir: The new root directory; created if missing
+            recover: Also finish or quarantine the sessions a crash left
+                half-written in the new root, as `recover` does at startup
+
+        Returns:
+            The recovery report if `recover` is set, else None
+
+        Raises:
+            OSError: If the directory cannot be created; the old root stays in use
+        """
+        os.makedirs(root_dir, exist_ok=True)
+        with self._root_guard.changing():
+            self._root_dir = root_dir
+            self._journal = SessionJournal(root_dir, self._fsync)
+            self._health.set_root_dir(root_dir)
+            self._close_catalog()
+            self._close_exporter()
+            return self._recover() if recover else None
 
     def save(self, frames: List[Frame], metadata: CaptureMetadata, settings: Settings) -> str:
         """Save frames and metadata, then return the session directory."""
-        session_dir = self._create_session_directory(metadata)
-
-        # Save metadata
-        metadata_path = os.path.join(session_dir, "metadata.json")
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata.to_dict(), f, indent=4, ensure_ascii=False)
-
-        # Save frames
-        for frame in frames:
-            # Generate a unique timestamp for each frame to prevent filename collisions
-            timestamp_str = datetime.now().strftime("%Y%m%dT%H%M%S%f")[:-3]
-            base_filename = f"{timestamp_str}_{frame.camera_id}_frame_{frame.frame_number:04d}"
-
-            if settings.save_rgb and frame.rgb_image is not None:
-                rgb_filename = f"{base_filename}_rgb.png"
-                rgb_path = os.path.join(session_dir, rgb_filename)
-                self._save_image_unicode(rgb_path, frame.rgb_image)
-
-            if settings.save_depth and frame.depth_image is not None:
-                depth_filename = f"{base_filename}_depth.tiff"
-                depth_path = os.path.join(session_dir, depth_filename)
-                self._save_depth_image(depth_path, frame.depth_image)
-
-            if settings.save_raw_depth and frame.raw_depth_image is not None:
-                raw_depth_filename = f"{base_filename}_depth_raw.tiff"
-                raw_depth_path = os.path.join(session_dir, raw_depth_filename)
-                self._save_depth_image(raw_depth_path, frame.raw_depth_image)
-
-            if settings.save_point_cloud:
-                pc_filename = f"{base_filename}_PC.ply"
-                pc_path = os.path.join(session_dir, pc_filename)
-                self._save_placeholder_ply(pc_path)
+        return self.save_with_report(frames, metadata, settings).session_dir
+
+    def save_with_report(self, frames: List[Frame], metadata: CaptureMetadata, settings: Settings) -> StorageReport:
+        """
+        Save frames and metadata, encoding images in parallel, and report per-file timings.
+
+        The files are written into a staging directory, metadata.json last,
+        which is then renamed to the session directory.
+
+        Raises:
+            StorageError: If a file cannot be written (e.g. the disk is full).
+                The incomplete session is moved to <root>/quarantine.
+        """
+        # The journal, catalog and exporter of one root serve the whole save
+        with self._root_guard.saving():
+            return self._save_with_report(frames, metadata, settings)
+
+    def _save_with_report(self, frames: List[Frame], metadata: CaptureMetadata, settings: Settings) -> StorageReport:
+        start = time.perf_counter()
+        session_dir = self._session_directory(metadata)
+        staging_dir = staging_dir_for(session_dir)
+        report = StorageReport(session_dir)
+
+        try:
+            self._journal.pending(session_dir, staging_dir)
+            os.makedirs(staging_dir)
+
+            # Collect the files of all frames, then fan the encoding out across the pool
+            tasks: List[Tuple[str, Callable, tuple]] = []
+            thumbnail_views = []
+            for frame in frames:
+                # Generate a unique timestamp for each frame to prevent filename collisions
+                timestamp_str = datetime.now().strftime("%Y%m%dT%H%M%S%f")[:-3]
+                base_filename = f"{timestamp_str}_{frame.camera_id}_frame_{frame.frame_number:04d}"
+                rgb = frame.rgb_image if settings.save_rgb else None
+                depth_mm = None
+
+                if rgb is not None:
+                    tasks.append(self._image_task(staging_dir, base_filename, "rgb", rgb))
 
+                if settings.save_depth and frame.depth is not None:
+                    depth_mm = self._depth_millimeters(frame.depth)
+                    tasks.append(self._image_task(staging_dir, base_filename, "depth", depth_mm))
+
+                if settings.save_raw_depth and frame.raw_depth is not None:
+                    tasks.append(self._image_task(
+                        staging_dir, base_filename, "raw_depth", self._depth_millimeters(frame.raw_depth)))
+
+                if settings.save_point_cloud and frame.depth is not None:
+                    task = self._point_cloud_task(staging_dir, base_filename, frame)
+                    if task is not None:
+                        tasks.append(task)
+
+                if self._thumbnails is not None and (rgb is not None or depth_mm is not None):
+                    thumbnail_views.append((frame.camera_id, rgb, depth_mm))
+
+            if thumbnail_views:
+                tasks.extend(self._thumbnail_tasks(staging_dir, thumbnail_views))
+
+            self._encode_and_write(tasks, report)
+            # metadata.json marks the staged session as complete for recovery
+            metadata_json = json.dumps(metadata.to_dict(), indent=4, ensure_ascii=False).encode("utf-8")
+            if self._checksum_algorithm is not None:
+                self._write_manifest(staging_dir, report, metadata_json)
+            self._write_file(os.path.join(staging_dir, METADATA_FILENAME), metadata_json, self._fsync == "commit")
+            merged = self._commit(staging_dir, session_dir)
+        except StorageError:
+            self._abort(staging_dir, session_dir)
+            self._health.record_failure()
+            raise
+        except OSError as e:
+            self._abort(staging_dir, session_dir)
+            self._health.record_failure()
+            raise StorageError(f"Could not save session: {e}", path=session_dir)
+        for file_report in report.files:
+            file_report.path = os.path.join(session_dir, os.path.relpath(file_report.path, staging_dir))
+        self._add_to_catalog(report, metadata, merged)
+        self._export_session(session_dir)
+
+        report.total_ms = (time.perf_counter() - start) * 1000
+        self._health.record_session(report.total_bytes, report.encode_ms, report.write_ms)
         print(f"Saved data for {len(frames)} frames to {session_dir}")
-        return session_dir
+        print(report.format_table())
+        return report
+
+    def close(self):
+        """Shut down the encoder pool, close the capture catalog and complete the open export shards."""
+        with self._encoder_lock:
+            if self._encoder is not None:
+                self._encoder.shutdown(wait=True)
+                self._encoder = None
+        self._close_catalog()
+        self._close_exporter()
+
+    @property
+    def health(self) -> StorageHealthMonitor:
+        """Get the free space and throughput monitor of the storage root."""
+        return self._health
+
+    def recover(self) -> RecoveryReport:
+        """
+        Finish or quarantine the sessions a crash left half-written.
+
+        Only reads the journal and the directories it names, so it is fast on
+        any dataset size. Must run before the first save, i.e. at startup;
+        camera processes create their own StorageService and must not call it.
+        A later root change recovers through `set_root_dir(path, recover=True)`.
+        """
+        with self._root_guard.changing():
+            return self._recover()
+
+    def _recover(self) -> RecoveryReport:
+        result = self._journal.recover()
+        catalog = self.get_catalog()
+        for session_dir in result.finished:
+            if catalog is not None:
+                try:
+                    catalog.index_session(session_dir)
+                except StorageError as e:
+                    print(f"Warning: {e}")
+        if result.finished or result.quarantined:
+            print(f"Storage recovery: {result.summary()}")
+            for path in result.quarantined:
+                print(f"  Quarantined incomplete session: {path}")
+        return result
+
+    def get_catalog(self) -> Optional[CaptureCatalog]:
+        """Get the capture catalog of the current root directory, or None if it is disabled or unavailable."""
+        if not self._catalog_enabled:
+            return None
+        with self._catalog_lock:
+            if self._catalog is None:
+                try:
+                    self._catalog = CaptureCatalog(self._root_dir, self._catalog_path)
+                except StorageError as e:
+                    print(f"Warning: {e}")
+                    self._catalog_enabled = False
+            return self._catalog
+
+    def _add_to_catalog(self, report: StorageReport, metadata: CaptureMetadata, merged: bool = False):
+        catalog = self.get_catalog()
+        if catalog is None:
+            return
+        try:
+            if merged:
+                # The session also holds the files of earlier saves; index everything on disk
+                catalog.index_session(report.session_dir)
+            else:
+                catalog.add_session(
+                    report.session_dir, metadata.to_dict(), [(f.path, f.size_bytes) for f in report.files]
+                )
+        except StorageError as e:
+            # The files are on disk; `python -m src.tools.catalog rebuild` can index them later
+            print(f"Warning: {e}")
+
+    def _close_catalog(self):
+        with self._catalog_lock:
+            if self._catalog is not None:
+                self._catalog.close()
+                self._catalog = None
+
+    def _get_exporter(self) -> Optional[ShardExporter]:
+        """The live shard exporter, created on first use, or None if live export is disabled."""
+        if not self._export_config.get('enabled', False):
+            return None
+        with self._exporter_lock:
+            if self._exporter is None:
+                output_dir = self._export_config.get('dir', '') or os.path.join(self._root_dir, "shards")
+                try:
+                    self._exporter = ShardExporter(
+                        output_dir, self._root_dir,
+                        max_shard_bytes=int(float(self._export_config.get('shard_size_mb', 1024)) * 1e6),
+                        writers=int(self._export_config.get('writers', 1)),
+                        streams=self._export_config.get('streams') or None,
+                    )
+                except OSError as e:
+                    print(f"Warning: Could not start live export to {output_dir}: {e}")
+                    self._export_config = dict(self._export_config, enabled=False)
+            return self._exporter
+
+    def _export_session(self, session_dir: str):
+        exporter = self._get_exporter()
+        if exporter is None:
+            return
+        try:
+            # Read back from the page cache on the shard writers; blocks only while all writers are busy
+            exporter.submit_session(session_dir)
+        except (OSError, StorageError) as e:
+            # The session is saved; `python -m src.tools.export_shards` exports it later
+            print(f"Warning: Could not export {session_dir}: {e}")
+
+    def _close_exporter(self):
+        with self._exporter_lock:
+            if self._exporter is not None:
+                print(f"Live export: {self._exporter.close().summary()}")
+                self._exporter = None
+
+    @property
+    def codecs(self) -> Dict[str, Codec]:
+        """Get the codec assigned to each stream."""
+        return dict(self._codecs)
+
+    def _stream_path(self, session_dir: str, base_filename: str, stream: str) -> str:
+        codec = self._codecs[stream]
+        return os.path.join(session_dir, f"{base_filename}{STREAM_SUFFIXES[stream]}{codec.extension}")
+
+    def _image_task(self, session_dir: str, base_filename: str, stream: str, image: np.ndarray):
+        path = self._stream_path(session_dir, base_filename, stream)
+        return path, encode_image, (self._codecs[stream], image)
+
+    def _point_cloud_task(self, session_dir: str, base_filename: str, frame: Frame):
+        intrinsics = self._camera_intrinsics(frame.camera_id)
+        if intrinsics is None:
+            return None
+        if (intrinsics.width, intrinsics.height) != (frame.depth.shape[1], frame.depth.shape[0]):
+            print(f"Warning: Intrinsics of {frame.camera_id} do not match its depth resolution. Skipping point cloud.")
+            return None
+        path = self._stream_path(session_dir, base_filename, "point_cloud")
+        args = (self._point_cloud_builder, self._codecs["point_cloud"], frame.depth, intrinsics, frame.rgb_image)
+        return path, encode_point_cloud, args
+
+    def _thumbnail_tasks(self, session_dir: str, views) -> List[Tuple[str, Callable, tuple]]:
+        """Encode tasks for the thumbnails of the images being saved, rendered from the same arrays."""
+        thumbnail_dir = os.path.join(session_dir, THUMBNAIL_DIRNAME)
+        os.makedirs(thumbnail_dir, exist_ok=True)
+        tasks = []
+        for camera_id, rgb, depth_mm in views:
+            for stream, image in (("rgb", rgb), ("depth", depth_mm)):
+                if image is not None:
+                    path = os.path.join(thumbnail_dir, thumbnail_filename(camera_id, stream))
+                    tasks.append((path, encode_thumbnail, (self._thumbnails, stream, image)))
+        if self._thumbnails.contact_sheet:
+            tasks.append((os.path.join(thumbnail_dir, CONTACT_SHEET_FILENAME), encode_contact_sheet,
+                          (self._thumbnails, views)))
+        return tasks
+
+    def _camera_intrinsics(self, camera_id: str) -> Optional[CameraIntrinsics]:
+        """Load a camera's saved intrinsics, reloading when the file changes (e.g. after a reconnect)."""
+        path = intrinsics_path(self._root_dir, camera_id)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+
+        cached = self._intrinsics_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        intrinsics = load_intrinsics(path, self._intrinsics_stream) if mtime is not None else None
+        if intrinsics is None:
+            print(f"Warning: No '{self._intrinsics_stream}' intrinsics for {camera_id} at {path}. "
+                  f"Point clouds for this camera are skipped.")
+        self._intrinsics_cache[path] = (mtime, intrinsics)
+        return intrinsics
+
+    def _encode_and_write(self, tasks: List[Tuple[str, Callable, tuple]], report: StorageReport):
+        """
+        Run encode tasks on the encoder pool and write each file as soon as it is ready.
+
+        A file that fails to encode is skipped. A failed write fails the whole
+        session, once the remaining encode tasks have finished.
+
+        Raises:
+            StorageError: If a file could not be written
+        """
+        encoder = self._get_encoder()
+        futures = {}
+        for path, encode, args in tasks:
+            futures[encoder.submit(run_encode_task, self._checksum_algorithm, encode, *args)] = path
+
+        fsync = self._fsync == "commit"
+        write_error = None
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                buffer, encode_seconds, cloud_stats, digest = future.result()
+            except Exception as e:
+                print(f"Error encoding {path}: {e}")
+                continue
+            if write_error is not None:
+                continue
+            try:
+                write_seconds = self._write_file(path, buffer, fsync)
+            except OSError as e:
+                write_error = StorageError(f"Could not write {os.path.basename(path)}: {e}", path=path)
+                continue
+            report.files.append(
+                FileReport(path, len(buffer), encode_seconds * 1000, write_seconds * 1000, cloud_stats, digest)
+            )
+        if write_error is not None:
+            raise write_error
+
+    def _commit(self, staging_dir: str, session_dir: str) -> bool:
+        """
+        Rename a completely written staging directory to its session directory and journal it.
+
+        Returns:
+            True if the files were merged into an existing session directory
+        """
+        if self._fsync == "commit":
+            fsync_dir(staging_dir)
+        if os.path.exists(session_dir):
+            # The same sequence number was saved before; merge into it as earlier versions did
+            print(f"Warning: Session directory {session_dir} already exists. Adding the new files to it.")
+            merge_session_dir(staging_dir, session_dir)
+            merged = True
+        else:
+            os.rename(staging_dir, session_dir)
+            merged = False
+        if self._fsync == "commit":
+            fsync_dir(os.path.dirname(session_dir))
+        self._journal.committed(session_dir, staging_dir)
+        return merged
+
+    def _write_manifest(self, staging_dir: str, report: StorageReport, metadata_json: bytes):
+        """Write the checksums of the session's files, computed from their encoded buffers."""
+        manifest = SessionManifest(self._checksum_algorithm)
+        for file_report in report.files:
+            manifest.add_digest(
+                os.path.relpath(file_report.path, staging_dir), file_report.size_bytes, file_report.checksum)
+        manifest.add(METADATA_FILENAME, metadata_json)
+        self._write_file(os.path.join(staging_dir, MANIFEST_FILENAME), manifest.to_json(), self._fsync == "commit")
+
+    def _abort(self, staging_dir: str, session_dir: str):
+        """Move a session that failed to save out of the dataset tree."""
+        try:
+            if not os.path.isdir(staging_dir):
+                # Nothing was staged; resolve the pending journal entry, as recovery would
+                self._journal.quarantined(session_dir, staging_dir, "")
+                return
+            target = self._journal.quarantine(session_dir, staging_dir)
+            print(f"Incomplete session moved to {target}")
+        except OSError as e:
+            # Left pending in the journal; recovery retries on the next start
+            print(f"Warning: Could not quarantine {staging_dir}: {e}")
+
+    def _get_encoder(self) -> Executor:
+        with self._encoder_lock:
+            if self._encoder is None:
+                if self._encoder_mode == "process":
+                    self._encoder = ProcessPoolExecutor(
+                        max_workers=self._encoder_workers, mp_context=mp.get_context("spawn")
+                    )
+                else:
+                    self._encoder = ThreadPoolExecutor(
+                        max_workers=self._encoder_workers, thread_name_prefix="image-encoder"
+                    )
+            return self._encoder
+
+    @staticmethod
+    def _load_point_cloud_builder(config) -> PointCloudBuilder:
+        """Build the point cloud builder from the `storage.point_cloud` config section."""
+        crop = config.get('storage.point_cloud.crop', {}) or {}
+        crop_enabled = bool(crop.get('enabled', False))
+        outliers = config.get('storage.point_cloud.outlier_removal', {}) or {}
+        return PointCloudBuilder(
+            min_depth_m=float(config.get('storage.point_cloud.min_depth_m', 0.1)),
+            max_depth_m=float(config.get('storage.point_cloud.max_depth_m', 0.0)),
+            drop_invalid=bool(config.get('storage.point_cloud.drop_invalid', True)),
+            outlier_std_ratio=float(outliers.get('std_ratio', 2.0)) if outliers.get('enabled', False) else 0.0,
+            crop_min=crop.get('min') if crop_enabled else None,
+            crop_max=crop.get('max') if crop_enabled else None,
+            voxel_size_m=float(config.get('storage.point_cloud.voxel_size_m', 0.0)),
+        )
+
+    @staticmethod
+    def _depth_millimeters(image: Union[DepthMap, np.ndarray]) -> np.ndarray:
+        """Get a depth image as uint16 millimeters."""
+        if isinstance(image, DepthMap):
+            # Native sensor units are written as-is when they are already millimeters
+            return image.millimeters
 
-    def _save_depth_image(self, path: str, image: np.ndarray):
-        """Helper function to save a depth image, converting from float meters to uint16 millimeters."""
         # Handle potential NaN/inf values
         safe_depth = np.nan_to_num(image, nan=0.0, posinf=0.0, neginf=0.0)
         
         # If the depth image is float, assume it's in meters and convert to uint16 millimeters
         if np.issubdtype(safe_depth.dtype, np.floating):
-            depth_mm = np.clip(safe_depth * 1000, 0, 65535).astype("uint16")
-        else:
-            depth_mm = safe_depth.astype("uint16")
-            
-        self._save_image_unicode(path, depth_mm)
+            return np.clip(safe_depth * 1000, 0, 65535).astype("uint16")
+        return safe_depth.astype("uint16")
 
-    def _save_image_unicode(self, path: str, image: np.ndarray):
-        """Saves an image to a path that may contain Unicode characters."""
-        try:
-            is_success, buffer = cv2.imencode(os.path.splitext(path)[1], image)
-            if is_success:
-                with open(path, "wb") as f:
-                    f.write(buffer)
-            else:
-                print(f"Failed to encode image for path: {path}")
-        except Exception as e:
-            print(f"Error saving image to {path}: {e}")
-
-    def _save_placeholder_ply(self, path: str):
-        """Saves a placeholder PLY file."""
-        header = """ply
-format ascii 1.0
-element vertex 0
-property float x
-property float y
-property float z
-end_header
-"""
-        with open(path, 'w') as f:
-            f.write(header)
-
-    def _create_session_directory(self, metadata: CaptureMetadata) -> str:
-        """Create the directory for the current capture session."""
+    @staticmethod
+    def _write_file(path: str, data, fsync: bool = False) -> float:
+        """Write encoded bytes to a path that may contain Unicode characters; return the time taken."""
+        start = time.perf_counter()
+        with open(path, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        return time.perf_counter() - start
+
+    def _session_directory(self, metadata: CaptureMetadata) -> str:
+        """Get the directory of the current capture session."""
         date_str = datetime.now().strftime("%Y%m%d")
         dir_path = os.path.join(
             self._root_dir,
@@ -110,5 +654,4 @@ end_header
             metadata.background_id,
             f"seq_{metadata.sequence_number:03d}",
         )
-        os.makedirs(dir_path, exist_ok=True)
         return dir_path
@@ -0,0 +1,198 @@
+"""
+Small JPEG previews of a session for browsing the dataset.
+
+Each session can have a thumbnails/ directory next to its frame files:
+
+    thumbnails/<camera_id>_rgb.jpg      the color image, downscaled
+    thumbnails/<camera_id>_depth.jpg    the depth map, colormapped over a fixed range
+    thumbnails/contact_sheet.jpg        one row per camera: color and depth side by side
+
+StorageService renders them from the arrays it is saving, so there is no
+decode; `python -m src.tools.thumbnails` backfills existing sessions and
+adds the files to the session's checksum manifest, if it has one. The
+file names do not match the frame file pattern, so readers and the
+catalog ignore them.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.services.checksums import SessionManifest
+from src.services.dataset_reader import read_capture
+from src.services.exceptions import StorageError
+
+THUMBNAIL_DIRNAME = "thumbnails"
+CONTACT_SHEET_FILENAME = "contact_sheet.jpg"
+THUMBNAIL_STREAMS = ("rgb", "depth")
+
+# One camera's images for a contact sheet: (camera_id, BGR image, depth in millimeters)
+CameraView = Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]
+
+
+@dataclass(frozen=True)
+class ThumbnailSettings:
+    """How thumbnails are rendered."""
+    max_size: int = 320  # longer side in pixels
+    jpeg_quality: int = 80
+    depth_min_mm: int = 100  # depth colormap range, fixed so thumbnails are comparable across sessions
+    depth_max_mm: int = 5000
+    contact_sheet: bool = True
+
+    @classmethod
+    def from_config(cls, config) -> "ThumbnailSettings":
+        """Read the `storage.thumbnails` config section."""
+        section = config.get('storage.thumbnails', {}) or {}
+        return cls(
+            max_size=int(section.get('max_size', 320)),
+            jpeg_quality=int(section.get('jpeg_quality', 80)),
+            depth_min_mm=int(float(section.get('depth_min_m', 0.1)) * 1000),
+            depth_max_mm=int(float(section.get('depth_max_m', 5.0)) * 1000),
+            contact_sheet=bool(section.get('contact_sheet', True)),
+        )
+
+
+def thumbnail_filename(camera_id: str, stream: str) -> str:
+    return f"{camera_id}_{stream}.jpg"
+
+
+def _downscale(image: np.ndarray, max_size: int, interpolation: int) -> np.ndarray:
+    height, width = image.shape[:2]
+    scale = max_size / max(height, width)
+    if scale >= 1.0:
+        return image
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=interpolation)
+
+
+def colorize_depth(depth_mm: np.ndarray, min_mm: int, max_mm: int) -> np.ndarray:
+    """Map millimeter depth onto the JET colormap (as in the live preview); pixels without depth are black."""
+    scale = 255.0 / max(1, max_mm - min_mm)
+    normalized = cv2.convertScaleAbs(np.clip(depth_mm, min_mm, max_mm), alpha=scale, beta=-min_mm * scale)
+    colored = cv2.applyColorMap(normalized, cv2.COLORMAP_JET)
+    colored[depth_mm == 0] = 0
+    return colored
+
+
+def rgb_thumbnail(image: np.ndarray, settings: ThumbnailSettings) -> np.ndarray:
+    return _downscale(image, settings.max_size, cv2.INTER_AREA)
+
+
+def depth_thumbnail(depth_mm: np.ndarray, settings: ThumbnailSettings) -> np.ndarray:
+    # Nearest neighbor, so missing depth is not averaged into false near values
+    small = _downscale(depth_mm, settings.max_size, cv2.INTER_NEAREST)
+    return colorize_depth(small, settings.depth_min_mm, settings.depth_max_mm)
+
+
+def contact_sheet(views: List[CameraView], settings: ThumbnailSettings) -> np.ndarray:
+    """Tile the cameras' thumbnails, one row per camera, each row labeled with its camera ID."""
+    rows = []
+    for camera_id, rgb, depth_mm in views:
+        tiles = []
+        if rgb is not None:
+            tiles.append(rgb_thumbnail(rgb, settings))
+        if depth_mm is not None:
+            tiles.append(depth_thumbnail(depth_mm, settings))
+        if not tiles:
+            continue
+        height = tiles[0].shape[0]
+        tiles = [tile if tile.shape[0] == height else
+                 cv2.resize(tile, (max(1, round(tile.shape[1] * height / tile.shape[0])), height))
+                 for tile in tiles]
+        row = np.hstack([_bgr(tile) for tile in tiles])
+        cv2.putText(row, camera_id, (6, 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 3, cv2.LINE_AA)
+        cv2.putText(row, camera_id, (6, 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+        rows.append(row)
+    if not rows:
+        raise StorageError("No images for a contact sheet")
+    width = max(row.shape[1] for row in rows)
+    return np.vstack([np.pad(row, ((0, 0), (0, width - row.shape[1]), (0, 0))) for row in rows])
+
+
+def encode_jpeg(image: np.ndarray, quality: int) -> bytes:
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise StorageError("JPEG encoding of a thumbnail failed")
+    return buffer.tobytes()
+
+
+def encode_thumbnail(settings: ThumbnailSettings, stream: str, image: np.ndarray) -> Tuple[bytes, float, None]:
+    """
+    Render and encode one thumbnail; same contract as `encode_image` so it
+    runs on the StorageService encoder pool.
+
+    Returns:
+        The JPEG bytes, the time in seconds and no point cloud stats.
+    """
+    start = time.perf_counter()
+    thumbnail = depth_thumbnail(image, settings) if stream == "depth" else rgb_thumbnail(image, settings)
+    return encode_jpeg(thumbnail, settings.jpeg_quality), time.perf_counter() - start, None
+
+
+def encode_contact_sheet(settings: ThumbnailSettings, views: List[CameraView]) -> Tuple[bytes, float, None]:
+    """Render and encode a session's contact sheet, for the encoder pool like `encode_thumbnail`."""
+    start = time.perf_counter()
+    buffer = encode_jpeg(contact_sheet(views, settings), settings.jpeg_quality)
+    return buffer, time.perf_counter() - start, None
+
+
+def generate_session_thumbnails(root_dir: str, session_dir: str, settings: ThumbnailSettings,
+                                overwrite: bool = False) -> int:
+    """
+    Decode a saved session and write its thumbnails directory. The files are
+    added to the session's checksum manifest, replacing earlier digests.
+
+    Returns:
+        The number of files written; 0 if the session already has thumbnails
+        (unless `overwrite`) or no color or depth images
+
+    Raises:
+        StorageError: If a file cannot be decoded or written
+    """
+    thumbnail_dir = os.path.join(session_dir, THUMBNAIL_DIRNAME)
+    if not overwrite and os.path.isdir(thumbnail_dir):
+        return 0
+    record = read_capture(root_dir, session_dir)
+    if record is None:
+        return 0
+
+    files: List[Tuple[str, bytes]] = []
+    views: List[CameraView] = []
+    for frame in record.frames:
+        rgb = frame.load("rgb") if "rgb" in frame.paths else None
+        depth_mm = frame.load("depth") if "depth" in frame.paths else None
+        for stream, image in (("rgb", rgb), ("depth", depth_mm)):
+            if image is not None:
+                files.append((thumbnail_filename(frame.camera_id, stream),
+                              encode_thumbnail(settings, stream, image)[0]))
+        views.append((frame.camera_id, rgb, depth_mm))
+        frame.unload()
+    if not files:
+        return 0
+    if settings.contact_sheet:
+        files.append((CONTACT_SHEET_FILENAME, encode_contact_sheet(settings, views)[0]))
+
+    manifest = SessionManifest.load(session_dir)
+    try:
+        os.makedirs(thumbnail_dir, exist_ok=True)
+        for name, data in files:
+            path = os.path.join(thumbnail_dir, name)
+            # Replaced atomically, so a browser never shows a half-written thumbnail
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+            if manifest is not None:
+                manifest.add(f"{THUMBNAIL_DIRNAME}/{name}", data)
+        if manifest is not None:
+            manifest.save(session_dir)
+    except OSError as e:
+        raise StorageError(f"Could not write thumbnails: {e}", path=thumbnail_dir)
+    return len(files)
+
+
+def _bgr(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image
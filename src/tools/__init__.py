@@ -0,0 +1,10 @@
+"""
+Command line tools for MultiCamCollector, run from the project root with
+`python -m src.tools.<tool>`.
+"""
+
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Same location the application saves to (see MainWindowController)
+DEFAULT_DATASET_ROOT = os.path.join(os.path.dirname(PROJECT_ROOT), "the-dataset")
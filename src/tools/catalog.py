@@ -0,0 +1,63 @@
+"""
+Capture catalog tool.
+
+Usage:
+    python -m src.tools.catalog rebuild [--root D:/the-dataset] [--workers 16]
+    python -m src.tools.catalog summary
+    python -m src.tools.catalog sessions --lighting Dark --background bg_01 --from 20250101
+"""
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from src.services.capture_catalog import CaptureCatalog
+from src.tools import DEFAULT_DATASET_ROOT
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and query the SQLite capture catalog.")
+    parser.add_argument("--root", default=DEFAULT_DATASET_ROOT, help="Dataset root directory")
+    parser.add_argument("--db", default=None, help="Catalog file (default: <root>/catalog.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild", help="Re-index every session under the root")
+    rebuild.add_argument("--workers", type=int, default=16, help="Parallel directory scanners")
+
+    commands.add_parser("summary", help="Session counts per lighting level and background")
+
+    sessions = commands.add_parser("sessions", help="List matching sessions")
+    sessions.add_argument("--lighting")
+    sessions.add_argument("--background")
+    sessions.add_argument("--camera")
+    sessions.add_argument("--from", dest="date_from", help="First date, YYYYMMDD")
+    sessions.add_argument("--to", dest="date_to", help="Last date, YYYYMMDD")
+    sessions.add_argument("--count", action="store_true", help="Only print the number of sessions")
+    args = parser.parse_args(argv)
+
+    catalog = CaptureCatalog(args.root, args.db)
+    try:
+        if args.command == "rebuild":
+            catalog.rebuild(workers=args.workers)
+        elif args.command == "summary":
+            for row in catalog.summary():
+                print(f"{row['lighting']:<10} {row['background_id']:<24} {row['sessions']:>8} sessions "
+                      f"{row['files']:>10} files {row['bytes'] / 1e9:>10.2f} GB")
+        elif args.command == "sessions":
+            filters = dict(lighting=args.lighting, background_id=args.background, camera_id=args.camera,
+                           date_from=args.date_from, date_to=args.date_to)
+            start = time.perf_counter()
+            if args.count:
+                print(catalog.count_sessions(**filters))
+            else:
+                for record in catalog.sessions(**filters):
+                    print(f"{record.session_dir}  {record.num_files} files  {record.total_bytes / 1e6:.1f} MB")
+            print(f"Query took {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+    finally:
+        catalog.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
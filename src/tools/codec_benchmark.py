@@ -0,0 +1,305 @@
+"""
+Codec microbenchmark.
+
+Measures encode speed, decode speed and compression ratio of each codec on
+sample frames, per stream, and suggests a `storage.streams` config for a
+given disk bandwidth.
+
+Usage:
+    python -m src.tools.codec_benchmark                      # frames from a MockCamera
+    python -m src.tools.codec_benchmark --dataset D:/the-dataset/20250101
+    python -m src.tools.codec_benchmark --codecs png:png_level=1 png:png_level=6 tiff:tiff=deflate
+    python -m src.tools.codec_benchmark --verify             # round-trip checks of the lossless codecs
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.services.codecs import Codec, codec_for_extension, create_codec
+
+DEFAULT_CODEC_SPECS = [
+    "png:png_level=1",
+    "png:png_level=6",
+    "webp",
+    "jpeg",
+    "tiff:tiff=lzw",
+    "tiff:tiff=deflate",
+    "npy",
+    "rvl",
+]
+
+# File name suffix of each stream in a dataset session
+DATASET_STREAM_PATTERNS = {
+    "rgb": "*_rgb.*",
+    "depth": "*_depth.*",
+    "raw_depth": "*_depth_raw.*",
+}
+
+
+@dataclass
+class CodecResult:
+    """Benchmark figures of one codec on one stream."""
+    stream: str
+    codec: str
+    spec: str
+    lossless: bool
+    exact: bool
+    encode_ms: float
+    decode_ms: float
+    encode_mbps: float
+    ratio: float
+    encoded_kb: float
+
+    def cost_ms(self, disk_mbps: float) -> float:
+        """Estimated time to store one frame: encoding plus writing the encoded bytes."""
+        return self.encode_ms + self.encoded_kb / 1000.0 / disk_mbps * 1000.0
+
+
+def _split_spec(spec: str):
+    name, _, option_str = spec.partition(":")
+    options = {}
+    for item in filter(None, option_str.split(",")):
+        key, _, value = item.partition("=")
+        options[key.strip()] = value.strip()
+    return name, options
+
+
+def parse_codec_spec(spec: str) -> Codec:
+    """Create a codec from "name" or "name:option=value,option=value"."""
+    name, options = _split_spec(spec)
+    return create_codec({"codec": name, **options})
+
+
+def spec_to_config(spec: str) -> str:
+    """Format a codec spec as a `storage.streams` config value."""
+    name, options = _split_spec(spec)
+    if not options:
+        return f'"{name}"'
+    items = ", ".join(f"{key}: {value}" for key, value in options.items())
+    return f'{{codec: "{name}", {items}}}'
+
+
+def mock_samples(num_frames: int) -> Dict[str, List[np.ndarray]]:
+    """Capture sample frames from a MockCamera."""
+    from src.services.mock_camera import MockCamera
+
+    camera = MockCamera("benchmark")
+    camera.connect()
+    samples = {"rgb": [], "depth": []}
+    try:
+        for _ in range(num_frames):
+            frame = camera.capture_frame()
+            samples["rgb"].append(frame.rgb_image.copy())
+            samples["depth"].append(frame.depth.millimeters.copy())
+            frame.release()
+    finally:
+        camera.disconnect()
+    return samples
+
+
+def dataset_samples(dataset_dir: str, num_frames: int) -> Dict[str, List[np.ndarray]]:
+    """Load up to `num_frames` images per stream from a dataset directory tree."""
+    samples = {}
+    for stream, pattern in DATASET_STREAM_PATTERNS.items():
+        paths = sorted(glob.glob(os.path.join(dataset_dir, "**", pattern), recursive=True))
+        if stream == "depth":
+            paths = [p for p in paths if "_depth_raw." not in p]
+        images = []
+        for path in paths[:num_frames]:
+            image = _read_image(path)
+            if image is not None:
+                images.append(image)
+        if images:
+            samples[stream] = images
+    return samples
+
+
+def _read_image(path: str) -> Optional[np.ndarray]:
+    try:
+        codec = codec_for_extension(os.path.splitext(path)[1])
+        # Reading the bytes ourselves handles non-ASCII paths on Windows
+        with open(path, "rb") as f:
+            return codec.decode(f.read())
+    except Exception as e:
+        print(f"Skipping {path}: {e}")
+        return None
+
+
+def benchmark_codec(stream: str, spec: str, codec: Codec, images: List[np.ndarray], repeat: int) -> CodecResult:
+    """Encode and decode every image `repeat` times and collect median timings."""
+    encode_times, decode_times = [], []
+    raw_bytes = encoded_bytes = 0
+    exact = True
+    for image in images:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = codec.encode(image)
+            encode_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            decoded = codec.decode(data)
+            decode_times.append(time.perf_counter() - start)
+        raw_bytes += image.nbytes
+        encoded_bytes += len(data)
+        exact = exact and decoded.shape == image.shape and np.array_equal(decoded, image)
+
+    encode_s = statistics.median(encode_times)
+    return CodecResult(
+        stream=stream,
+        codec=codec.describe(),
+        spec=spec,
+        lossless=codec.lossless,
+        exact=exact,
+        encode_ms=encode_s * 1000,
+        decode_ms=statistics.median(decode_times) * 1000,
+        encode_mbps=(raw_bytes / len(images)) / 1e6 / encode_s if encode_s > 0 else float("inf"),
+        ratio=raw_bytes / encoded_bytes if encoded_bytes else 0.0,
+        encoded_kb=encoded_bytes / len(images) / 1000,
+    )
+
+
+def run_benchmark(samples: Dict[str, List[np.ndarray]], specs: List[str], repeat: int) -> List[CodecResult]:
+    codecs = [(spec, parse_codec_spec(spec)) for spec in specs]
+    results = []
+    for stream, images in samples.items():
+        for spec, codec in codecs:
+            if not codec.supports(images[0].dtype):
+                continue
+            try:
+                results.append(benchmark_codec(stream, spec, codec, images, repeat))
+            except Exception as e:
+                print(f"Skipping {codec.describe()} on {stream}: {e}")
+    return results
+
+
+def verification_cases() -> Dict[str, np.ndarray]:
+    """Depth maps covering the edge cases of run-length and delta coding."""
+    rng = np.random.default_rng(0)
+    smooth = (np.add.outer(np.arange(480), np.arange(640)) + 500).astype(np.uint16)
+    holes = smooth.copy()
+    holes[rng.random(holes.shape) < 0.3] = 0
+    holes[100:200, 300:400] = 0
+    alternating = np.zeros((4, 9), dtype=np.uint16)
+    alternating[:, 1::2] = 65535
+    edge_nonzero = np.zeros((5, 5), dtype=np.uint16)
+    edge_nonzero[0, 0] = edge_nonzero[-1, -1] = 1
+    return {
+        "all zero": np.zeros((48, 64), dtype=np.uint16),
+        "all max": np.full((48, 64), 65535, dtype=np.uint16),
+        "single pixel": np.array([[1234]], dtype=np.uint16),
+        "single row": rng.integers(0, 65536, (1, 97), dtype=np.uint16),
+        "single column": rng.integers(0, 65536, (97, 1), dtype=np.uint16),
+        "alternating 0/65535": alternating,
+        "non-zero corners": edge_nonzero,
+        "smooth": smooth,
+        "smooth with holes": holes,
+        "noise with holes": np.where(rng.random((480, 640)) < 0.2, 0,
+                                     rng.integers(1, 65536, (480, 640))).astype(np.uint16),
+        "non-contiguous view": holes[::2, ::3],
+    }
+
+
+def verify(specs: List[str]) -> int:
+    """Round-trip every lossless codec over the verification cases; returns the failure count."""
+    failures = 0
+    for spec in specs:
+        codec = parse_codec_spec(spec)
+        if not (codec.lossless and codec.supports(np.uint16)):
+            continue
+        for name, depth in verification_cases().items():
+            try:
+                decoded = codec.decode(codec.encode(depth))
+                ok = decoded.dtype == depth.dtype and np.array_equal(decoded, depth)
+                error = "" if ok else "decoded data differs"
+            except Exception as e:
+                ok, error = False, str(e)
+            failures += not ok
+            print(f"{'PASS' if ok else 'FAIL'}  {codec.describe():<22} {name}{'  ' + error if error else ''}")
+    return failures
+
+
+def recommend(results: List[CodecResult], disk_mbps: float) -> Dict[str, str]:
+    """Pick the lossless codec with the lowest encode + write cost for each stream."""
+    best = {}
+    for result in results:
+        if not (result.lossless and result.exact):
+            continue
+        current = best.get(result.stream)
+        if current is None or result.cost_ms(disk_mbps) < current.cost_ms(disk_mbps):
+            best[result.stream] = result
+    return {stream: spec_to_config(result.spec) for stream, result in best.items()}
+
+
+def print_table(results: List[CodecResult], disk_mbps: float) -> None:
+    header = f"{'stream':<10} {'codec':<22} {'encode ms':>10} {'decode ms':>10} {'MB/s':>8} {'ratio':>7} {'KB':>8} {'cost ms':>8}  exact"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.stream:<10} {r.codec:<22} {r.encode_ms:>10.1f} {r.decode_ms:>10.1f} {r.encode_mbps:>8.0f} "
+            f"{r.ratio:>7.2f} {r.encoded_kb:>8.0f} {r.cost_ms(disk_mbps):>8.1f}  {'yes' if r.exact else 'no'}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark storage codecs on sample frames.")
+    parser.add_argument("--dataset", help="Dataset directory to sample frames from (default: MockCamera frames)")
+    parser.add_argument("--frames", type=int, default=5, help="Sample frames per stream")
+    parser.add_argument("--repeat", type=int, default=3, help="Encode/decode repetitions per frame")
+    parser.add_argument("--codecs", nargs="+", default=None,
+                        help="Codec specs such as png:png_level=3 or tiff:tiff=deflate")
+    parser.add_argument("--disk-mbps", type=float, default=200.0,
+                        help="Disk write bandwidth in MB/s used to rank codecs")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+    parser.add_argument("--verify", action="store_true",
+                        help="Only check that the lossless depth codecs round-trip edge cases exactly")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        failures = verify(args.codecs or DEFAULT_CODEC_SPECS)
+        print(f"{failures} failures")
+        return 1 if failures else 0
+
+    disk_mbps = args.disk_mbps
+    specs = args.codecs or DEFAULT_CODEC_SPECS
+
+    if args.dataset:
+        samples = dataset_samples(args.dataset, args.frames)
+        source = args.dataset
+    else:
+        samples = mock_samples(args.frames)
+        source = "MockCamera"
+    if not samples:
+        print(f"No sample frames found in {source}")
+        return 1
+
+    print(f"Benchmarking {len(specs)} codecs on {source} "
+          f"({', '.join(f'{len(v)} {k}' for k, v in samples.items())} frames, disk {disk_mbps:.0f} MB/s)")
+    results = run_benchmark(samples, specs, max(1, args.repeat))
+    print_table(results, disk_mbps)
+
+    suggestion = recommend(results, disk_mbps)
+    if suggestion:
+        print("\nSuggested config.yaml settings:")
+        print("storage:\n  streams:")
+        for stream, codec in suggestion.items():
+            print(f"    {stream}: {codec}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "disk_mbps": disk_mbps, "results": [asdict(r) for r in results],
+                       "suggested_streams": suggestion}, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
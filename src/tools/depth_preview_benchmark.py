@@ -0,0 +1,120 @@
+"""
+Depth preview rendering benchmark.
+
+Times the ways a depth frame can be turned into a preview image and checks
+that the lookup table path draws the same pixels as the colormap chain the
+preview used before it (on float32 meters, truncated to uint8):
+
+    original     meters, clip, normalize, colormap and BGR->RGB at full resolution, then resize
+    scaled       resize first (nearest neighbor), then the same chain
+    lut          resize first, then DepthColorizer (one table lookup, RGBX output)
+    lut-*        the lookup table path with the "percentile" and "fixed" ranges
+
+Usage:
+    python -m src.tools.depth_preview_benchmark                     # frames from a MockCamera
+    python -m src.tools.depth_preview_benchmark --dataset D:/the-dataset/20250101 --target 424x240 --target full
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.models.camera import DepthMap
+from src.services.depth_colorizer import DepthColorizer
+from src.services.preview_renderer import PreviewRenderer, fit_size
+from src.tools.codec_benchmark import dataset_samples, mock_samples
+
+DEPTH_SCALE = 0.001  # sample depth is read back in millimeters
+MIN_M, MAX_M = 0.1, 5.0
+
+
+def colormap_chain(depth: np.ndarray) -> np.ndarray:
+    """The colormap chain the preview used before the lookup table, on depth in meters."""
+    clipped = np.clip(DepthMap(depth, DEPTH_SCALE).meters, MIN_M, MAX_M)
+    normalized = cv2.normalize(clipped, None, 0, 255, cv2.NORM_MINMAX)
+    colored = cv2.applyColorMap(normalized.astype(np.uint8), cv2.COLORMAP_JET)
+    return cv2.cvtColor(colored, cv2.COLOR_BGR2RGB)
+
+
+def _resize(image: np.ndarray, target: Optional[Tuple[int, int]], interpolation: int) -> np.ndarray:
+    size = fit_size((image.shape[1], image.shape[0]), target)
+    if size == (image.shape[1], image.shape[0]):
+        return image
+    return cv2.resize(image, size, interpolation=interpolation)
+
+
+def render_paths() -> Dict[str, Callable[[np.ndarray, Optional[Tuple[int, int]]], np.ndarray]]:
+    renderers = {
+        mode: PreviewRenderer(DepthColorizer(mode=mode, min_m=MIN_M, max_m=MAX_M))
+        for mode in ("minmax", "percentile", "fixed")
+    }
+    return {
+        "original": lambda d, target: _resize(colormap_chain(d), target, cv2.INTER_LINEAR),
+        "scaled": lambda d, target: colormap_chain(_resize(d, target, cv2.INTER_NEAREST)),
+        "lut": lambda d, target: renderers["minmax"].render_depth(d, DEPTH_SCALE, target),
+        "lut-percentile": lambda d, target: renderers["percentile"].render_depth(d, DEPTH_SCALE, target),
+        "lut-fixed": lambda d, target: renderers["fixed"].render_depth(d, DEPTH_SCALE, target),
+    }
+
+
+def parse_target(text: str) -> Optional[Tuple[int, int]]:
+    """Parse "WxH", or "full" for no scaling."""
+    if text == "full":
+        return None
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark depth preview rendering paths.")
+    parser.add_argument("--dataset", help="Dataset directory to sample depth frames from (default: MockCamera frames)")
+    parser.add_argument("--frames", type=int, default=5, help="Sample frames")
+    parser.add_argument("--repeat", type=int, default=50, help="Renders per frame and path")
+    parser.add_argument("--target", action="append", dest="targets",
+                        help="Label size WxH or 'full'; may be repeated (default: full and 424x240)")
+    args = parser.parse_args(argv)
+
+    samples = (dataset_samples(args.dataset, args.frames) if args.dataset else mock_samples(args.frames)).get("depth")
+    if not samples:
+        print(f"No sample depth frames found in {args.dataset or 'MockCamera'}")
+        return 1
+    targets = [parse_target(t) for t in (args.targets or ["full", "424x240"])]
+    paths = render_paths()
+
+    print(f"{len(samples)} depth frames of {samples[0].shape[1]}x{samples[0].shape[0]}, {args.repeat} renders each")
+    header = f"{'target':<10} {'path':<16} {'mean ms':>8} {'median ms':>10} {'speedup':>8}  same as scaled"
+    print(header)
+    print("-" * len(header))
+    mismatches = 0
+    for target in targets:
+        reference = [paths["scaled"](depth, target) for depth in samples]
+        baseline = None
+        for name, render in paths.items():
+            times = []
+            for depth in samples:
+                render(depth, target)  # warm up caches
+                for _ in range(max(1, args.repeat)):
+                    start = time.perf_counter()
+                    render(depth, target)
+                    times.append((time.perf_counter() - start) * 1000)
+            mean = statistics.mean(times)
+            baseline = baseline or mean
+            same = ""
+            if name in ("scaled", "lut"):
+                differing = sum(int(np.any(render(d, target)[..., :3] != ref, axis=2).sum())
+                                for d, ref in zip(samples, reference))
+                mismatches += differing
+                same = "yes" if differing == 0 else f"no ({differing} pixels differ)"
+            label = "full" if target is None else f"{target[0]}x{target[1]}"
+            print(f"{label:<10} {name:<16} {mean:>8.2f} {statistics.median(times):>10.2f} "
+                  f"{baseline / mean:>7.1f}x  {same}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
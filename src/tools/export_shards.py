@@ -0,0 +1,61 @@
+"""
+Sharded tar export (WebDataset layout).
+
+Writes every matching capture as one sample into size-bounded tar shards
+for training pipelines. Running it again with the same --out resumes an
+interrupted export: samples in completed shards are skipped.
+
+Usage:
+    python -m src.tools.export_shards --out E:/shards [--root D:/the-dataset] --shard-size-mb 1024 --writers 4
+    python -m src.tools.export_shards --out E:/shards-dark --lighting Dark --streams rgb depth
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from src.services.dataset_reader import DatasetReader
+from src.services.shard_export import ShardExporter
+from src.tools import DEFAULT_DATASET_ROOT
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export captures into WebDataset-style tar shards.")
+    parser.add_argument("--root", default=DEFAULT_DATASET_ROOT, help="Dataset root directory")
+    parser.add_argument("--out", required=True, help="Shard directory; an existing export there is resumed")
+    parser.add_argument("--lighting")
+    parser.add_argument("--background")
+    parser.add_argument("--camera", action="append", dest="cameras", help="Camera ID; may be repeated")
+    parser.add_argument("--from", dest="date_from", help="First date, YYYYMMDD")
+    parser.add_argument("--to", dest="date_to", help="Last date, YYYYMMDD")
+    parser.add_argument("--streams", nargs="*", default=None, help="Streams to export (default: all)")
+    parser.add_argument("--shard-size-mb", type=float, default=1024, help="Target maximum shard size")
+    parser.add_argument("--max-samples", type=int, default=0, help="Maximum samples per shard (0: no limit)")
+    parser.add_argument("--writers", type=int, default=4, help="Shards written in parallel")
+    parser.add_argument("--no-catalog", action="store_true", help="Scan the tree even if a catalog exists")
+    args = parser.parse_args(argv)
+
+    # Nothing is decoded: the encoded files are copied into the shards as saved
+    reader = DatasetReader(
+        args.root, lighting=args.lighting, background_id=args.background, date_from=args.date_from,
+        date_to=args.date_to, camera_ids=args.cameras, streams=None, use_catalog=not args.no_catalog,
+    )
+    exporter = ShardExporter(
+        args.out, args.root, max_shard_bytes=int(args.shard_size_mb * 1e6), max_samples=args.max_samples,
+        writers=args.writers, streams=args.streams,
+    )
+    try:
+        for record in reader:
+            exporter.submit(record)
+    finally:
+        summary = exporter.close()
+
+    if summary.samples == 0 and summary.skipped == 0:
+        print(f"No matching captures in {args.root}")
+        return 1
+    print(f"Exported to {args.out}: {summary.summary()}")
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Preview painting benchmark.
+
+Times what the GUI thread spends per displayed frame to put rendered
+preview images on screen, for a grid of cameras with two images each:
+
+    label     QImage -> QPixmap.fromImage -> QLabel.setPixmap, then repaint
+    canvas    FrameCanvas.set_image (a QImage header over the array), then repaint
+
+Frames are rendered once up front, like the frame workers do, so only the
+GUI-thread part is measured. Runs offscreen unless QT_QPA_PLATFORM is set.
+
+Usage:
+    python -m src.tools.preview_paint_benchmark
+    python -m src.tools.preview_paint_benchmark --size 640x360 --size 1280x720 --cameras 1 --cameras 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+def sample_images(size: Tuple[int, int], frames: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Rendered-looking (RGB888, RGBX8888) pairs of noise, so no two frames are alike."""
+    width, height = size
+    rng = np.random.default_rng(0)
+    return [(rng.integers(0, 256, (height, width, 3), dtype=np.uint8),
+             rng.integers(0, 256, (height, width, 4), dtype=np.uint8))
+            for _ in range(frames)]
+
+
+def label_path(widgets) -> Callable[[np.ndarray, np.ndarray], None]:
+    """The QLabel/QPixmap path the preview used before FrameCanvas."""
+    from PyQt6.QtGui import QImage, QPixmap
+
+    from src.gui.widgets.frame_canvas import image_format
+
+    def show(rgb: np.ndarray, depth: np.ndarray):
+        for i in range(0, len(widgets), 2):
+            for label, image in ((widgets[i], rgb), (widgets[i + 1], depth)):
+                h, w = image.shape[:2]
+                q_img = QImage(image.data, w, h, image.strides[0], image_format(image))
+                label.setPixmap(QPixmap.fromImage(q_img))
+    return show
+
+
+def canvas_path(widgets) -> Callable[[np.ndarray, np.ndarray], None]:
+    def show(rgb: np.ndarray, depth: np.ndarray):
+        for i in range(0, len(widgets), 2):
+            widgets[i].set_image(rgb)
+            widgets[i + 1].set_image(depth)
+    return show
+
+
+def run(kind: str, size: Tuple[int, int], cameras: int, images, repeat: int) -> List[float]:
+    """Milliseconds per displayed frame of all cameras, including the repaint."""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication, QGridLayout, QLabel, QWidget
+
+    from src.gui.widgets.frame_canvas import FrameCanvas
+
+    app = QApplication.instance()
+    window = QWidget()
+    layout = QGridLayout(window)
+    layout.setSpacing(2)
+    widgets = []
+    for camera in range(cameras):
+        for stream in range(2):
+            if kind == "label":
+                widget = QLabel()
+                widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            else:
+                widget = FrameCanvas()
+            widget.setFixedSize(*size)
+            layout.addWidget(widget, camera // 2, (camera % 2) * 2 + stream)
+            widgets.append(widget)
+    window.show()
+    app.processEvents()
+    show = label_path(widgets) if kind == "label" else canvas_path(widgets)
+
+    times = []
+    for n in range(repeat + 1):
+        rgb, depth = images[n % len(images)]
+        start = time.perf_counter()
+        show(rgb, depth)
+        window.repaint()
+        app.processEvents()
+        if n:  # the first frame warms up
+            times.append((time.perf_counter() - start) * 1000)
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return times
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark painting preview frames with QLabel pixmaps vs FrameCanvas.")
+    parser.add_argument("--size", action="append", dest="sizes",
+                        help="Image size WxH; may be repeated (default: 424x240, 640x360 and 1280x720)")
+    parser.add_argument("--cameras", action="append", type=int,
+                        help="Camera count; may be repeated (default: 1, 4 and 8)")
+    parser.add_argument("--frames", type=int, default=4, help="Distinct sample frames")
+    parser.add_argument("--repeat", type=int, default=100, help="Displayed frames per case")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    sizes = [parse_size(s) for s in (args.sizes or ["424x240", "640x360", "1280x720"])]
+    camera_counts = args.cameras or [1, 4, 8]
+
+    print(f"Two images per camera, {args.repeat} displayed frames per case")
+    header = f"{'size':<10} {'cameras':>7} {'path':<7} {'mean ms':>8} {'median ms':>10} {'p95 ms':>8} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        images = sample_images(size, max(1, args.frames))
+        for cameras in camera_counts:
+            baseline = None
+            for kind in ("label", "canvas"):
+                times = run(kind, size, cameras, images, max(1, args.repeat))
+                mean = statistics.mean(times)
+                baseline = baseline or mean
+                p95 = sorted(times)[int(len(times) * 0.95) - 1] if len(times) > 1 else times[0]
+                label = f"{size[0]}x{size[1]}"
+                print(f"{label:<10} {cameras:>7} {kind:<7} {mean:>8.2f} "
+                      f"{statistics.median(times):>10.2f} {p95:>8.2f} {baseline / mean:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Thumbnail backfill for sessions saved without `storage.thumbnails`.
+
+Decodes each matching session and writes its thumbnails directory, several
+sessions in parallel. Sessions that already have thumbnails are skipped
+unless --force is given. Rendering options come from config.yaml.
+
+Usage:
+    python -m src.tools.thumbnails [--root D:/the-dataset] [--workers 8]
+    python -m src.tools.thumbnails --lighting Dark --from 20250101 --force
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import List, Optional
+
+from src.services.config_service import ConfigService
+from src.services.dataset_reader import DatasetReader
+from src.services.exceptions import StorageError
+from src.services.thumbnails import ThumbnailSettings, generate_session_thumbnails
+from src.tools import DEFAULT_DATASET_ROOT, PROJECT_ROOT
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate thumbnails for existing sessions.")
+    parser.add_argument("--root", default=DEFAULT_DATASET_ROOT, help="Dataset root directory")
+    parser.add_argument("--lighting")
+    parser.add_argument("--background")
+    parser.add_argument("--from", dest="date_from", help="First date, YYYYMMDD")
+    parser.add_argument("--to", dest="date_to", help="Last date, YYYYMMDD")
+    parser.add_argument("--workers", type=int, default=8, help="Sessions processed in parallel")
+    parser.add_argument("--max-size", type=int, default=None, help="Longer thumbnail side (default: from config)")
+    parser.add_argument("--force", action="store_true", help="Regenerate existing thumbnails")
+    parser.add_argument("--no-catalog", action="store_true", help="Scan the tree even if a catalog exists")
+    args = parser.parse_args(argv)
+
+    settings = ThumbnailSettings.from_config(ConfigService(os.path.join(PROJECT_ROOT, "config.yaml")))
+    if args.max_size:
+        settings = replace(settings, max_size=args.max_size)
+    session_dirs = DatasetReader(
+        args.root, lighting=args.lighting, background_id=args.background, date_from=args.date_from,
+        date_to=args.date_to, use_catalog=not args.no_catalog,
+    ).session_dirs()
+    if not session_dirs:
+        print(f"No matching sessions in {args.root}")
+        return 1
+
+    def backfill(session_dir: str) -> Optional[int]:
+        try:
+            return generate_session_thumbnails(args.root, session_dir, settings, overwrite=args.force)
+        except StorageError as e:
+            print(f"Error: {session_dir}: {e}")
+            return None
+
+    start = time.perf_counter()
+    # OpenCV releases the GIL while decoding and resizing, so threads scale
+    with ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="thumbnails") as pool:
+        results = list(pool.map(backfill, session_dirs))
+    elapsed = time.perf_counter() - start
+
+    written = sum(1 for r in results if r)
+    failed = sum(1 for r in results if r is None)
+    print(f"Thumbnails for {written} of {len(session_dirs)} sessions in {elapsed:.1f} s "
+          f"({len(session_dirs) - written - failed} skipped, {failed} failed)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Dataset checksum verification.
+
+Re-hashes every file of the matching sessions in a process pool and
+compares it with the session's manifest.json, reporting missing, extra and
+corrupted files. Sessions saved without checksums are reported as
+unverifiable.
+
+Usage:
+    python -m src.tools.verify [--root E:/the-dataset-copy] [--workers 8]
+    python -m src.tools.verify --date 20250101 --date 20250102
+    python -m src.tools.verify --from 20250101 --to 20250131 --quiet
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from src.services.checksums import verify_session
+from src.services.dataset_layout import iter_session_dirs
+from src.tools import DEFAULT_DATASET_ROOT
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify session files against their checksum manifests.")
+    parser.add_argument("--root", default=DEFAULT_DATASET_ROOT, help="Dataset root directory")
+    parser.add_argument("--date", action="append", dest="dates", help="Date tree, YYYYMMDD; may be repeated")
+    parser.add_argument("--from", dest="date_from", help="First date, YYYYMMDD")
+    parser.add_argument("--to", dest="date_to", help="Last date, YYYYMMDD")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Verifying processes")
+    parser.add_argument("--quiet", action="store_true", help="Only print the sessions with problems")
+    args = parser.parse_args(argv)
+
+    # The tree is scanned rather than the catalog queried: a copy may have lost or gained sessions
+    session_dirs = [
+        session_dir for session_dir in iter_session_dirs(args.root)
+        if _date_matches(os.path.relpath(session_dir, args.root).split(os.sep)[0], args)
+    ]
+    if not session_dirs:
+        print(f"No matching sessions in {args.root}")
+        return 1
+
+    start = time.perf_counter()
+    problems = unverified = files = total_bytes = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for result in pool.map(verify_session, session_dirs, chunksize=8):
+            relative = os.path.relpath(result.session_dir, args.root)
+            files += result.files
+            total_bytes += result.bytes
+            if result.error:
+                unverified += 1
+                print(f"UNVERIFIED {relative}: {result.error}")
+            elif not result.ok:
+                problems += 1
+                print(f"FAILED     {relative}: {result.summary()}")
+                for label, paths in (("missing", result.missing), ("extra", result.extra),
+                                     ("corrupted", result.corrupted)):
+                    for path in paths:
+                        print(f"    {label}: {path}")
+            elif not args.quiet:
+                print(f"OK         {relative}: {result.files} files")
+    elapsed = time.perf_counter() - start
+
+    print(f"Verified {len(session_dirs)} sessions, {files} files, {total_bytes / 1e9:.2f} GB in {elapsed:.1f} s "
+          f"({total_bytes / 1e6 / elapsed:.0f} MB/s): {problems} with problems, {unverified} without a manifest")
+    return 1 if problems else 0
+
+
+def _date_matches(date: str, args: argparse.Namespace) -> bool:
+    if args.dates and date not in args.dates:
+        return False
+    if args.date_from and date < args.date_from:
+        return False
+    return not (args.date_to and date > args.date_to)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
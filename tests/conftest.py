@@ -0,0 +1,27 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app runs from the project root (python -m src....); make `src` importable the same way
+sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture(autouse=True)
+def project_cwd(monkeypatch):
+    """ConfigService reads config.yaml from the working directory, like the app started from the project root."""
+    monkeypatch.chdir(PROJECT_ROOT)
+
+
+def make_frame(camera_id: str = "Mock_1", frame_number: int = 1, width: int = 64, height: int = 48):
+    """A small frame with a color gradient and depth holes, like MockCamera produces."""
+    from src.models.camera import DepthMap, Frame
+
+    yy, xx = np.mgrid[0:height, 0:width]
+    rgb = np.stack([xx * 4 % 256, yy * 5 % 256, (xx + yy) % 256], axis=2).astype(np.uint8)
+    depth = (1000 + xx * 3 + yy * 2).astype(np.uint16)
+    depth[::7, ::5] = 0
+    return Frame(camera_id, frame_number, frame_number * 33_000_000, rgb, DepthMap(depth), DepthMap(depth.copy()))
@@ -0,0 +1,33 @@
+import numpy as np
+
+from conftest import make_frame
+from src.services.camera_process import CameraProcessHandle, publish_frame
+from src.services.shared_frame_transport import SharedFrameRing, SlotLayout
+
+
+def test_long_lived_lease_does_not_block_the_ring():
+    handle = CameraProcessHandle({"camera_id": "Mock_1"}, storage_root="", buffer_capacity=2, headroom=1)
+    producer = SharedFrameRing(SlotLayout.for_frame(make_frame(), handle.num_slots))
+    handle._ring = SharedFrameRing(producer.layout, name=producer.name)
+    next_slot = 0
+
+    def publish(sequence):
+        nonlocal next_slot
+        source = make_frame(frame_number=sequence)
+        source.rgb_image[:] = sequence % 256
+        event = publish_frame(producer, handle._slots_in_use, next_slot, sequence, source)
+        assert event is not None, f"frame {sequence} dropped"
+        next_slot = event[1] + 1
+        return handle._frame_event(*event[1:])[1], source
+
+    try:
+        # Held like a frame waiting in the storage queue while the camera keeps streaming
+        held, held_source = publish(0)
+        for sequence in range(1, 4 * handle.num_slots):
+            frame, _ = publish(sequence)
+            frame.release()
+        assert np.array_equal(held.rgb_image, held_source.rgb_image)
+        held.release()
+    finally:
+        handle._close_ring()
+        producer.close()
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from src.services.depth_codec import decode_rvl, encode_rvl
+
+
+def round_trip(depth: np.ndarray) -> np.ndarray:
+    decoded = decode_rvl(encode_rvl(depth))
+    assert decoded.dtype == np.uint16
+    assert decoded.shape == depth.shape
+    return decoded
+
+
+def test_random_depth():
+    rng = np.random.default_rng(0)
+    depth = rng.integers(0, 65536, (480, 640), dtype=np.uint16)
+    depth[rng.random(depth.shape) < 0.2] = 0
+    np.testing.assert_array_equal(round_trip(depth), depth)
+
+
+def test_smooth_depth_with_holes():
+    rng = np.random.default_rng(1)
+    yy, xx = np.mgrid[0:720, 0:1280]
+    depth = (1500 + xx * 0.5 + yy * 0.3 + rng.normal(0, 2, xx.shape)).astype(np.uint16)
+    depth[100:200, 300:500] = 0
+    np.testing.assert_array_equal(round_trip(depth), depth)
+
+
+def test_all_zero():
+    depth = np.zeros((240, 424), dtype=np.uint16)
+    np.testing.assert_array_equal(round_trip(depth), depth)
+
+
+@pytest.mark.parametrize("shape", [(0,), (0, 640), (480, 0)])
+def test_empty(shape):
+    depth = np.zeros(shape, dtype=np.uint16)
+    assert round_trip(depth).size == 0
+
+
+@pytest.mark.parametrize("length", [1, 3, 7, 1001])
+def test_odd_length(length):
+    depth = np.arange(length, dtype=np.uint16) * 37
+    np.testing.assert_array_equal(round_trip(depth), depth)
+
+
+def test_max_values():
+    depth = np.full((120, 160), 65535, dtype=np.uint16)
+    depth[::2, ::3] = 0
+    depth[1::4, 1::5] = 1  # deltas of +-65534 between neighbors
+    np.testing.assert_array_equal(round_trip(depth), depth)
+
+
+def test_non_contiguous_input():
+    depth = np.arange(64 * 48, dtype=np.uint16).reshape(48, 64)[:, ::2]
+    np.testing.assert_array_equal(round_trip(depth), depth)
+
+
+def test_rejects_other_dtypes():
+    with pytest.raises(ValueError):
+        encode_rvl(np.zeros((4, 4), dtype=np.uint8))
+
+
+def test_rejects_corrupt_streams():
+    data = encode_rvl(np.arange(100, dtype=np.uint16))
+    with pytest.raises(ValueError):
+        decode_rvl(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        decode_rvl(data[:6])
+
+
+def test_decodes_rvl1_streams():
+    # Written by the earlier nibble-varint format
+    data = bytes.fromhex(
+        "52564c31020200000005000000060000000600000003000000000000002312118cd4238cabf3bffff3eed2"
+    )
+    expected = np.array([[0, 0, 1200, 1201, 1199], [0, 65535, 1, 0, 700]], dtype=np.uint16)
+    np.testing.assert_array_equal(decode_rvl(data), expected)
+
+
+@pytest.mark.parametrize("width", range(0, 18))
+def test_every_block_width(width):
+    # Deltas of +-2**width / 4 zigzag to `width` bits, so every block after the first is packed at that width
+    step = (1 << width) >> 2
+    depth = np.full(64 * 8, 30000, dtype=np.uint16)
+    depth[1::2] += step
+    np.testing.assert_array_equal(round_trip(depth), depth)
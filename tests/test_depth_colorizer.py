@@ -0,0 +1,49 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.models.camera import DepthMap
+from src.services.depth_colorizer import DepthColorizer
+
+
+def original_preview(depth: np.ndarray, depth_scale: float) -> np.ndarray:
+    """The preview's colormap chain before DepthColorizer, on depth in meters."""
+    clipped = np.clip(DepthMap(depth, depth_scale).meters, 0.1, 5.0)
+    normalized = cv2.normalize(clipped, None, 0, 255, cv2.NORM_MINMAX)
+    colored = cv2.applyColorMap(normalized.astype(np.uint8), cv2.COLORMAP_JET)
+    return cv2.cvtColor(colored, cv2.COLOR_BGR2RGB)
+
+
+def sample_depth(seed: int, depth_scale: float) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:240, 0:320]
+    meters = 0.3 + xx * 0.01 + yy * 0.005 + rng.normal(0, 0.01, xx.shape)
+    depth = np.clip(np.rint(meters / depth_scale), 0, 65535).astype(np.uint16)
+    depth[rng.random(depth.shape) < 0.05] = 0
+    return depth
+
+
+@pytest.mark.parametrize("depth_scale", [0.001, 0.00025, 0.0001])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_minmax_matches_the_original_preview(depth_scale, seed):
+    depth = sample_depth(seed, depth_scale)
+    colored = DepthColorizer().colorize(depth, depth_scale)
+    np.testing.assert_array_equal(colored[..., :3], original_preview(depth, depth_scale))
+    assert (colored[..., 3] == 255).all()
+
+
+def test_constant_depth_matches_the_original_preview():
+    for value in (0, 1500, 65535):
+        depth = np.full((48, 64), value, dtype=np.uint16)
+        colored = DepthColorizer().colorize(depth, 0.001)
+        np.testing.assert_array_equal(colored[..., :3], original_preview(depth, 0.001))
+
+
+def test_tables_are_cached_per_range_and_scale():
+    colorizer = DepthColorizer(mode="fixed")
+    depth = sample_depth(0, 0.001)
+    colorizer.colorize(depth, 0.001)
+    colorizer.colorize(depth[::2, ::2], 0.001)
+    assert len(colorizer._luts) == 1
+    colorizer.colorize(depth, 0.0001)
+    assert len(colorizer._luts) == 2
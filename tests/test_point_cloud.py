@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.models.camera import DepthMap
+from src.services.point_cloud import CameraIntrinsics, PointCloudBuilder
+
+INTRINSICS = CameraIntrinsics(width=64, height=48, fx=60.0, fy=60.0, ppx=32.0, ppy=24.0)
+
+
+def sample_depth() -> DepthMap:
+    data = np.full((48, 64), 1500, dtype=np.uint16)
+    data[:8] = 0  # 512 pixels without depth
+    data[8:12] = 6000  # 256 pixels beyond the range below
+    return DepthMap(data)
+
+
+def test_stats_count_the_returned_points():
+    cloud, stats = PointCloudBuilder(max_depth_m=5.0).build_with_stats(sample_depth(), INTRINSICS)
+    assert stats.input_points == 64 * 48 - 512
+    assert stats.output_points == len(cloud) == 64 * 48 - 512 - 256
+    assert stats.removed_points == stats.removed["depth_range"] == 256
+
+
+def test_organized_cloud_stats_count_every_pixel():
+    builder = PointCloudBuilder(max_depth_m=5.0, drop_invalid=False)
+    cloud, stats = builder.build_with_stats(sample_depth(), INTRINSICS)
+    assert len(cloud) == 64 * 48
+    assert stats.output_points == len(cloud)
+    assert stats.removed_points == 256
+    assert np.count_nonzero(cloud.points[:, 2]) == 64 * 48 - 512 - 256
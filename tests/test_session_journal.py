@@ -0,0 +1,99 @@
+import glob
+import os
+
+import pytest
+
+import src.services.session_journal as session_journal
+from conftest import make_frame
+from src.models.metadata import CaptureMetadata
+from src.models.settings import Settings
+from src.services.checksums import verify_session
+from src.services.exceptions import StorageError
+from src.services.storage_service import StorageService
+
+
+class SimulatedCrash(BaseException):
+    """Not an OSError, so StorageService does not quarantine the staging directory."""
+
+
+def interrupted_merge(moved_files: int):
+    """A _merge_dir that dies after moving metadata.json, manifest.json and some frame files."""
+    def merge(source_dir, target_dir):
+        names = sorted(os.listdir(source_dir), key=lambda n: (n not in ("metadata.json", "manifest.json"), n))
+        for name in names[:moved_files]:
+            os.replace(os.path.join(source_dir, name), os.path.join(target_dir, name))
+        raise SimulatedCrash()
+    return merge
+
+
+def crash_during_merge(root: str, monkeypatch, moved_files: int = 4) -> str:
+    storage = StorageService(root)
+    try:
+        session_dir = storage.save([make_frame("Mock_1", 1)], CaptureMetadata(), Settings())
+        with monkeypatch.context() as patch:
+            patch.setattr(session_journal, "_merge_dir", interrupted_merge(moved_files))
+            with pytest.raises(SimulatedCrash):
+                storage.save([make_frame("Mock_1", 2), make_frame("Mock_2", 2)], CaptureMetadata(), Settings())
+    finally:
+        storage.close()
+    return session_dir
+
+
+def staging_dirs(session_dir: str):
+    return glob.glob(os.path.join(os.path.dirname(session_dir), ".seq_*.tmp"))
+
+
+def test_recovery_finishes_an_interrupted_merge(tmp_path, monkeypatch):
+    session_dir = crash_during_merge(str(tmp_path), monkeypatch)
+    assert len(staging_dirs(session_dir)) == 1
+
+    storage = StorageService(str(tmp_path))
+    try:
+        result = storage.recover()
+        assert result.finished == [session_dir]
+        assert result.quarantined == []
+        assert staging_dirs(session_dir) == []
+        verified = verify_session(session_dir)
+        assert verified.ok, verified.summary()
+        assert verified.files == 3 * 3 + 1  # rgb, depth and raw_depth of three frames, plus metadata.json
+        assert len(storage.get_catalog().files(session_dir=session_dir)) == 9
+    finally:
+        storage.close()
+
+
+def test_recovery_quarantines_a_merge_with_a_corrupt_staged_file(tmp_path, monkeypatch):
+    session_dir = crash_during_merge(str(tmp_path), monkeypatch)
+    staging_dir = staging_dirs(session_dir)[0]
+    damaged = next(name for name in sorted(os.listdir(staging_dir)) if name.endswith(".png"))
+    with open(os.path.join(staging_dir, damaged), "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    storage = StorageService(str(tmp_path))
+    try:
+        result = storage.recover()
+        assert result.finished == []
+        assert len(result.quarantined) == 1
+        assert staging_dirs(session_dir) == []
+    finally:
+        storage.close()
+
+
+def test_failure_to_create_the_staging_directory_raises_storage_error(tmp_path, monkeypatch):
+    makedirs = os.makedirs
+
+    def disk_full(path, *args, **kwargs):
+        if os.path.basename(path).startswith(".seq_"):
+            raise OSError(28, "No space left on device", path)
+        return makedirs(path, *args, **kwargs)
+
+    storage = StorageService(str(tmp_path))
+    try:
+        monkeypatch.setattr(os, "makedirs", disk_full)
+        with pytest.raises(StorageError):
+            storage.save([make_frame("Mock_1", 1)], CaptureMetadata(), Settings())
+    finally:
+        storage.close()
+    assert storage._journal.unresolved() == {}
@@ -0,0 +1,67 @@
+import os
+import tarfile
+
+import src.services.shard_export as shard_export
+from conftest import make_frame
+from src.models.metadata import CaptureMetadata
+from src.models.settings import Settings
+from src.services.shard_export import SHARD_MANIFEST, ShardExporter
+from src.services.storage_service import StorageService
+
+
+def save_sessions(root: str, count: int):
+    storage = StorageService(root)
+    try:
+        return [storage.save([make_frame("Mock_1", 1)], CaptureMetadata(sequence_number=n), Settings())
+                for n in range(1, count + 1)]
+    finally:
+        storage.close()
+
+
+def test_full_disk_fails_shards_without_stopping_the_writer(tmp_path, monkeypatch):
+    root = str(tmp_path / "data")
+    sessions = save_sessions(root, 6)
+    out = str(tmp_path / "shards")
+
+    def disk_full(source, target):
+        raise OSError(28, "No space left on device", target)
+
+    monkeypatch.setattr(shard_export.os, "replace", disk_full)
+    exporter = ShardExporter(out, root, max_samples=1, writers=1, queue_size=1)
+    for session_dir in sessions:
+        assert exporter.submit_session(session_dir)
+    summary = exporter.close()
+
+    assert summary.failed == len(sessions)
+    assert summary.samples == 0
+    assert not [name for name in os.listdir(out) if name != SHARD_MANIFEST]
+
+
+def shard_members(out: str):
+    names = []
+    for shard in sorted(name for name in os.listdir(out) if name.endswith(".tar")):
+        with tarfile.open(os.path.join(out, shard)) as tar:
+            names.extend(tar.getnames())
+    return names
+
+
+def test_merged_session_is_exported_again(tmp_path):
+    root = str(tmp_path / "data")
+    out = str(tmp_path / "shards")
+    storage = StorageService(root)
+    try:
+        session_dir = storage.save([make_frame("Mock_1", 1)], CaptureMetadata(), Settings())
+        with ShardExporter(out, root, writers=1) as exporter:
+            assert exporter.submit_session(session_dir)
+
+        assert storage.save([make_frame("Mock_2", 2)], CaptureMetadata(), Settings()) == session_dir
+        with ShardExporter(out, root, writers=1) as exporter:
+            assert exporter.submit_session(session_dir)
+        with ShardExporter(out, root, writers=1) as exporter:
+            assert not exporter.submit_session(session_dir)  # unchanged since the last export
+    finally:
+        storage.close()
+
+    samples = [name for name in shard_members(out) if name.endswith(".json")]
+    assert len(samples) == 2
+    assert len({name for name in shard_members(out) if ".Mock_2." in name}) == 3  # the merged frame's streams
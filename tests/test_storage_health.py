@@ -0,0 +1,28 @@
+import shutil
+
+from src.services.storage_health import HealthThreshold, StorageHealthMonitor, StorageHealthState
+
+
+def unreadable(path):
+    raise PermissionError(13, "Permission denied", path)
+
+
+def test_unreadable_path_is_not_reported_as_full(tmp_path, monkeypatch):
+    monitor = StorageHealthMonitor(str(tmp_path), disk_check_interval_s=0, refuse=HealthThreshold(free_gb=5))
+    monkeypatch.setattr(shutil, "disk_usage", unreadable)
+
+    health = monitor.check()
+    assert health.state == StorageHealthState.WARNING
+    assert health.free_bytes is None
+    assert health.reason.startswith("free space unknown")
+
+
+def test_failed_query_keeps_the_last_reading(tmp_path, monkeypatch):
+    monitor = StorageHealthMonitor(str(tmp_path), disk_check_interval_s=0)
+    free = monitor.check().free_bytes
+    monkeypatch.setattr(shutil, "disk_usage", unreadable)
+    monitor.record_failure()
+
+    health = monitor.check()
+    assert health.state == StorageHealthState.OK
+    assert health.free_bytes == free
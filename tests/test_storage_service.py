@@ -0,0 +1,116 @@
+import os
+import threading
+
+import pytest
+
+from conftest import make_frame
+from src.models.metadata import CaptureMetadata
+from src.models.settings import Settings
+from src.services.storage_service import StorageService
+
+
+def files_on_disk(session_dir: str):
+    return sorted(name for name in os.listdir(session_dir) if name.endswith((".png", ".tiff", ".rvl", ".npy")))
+
+
+def test_merged_session_keeps_earlier_files_in_catalog(tmp_path):
+    storage = StorageService(str(tmp_path))
+    settings = Settings()
+    try:
+        first = storage.save([make_frame("Mock_1", 1), make_frame("Mock_2", 1)], CaptureMetadata(), settings)
+        second = storage.save([make_frame("Mock_1", 2), make_frame("Mock_2", 2)], CaptureMetadata(), settings)
+        assert first == second  # same sequence number: the second save merges into the first session
+
+        on_disk = files_on_disk(second)
+        catalog = storage.get_catalog()
+        indexed = catalog.files(session_dir=second)
+        assert len(on_disk) == 12
+        assert sorted(os.path.basename(f.path) for f in indexed) == on_disk
+        assert catalog.sessions()[0].num_files == len(on_disk)
+    finally:
+        storage.close()
+
+
+def test_live_catalog_counts_only_frame_files_with_thumbnails(tmp_path, monkeypatch):
+    from src.services.config_service import ConfigService
+
+    get = ConfigService.get
+    monkeypatch.setattr(
+        ConfigService, "get",
+        lambda self, key, default=None: True if key == "storage.thumbnails.enabled" else get(self, key, default),
+    )
+    storage = StorageService(str(tmp_path))
+    try:
+        session_dir = storage.save([make_frame("Mock_1", 1)], CaptureMetadata(), Settings())
+        assert os.path.isfile(os.path.join(session_dir, "thumbnails", "contact_sheet.jpg"))
+
+        catalog = storage.get_catalog()
+        live = catalog.sessions()[0]
+        on_disk = files_on_disk(session_dir)
+        assert live.num_files == len(on_disk)
+        assert live.total_bytes == sum(os.path.getsize(os.path.join(session_dir, name)) for name in on_disk)
+
+        catalog.rebuild()
+        rebuilt = catalog.sessions()[0]
+        assert (rebuilt.num_files, rebuilt.total_bytes) == (live.num_files, live.total_bytes)
+    finally:
+        storage.close()
+
+
+def test_root_change_waits_for_saves_in_flight(tmp_path, monkeypatch):
+    old_root, new_root = str(tmp_path / "old"), str(tmp_path / "new")
+    storage = StorageService(old_root)
+    encoding, proceed = threading.Event(), threading.Event()
+    encode_and_write = storage._encode_and_write
+
+    def slow_encode_and_write(tasks, report):
+        encoding.set()
+        proceed.wait(5)
+        encode_and_write(tasks, report)
+
+    monkeypatch.setattr(storage, "_encode_and_write", slow_encode_and_write)
+    try:
+        saved = []
+        saver = threading.Thread(
+            target=lambda: saved.append(storage.save([make_frame("Mock_1", 1)], CaptureMetadata(), Settings())))
+        saver.start()
+        assert encoding.wait(5)
+        changer = threading.Thread(target=storage.set_root_dir, args=(new_root,))
+        changer.start()
+        changer.join(0.2)
+        assert changer.is_alive()  # held off by the save
+
+        proceed.set()
+        saver.join(5)
+        changer.join(5)
+        assert saved[0].startswith(old_root)
+        assert storage.get_root_dir() == new_root
+    finally:
+        storage.close()
+
+
+class SimulatedCrash(BaseException):
+    """Not an OSError, so StorageService leaves the staged session for recovery."""
+
+
+def test_root_change_recovers_the_new_root(tmp_path, monkeypatch):
+    crashed_root = str(tmp_path / "crashed")
+    crashed = StorageService(crashed_root)
+
+    def crash(staging_dir, session_dir):
+        raise SimulatedCrash()
+
+    monkeypatch.setattr(crashed, "_commit", crash)
+    try:
+        with pytest.raises(SimulatedCrash):
+            crashed.save([make_frame("Mock_1", 1)], CaptureMetadata(), Settings())
+    finally:
+        crashed.close()
+
+    storage = StorageService(str(tmp_path / "other"))
+    try:
+        result = storage.set_root_dir(crashed_root, recover=True)
+        assert len(result.finished) == 1
+        assert files_on_disk(result.finished[0])
+    finally:
+        storage.close()
@@ -0,0 +1,43 @@
+import os
+
+from conftest import make_frame
+from src.models.metadata import CaptureMetadata
+from src.models.settings import Settings
+from src.services.checksums import verify_session
+from src.services.storage_service import StorageService
+from src.tools import thumbnails, verify
+
+
+def saved_session(root: str, sequence_number: int) -> str:
+    storage = StorageService(root)
+    try:
+        metadata = CaptureMetadata(sequence_number=sequence_number)
+        return storage.save([make_frame("Mock_1", 1), make_frame("Mock_2", 1)], metadata, Settings())
+    finally:
+        storage.close()
+
+
+def test_backfilled_thumbnails_verify(tmp_path):
+    root = str(tmp_path)
+    sessions = [saved_session(root, 1), saved_session(root, 2)]
+
+    assert thumbnails.main(["--root", root, "--workers", "2"]) == 0
+    for session_dir in sessions:
+        assert len(os.listdir(os.path.join(session_dir, "thumbnails"))) == 5  # two cameras x two streams + sheet
+        result = verify_session(session_dir)
+        assert result.ok, result.summary()
+        assert result.files == 2 * 3 + 1 + 5  # frame files, metadata.json and thumbnails
+    assert verify.main(["--root", root, "--workers", "1"]) == 0
+
+
+def test_regenerated_thumbnails_verify(tmp_path):
+    root = str(tmp_path)
+    session_dir = saved_session(root, 1)
+    assert thumbnails.main(["--root", root, "--workers", "1"]) == 0
+    sheet = os.path.join(session_dir, "thumbnails", "contact_sheet.jpg")
+    before = os.path.getsize(sheet)
+
+    assert thumbnails.main(["--root", root, "--workers", "1", "--force", "--max-size", "32"]) == 0
+    assert os.path.getsize(sheet) != before
+    result = verify_session(session_dir)
+    assert result.ok, result.summary()